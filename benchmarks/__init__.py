@@ -0,0 +1 @@
+"""Benchmark scripts; run them directly, e.g. `python benchmarks/tts_client.py`."""
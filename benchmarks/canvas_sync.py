@@ -0,0 +1,97 @@
+"""
+Bytes sent and reruns per minute of drawing on the Drawing tab.
+
+    python benchmarks/canvas_sync.py [--strokes 30] [--points 60]
+
+Simulates a minute of free drawing (`--strokes` strokes of `--points`
+points each) as the Fabric.js JSON the canvas component sends back, and
+compares:
+
+- before: every stroke synced (update_streamlit=True), each sync carrying
+  the whole drawing, one full-page rerun per stroke plus two per clear
+  (the key flip and `st.rerun()`); with streamlit-drawable-canvas < 0.13
+  each sync also carried the 600x400 RGBA `image_data` array
+- after: live sync throttled to one send per LIVE_SYNC_SECONDS (the tab's
+  fragment also reruns that often to let the next send through), reruns
+  limited to the Drawing tab's fragment, and only the compact stroke list
+  kept in session state and on disk
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phonology.drawings import LIVE_SYNC_SECONDS, compact_objects, payload_bytes
+
+WIDTH, HEIGHT = 600, 400
+
+
+def fabric_path(rng, points):
+    """A freedraw stroke as Fabric 7 serializes it (all properties included)."""
+    x, y = rng.uniform(50, WIDTH - 50), rng.uniform(50, HEIGHT - 50)
+    heading = rng.uniform(0, 2 * math.pi)
+    path = [["M", x, y]]
+    for _ in range(points):
+        heading += rng.uniform(-0.4, 0.4)
+        nx, ny = x + 4 * math.cos(heading) + rng.random() / 7, y + 4 * math.sin(heading) + rng.random() / 7
+        path.append(["Q", x, y, (x + nx) / 2, (y + ny) / 2])
+        x, y = nx, ny
+    path.append(["L", x, y])
+    xs = [c for seg in path for c in seg[1::2]]
+    ys = [c for seg in path for c in seg[2::2]]
+    return {
+        "type": "Path", "version": "7.4.0", "originX": "left", "originY": "top",
+        "left": min(xs) - 2.5, "top": min(ys) - 2.5, "width": max(xs) - min(xs), "height": max(ys) - min(ys),
+        "fill": None, "stroke": "#000000", "strokeWidth": 5, "strokeDashArray": None,
+        "strokeLineCap": "round", "strokeDashOffset": 0, "strokeLineJoin": "round", "strokeUniform": False,
+        "strokeMiterLimit": 10, "scaleX": 1, "scaleY": 1, "angle": 0, "flipX": False, "flipY": False,
+        "opacity": 1, "shadow": None, "visible": True, "backgroundColor": "", "fillRule": "nonzero",
+        "paintFirst": "fill", "globalCompositeOperation": "source-over", "skewX": 0, "skewY": 0,
+        "path": path,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strokes", type=int, default=30, help="strokes per minute")
+    parser.add_argument("--points", type=int, default=60, help="points per stroke")
+    parser.add_argument("--clears", type=int, default=1, help="clears per minute")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    objects = [fabric_path(rng, args.points) for _ in range(args.strokes)]
+    drawing = lambda n: {"version": "7.4.0", "objects": objects[:n], "background": "#FFFFFF"}
+
+    before_json = sum(payload_bytes(drawing(n)) for n in range(1, args.strokes + 1))
+    image_data = len(json.dumps([255] * (WIDTH * HEIGHT * 4), separators=(",", ":")))
+    before_image = before_json + args.strokes * image_data
+    before_reruns = args.strokes + 2 * args.clears
+
+    syncs = min(args.strokes, int(60 // LIVE_SYNC_SECONDS))
+    polls = int(60 // LIVE_SYNC_SECONDS)
+    sync_points = [round(args.strokes * (i + 1) / syncs) for i in range(syncs)]
+    after_bytes = sum(payload_bytes(drawing(n)) for n in sync_points)
+    after_reruns = syncs + polls + args.clears
+
+    start = time.perf_counter()
+    compact = compact_objects(drawing(args.strokes))
+    compact_ms = (time.perf_counter() - start) * 1e3
+    raw, kept = payload_bytes(drawing(args.strokes)), payload_bytes(compact)
+
+    print(f"one minute: {args.strokes} strokes x {args.points} points, {args.clears} clear(s)")
+    print(f"{'':34} {'sent to app':>12} {'reruns':>7} {'scope':>10}")
+    print(f"{'before (canvas < 0.13, image data)':34} {before_image / 1e6:>9.2f} MB {before_reruns:>7} {'full page':>10}")
+    print(f"{'before (canvas 0.13, JSON only)':34} {before_json / 1e6:>9.2f} MB {before_reruns:>7} {'full page':>10}")
+    print(f"{f'after ({LIVE_SYNC_SECONDS} s throttle)':34} {after_bytes / 1e6:>9.2f} MB {after_reruns:>7} "
+          f"{'Drawing tab':>10}")
+    print(f"drawing kept in session / on disk: {raw / 1024:.1f} KB raw -> {kept / 1024:.1f} KB compact "
+          f"({kept / raw:.0%}), compacted in {compact_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Class report throughput vs process pool size.
+
+    python benchmarks/class_reports.py [--students 400] [--items 50]
+
+Writes a synthetic histories file, then renders it with 1, 2, 4, ... up to
+the CPU count workers and prints reports/second for each.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phonology.class_reports import build_class_zip, iter_records
+from phonology.snapshot import DEFAULT_CSV, load_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=400)
+    parser.add_argument("--items", type=int, default=50)
+    args = parser.parse_args()
+
+    words = load_snapshot(DEFAULT_CSV).strings("Word")
+    rng = random.Random(0)
+    tmp = tempfile.mkdtemp()
+    histories = os.path.join(tmp, "histories.jsonl")
+    with open(histories, "w", encoding="utf-8") as f:
+        for i in range(args.students):
+            history = [{"word": w, "correct": rng.random() < 0.7} for w in rng.sample(words, args.items)]
+            f.write(json.dumps({"username": f"Student {i:04d}", "start_time": "2026-03-02T09:00:00",
+                                "end_time": "2026-03-02T09:30:00", "history": history}) + "\n")
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, cpus} | {2 ** k for k in range(1, 8) if 2 ** k < cpus})
+    print(f"{args.students} students x {args.items} items, {cpus} CPUs")
+    base = None
+    for workers in counts:
+        out = os.path.join(tmp, f"reports_{workers}.zip")
+        r = build_class_zip(iter_records(histories), out, workers=workers, log=lambda *_: None)
+        base = base or r["reports_per_second"]
+        print(f"  workers={workers:<3} {r['reports_per_second']:>8.1f} reports/s  "
+              f"speedup x{r['reports_per_second'] / base:.2f}  zip {os.path.getsize(out) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
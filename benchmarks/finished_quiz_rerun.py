@@ -0,0 +1,70 @@
+"""
+Finished-quiz screen: PDF work per rerun, before and after lazy reports.
+
+    python benchmarks/finished_quiz_rerun.py [--items 770] [--reruns 20]
+
+"before" is what every rerun used to do (build the history list and call
+create_pdf_report to feed st.download_button). "after" is what a rerun does
+now (nothing: the button gets a callable), plus the cost of the first and
+of repeated download clicks, which go through cached_pdf_report.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from phonology.quiz import QuizEngine
+from phonology.report import cached_pdf_report, create_pdf_report
+from phonology.snapshot import DEFAULT_CSV, load_snapshot
+
+
+def timed(fn, n):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=770)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    table = load_snapshot(DEFAULT_CSV)
+    words = table.strings("Word")
+    engine = QuizEngine(words.__getitem__)
+    items = np.resize(np.arange(len(table), dtype=np.int32), args.items)  # repeat rows to reach --items
+    quiz = engine.start(items, "Benchmark Student", datetime(2026, 3, 2, 9, 0))
+    while not quiz.finished:
+        engine.submit(quiz, words[quiz.current] if quiz.idx % 3 else "wrong",
+                      now=quiz.start_time + timedelta(minutes=40))
+
+    def before():
+        create_pdf_report(quiz.username, engine.history(quiz), quiz.score, quiz.start_time, quiz.end_time)
+
+    def after_rerun():
+        def quiz_pdf(quiz=quiz):
+            return cached_pdf_report(quiz.username, engine.history(quiz), quiz.score, quiz.start_time, quiz.end_time)
+        return quiz_pdf
+
+    def click():
+        after_rerun()()
+
+    print(f"{args.items}-item finished quiz, median of {args.reruns}")
+    print(f"  before: per rerun               {timed(before, args.reruns):8.2f} ms")
+    print(f"  after:  per rerun               {timed(after_rerun, args.reruns):8.4f} ms")
+    print(f"  after:  first download click    {timed(click, 1):8.2f} ms")
+    print(f"  after:  repeat download click   {timed(click, args.reruns):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
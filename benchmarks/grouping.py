@@ -0,0 +1,131 @@
+"""
+Group formation on synthetic rosters, plus a check of the Year rule.
+
+    python benchmarks/grouping.py [--sizes 100,1000,10000] [--budget 2.0] [--trials 300]
+
+Each roster has Year (1-4), Major (8), Gender (2) and PrevGroup (last
+week's group of 4) columns, and three earlier weeks of random groups as
+history. For each size it reports the cost after dealing and after local
+search, how far the worst group is from the roster's Year mix, the pairs
+that meet again, and the time taken.
+
+The check then runs the Grouping tab's year-aware configuration (groups of
+4, remainder folded into the last group, one or two second-year students
+per group) on random feasible rosters and asserts every group meets it,
+that infeasible rosters are rejected, and that the standard split matches
+the tab's old `distribute_standard` sizes.
+"""
+import argparse
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from phonology.grouping import GroupingError, form_groups, group_sizes
+
+YEAR_LIMITS = {("Year", 2): (1, 2)}
+
+
+def synthetic_roster(n, rng):
+    return pd.DataFrame({
+        "Name_ori": [f"S{i:05d}" for i in range(n)],
+        "Year": [rng.choice([1, 1, 2, 2, 3, 4]) for _ in range(n)],
+        "Major": [rng.choice("ABCDEFGH") for _ in range(n)],
+        "Gender": [rng.choice("FM") for _ in range(n)],
+        "PrevGroup": [i // 4 for i in rng.sample(range(n), n)],
+    })
+
+
+def random_history(names, weeks, rng):
+    history = []
+    for _ in range(weeks):
+        shuffled = rng.sample(names, len(names))
+        history.extend(shuffled[i:i + 4] for i in range(0, len(shuffled), 4))
+    return history
+
+
+def worst_year_gap(df, groups):
+    """Largest |share of a Year value in a group - share in the roster|."""
+    overall = df["Year"].value_counts(normalize=True)
+    worst = 0.0
+    for grp in groups:
+        counts = Counter(df["Year"].iloc[grp])
+        for year, share in overall.items():
+            worst = max(worst, abs(counts.get(year, 0) / len(grp) - share))
+    return worst
+
+
+def old_distribute_sizes(total, group_size):
+    """Group sizes produced by the tab's former `distribute_standard`."""
+    base, remainder = divmod(total, group_size)
+    if total == 0:
+        return []
+    if base == 0:
+        return [total]
+    if remainder == 0:
+        return [group_size] * base
+    if remainder == 1:
+        return [group_size] * (base - 1) + [group_size + 1]
+    return [group_size] * base + [remainder]
+
+
+def check_year_rule(trials, rng):
+    for total in range(60):
+        for size in (3, 4):
+            assert group_sizes(total, size) == old_distribute_sizes(total, size), (total, size)
+
+    checked = rejected = 0
+    for _ in range(trials):
+        total = rng.randint(4, 80)
+        n2 = rng.randint(0, total)
+        roster = pd.DataFrame({"Name_ori": [f"S{i}" for i in range(total)],
+                               "Year": [2] * n2 + [1] * (total - n2)})
+        sizes = group_sizes(total, 4, remainder="fold")
+        feasible = len(sizes) <= n2 <= 2 * len(sizes)
+        try:
+            result = form_groups(roster, sizes, balance={"Year": 1}, limits=YEAR_LIMITS,
+                                 seed=rng.random(), time_budget=0.2)
+        except GroupingError:
+            assert not feasible, (total, n2)
+            rejected += 1
+            continue
+        assert feasible, (total, n2)
+        assert [len(g) for g in result.groups] == sizes
+        assert sorted(i for g in result.groups for i in g) == list(range(total))
+        for grp in result.groups:
+            assert 1 <= sum(roster["Year"].iloc[i] == 2 for i in grp) <= 2, (total, n2)
+        assert result.violations == 0
+        checked += 1
+    print(f"year rule: {checked} feasible rosters grouped correctly, {rejected} infeasible rejected")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds of local search")
+    parser.add_argument("--trials", type=int, default=300)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    balance = {"Year": 1.0, "Major": 1.0, "Gender": 1.0, "PrevGroup": 2.0}
+    print(f"{'students':>9} {'groups':>7} {'dealt cost':>11} {'final cost':>11} {'year gap':>9} "
+          f"{'repeats':>8} {'swaps':>7} {'seconds':>8}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        df = synthetic_roster(n, rng)
+        history = random_history(df["Name_ori"].tolist(), 3, rng)
+        sizes = group_sizes(n, 4)
+        result = form_groups(df, sizes, balance=balance, history=history, seed=1,
+                             time_budget=args.budget)
+        print(f"{n:>9} {len(sizes):>7} {result.greedy_cost:>11.1f} {result.cost:>11.1f} "
+              f"{worst_year_gap(df, result.groups):>9.2f} {result.repeats:>8} {result.swaps:>7} "
+              f"{result.elapsed:>8.2f}")
+
+    check_year_rule(args.trials, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Long text through the TTS tab: one gTTS call vs sentences in parallel.
+
+    python benchmarks/long_text_tts.py [--latency 0.15] [--workers 4]
+
+Runs against the local stand-in server (see tts_standin.py) with a fixed
+per-request latency, using the sample captions from the Course Management
+page. "whole text" is what the tab did before: one synthesis of the full
+text, whose ~100-character requests gTTS sends one after another. "by
+sentence" splits on sentence boundaries and synthesizes the sentences on
+the prefetch pool, each cached on its own; "one sentence edited" changes a
+single sentence and renders again.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tts_standin import StandinServer
+
+TEXTS = {
+    "en": "Teacher-designed coding applications create tailored learning experiences, making complex "
+          "concepts easier to understand through interactive and adaptive tools. They enhance engagement, "
+          "provide immediate feedback, and support active learning.",
+    "ko": "교사가 직접 만든 코딩 기반 애플리케이션은 학습자의 필요에 맞춘 학습 경험을 제공하고, 복잡한 개념을 쉽게 "
+          "이해하도록 돕습니다. 또한 학습 몰입도를 높이고 즉각적인 피드백을 제공하며, 능동적인 학습을 지원합니다.",
+    "ja": "教師が設計したコーディングアプリケーションは、学習者のニーズに合わせた学習体験を提供し、複雑な概念を"
+          "インタラクティブで適応性のあるツールを通じて理解しやすくします。また、学習への集中力を高め、即時フィード"
+          "バックを提供し、主体的な学習をサポートします。",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per TTS request")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with StandinServer(args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        # Point the process-wide client, cache and pool at the stand-in before first use.
+        os.environ.update({
+            "PHONOLOGY_TTS_URL": server.url,
+            "PHONOLOGY_TTS_BACKEND": "gtts",
+            "PHONOLOGY_TTS_CACHE_DIR": os.path.join(tmp, "tts"),
+            "PHONOLOGY_PREFETCH_WORKERS": str(args.workers),
+            "PHONOLOGY_TTS_RATE": "100",
+            "PHONOLOGY_TTS_BURST": "20",
+        })
+        from phonology.audio import sentence_audio, split_sentences
+        from phonology.tts_client import get_tts_client
+
+        print(f"{args.latency * 1000:.0f} ms per request, {args.workers} workers")
+        print(f"{'':5} {'':22} {'seconds':>8} {'requests':>9}")
+        for lang, text in TEXTS.items():
+            sentences = split_sentences(text)
+
+            def report(label, fn):
+                before = server.requests
+                start = time.perf_counter()
+                fn()
+                print(f"{lang:5} {label:22} {time.perf_counter() - start:>8.2f} {server.requests - before:>9}")
+
+            report("whole text", lambda: get_tts_client().synthesize(text, lang=lang))
+            report(f"by sentence ({len(sentences)})", lambda: sentence_audio(sentences, lang=lang))
+            edited = sentences[:-1] + [sentences[-1].rstrip(".。") + "!"]
+            report("one sentence edited", lambda: sentence_audio(edited, lang=lang))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+"Next" click latency in the practice tabs, with and without audio prefetch.
+
+    python benchmarks/prefetch_latency.py [--students 4] [--items 15] [--delay 0.5] [--think 1.0]
+
+Each simulated student starts a random practice subset and steps through it
+like Tab 1 does: fetch the current item's audio (the latency measured for
+every item after the first), prefetch the next `depth` items, then "listen" for `--think` seconds before
+clicking Next. Synthesis is the offline stub with `--delay` seconds of
+simulated network time, and every depth starts from an empty cache.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from phonology.audio_cache import AudioCache
+from phonology.practice import make_subset
+from phonology.prefetch import AudioPrefetcher
+from phonology.snapshot import DEFAULT_CSV, load_snapshot
+from phonology.tts_backends import StubBackend
+
+
+def run(table, depth, args):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AudioCache(cache_dir, backend=StubBackend(delay=args.delay))
+        prefetcher = AudioPrefetcher(cache, workers=args.workers)
+        words = table.strings("Word")
+        latencies = []
+        lock = threading.Lock()
+
+        def student(seed):
+            subset = make_subset(table, args.items, "Random", np.random.default_rng(seed))
+            for idx in range(len(subset)):
+                t0 = time.perf_counter()
+                prefetcher.get(words[subset[idx]])
+                elapsed = time.perf_counter() - t0
+                if idx:  # item 1 is shown by "Start", not by a Next click
+                    with lock:
+                        latencies.append(elapsed)
+                for pos in subset[idx + 1: idx + 1 + depth]:
+                    prefetcher.prefetch(words[pos])
+                time.sleep(args.think)
+
+        threads = [threading.Thread(target=student, args=(seed,)) for seed in range(args.students)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return latencies, prefetcher
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=4)
+    parser.add_argument("--items", type=int, default=15)
+    parser.add_argument("--delay", type=float, default=0.5, help="simulated seconds per synthesis")
+    parser.add_argument("--think", type=float, default=1.0, help="seconds a student spends per item")
+    parser.add_argument("--workers", type=int, default=4, help="prefetch pool size")
+    parser.add_argument("--depths", default="0,1,3")
+    args = parser.parse_args()
+
+    table = load_snapshot(DEFAULT_CSV)
+    print(f"{args.students} students x {args.items} items, synth {args.delay:.2f} s, think {args.think:.2f} s")
+    print(f"{'depth':>5} {'median ms':>10} {'p95 ms':>10} {'max ms':>10} {'prefetched':>11} {'joined':>7}")
+    for depth in (int(d) for d in args.depths.split(",")):
+        latencies, prefetcher = run(table, depth, args)
+        ms = sorted(x * 1000 for x in latencies)
+        p95 = ms[min(len(ms) - 1, int(0.95 * len(ms)))]
+        print(f"{depth:>5} {statistics.median(ms):>10.1f} {p95:>10.1f} {ms[-1]:>10.1f} "
+              f"{prefetcher.submitted:>11} {prefetcher.joined:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Time to build a QR sheet: serial, on a process pool, and from the tile cache.
+
+    python benchmarks/qr_sheet.py [--links 96] [--workers 4]
+
+Uses synthetic links with captions. The pool only pays off with several
+cores; on one core it is about as fast as the serial run. The pooled time
+includes starting the spawned workers, which later sheets reuse.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phonology import qr
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--links", type=int, default=96)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    items = [(f"https://example.streamlit.app/lesson-{i}?week={i % 15}", f"Lesson {i}") for i in range(args.links)]
+
+    qr._tiles.clear()
+    serial = timed(lambda: qr.render_sheet(items, workers=1))
+    qr._tiles.clear()
+    pooled = timed(lambda: qr.render_sheet(items, workers=args.workers))
+    cached = timed(lambda: qr.render_sheet(items, workers=args.workers))
+    print(f"{args.links} links, {-(-args.links // 12)} PDF pages")
+    print(f"serial            {serial:7.2f} s")
+    print(f"pool ({args.workers} workers)  {pooled:7.2f} s")
+    print(f"cached tiles      {cached:7.2f} s  (page layout and PDF encoding only)")
+
+
+if __name__ == "__main__":
+    main()
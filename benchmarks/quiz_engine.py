@@ -0,0 +1,54 @@
+"""
+Throughput of the quiz engine outside Streamlit.
+
+    python benchmarks/quiz_engine.py [--sessions 5000] [--items 20]
+
+Simulates complete quizzes (start, one submit per item, history export)
+and reports sessions and submits per second, plus the size of one state.
+"""
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from phonology.practice import make_subset
+from phonology.quiz import QuizEngine
+from phonology.snapshot import DEFAULT_CSV, load_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=20)
+    args = parser.parse_args()
+
+    table = load_snapshot(DEFAULT_CSV)
+    words = table.strings("Word")
+    engine = QuizEngine(words.__getitem__)
+    rng = np.random.default_rng(0)
+    chance = random.Random(0)
+
+    t0 = time.perf_counter()
+    submits = 0
+    for _ in range(args.sessions):
+        state = engine.start(make_subset(table, args.items, "Random", rng), "student")
+        while not state.finished:
+            word = words[state.current]
+            engine.submit(state, word if chance.random() < 0.7 else "wrong")
+            submits += 1
+        engine.history(state)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{args.sessions} quizzes x {args.items} items in {elapsed:.2f} s")
+    print(f"  {args.sessions / elapsed:,.0f} sessions/s, {submits / elapsed:,.0f} submits/s")
+    print(f"  pickled QuizState: {len(pickle.dumps(state))} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Concurrency stress test for the results store.
+
+    python benchmarks/results_store_stress.py [--threads 64] [--quizzes 50] [--items 20]
+
+Many threads record quizzes at the same moment (released by a barrier),
+then the script checks that every quiz and item row landed exactly once and
+reports throughput and how many batches the writer needed. Exits non-zero
+on any mismatch.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phonology.results_store import ResultsStore
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--quizzes", type=int, default=50, help="quizzes per thread")
+    parser.add_argument("--items", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "results.sqlite3")
+    store = ResultsStore(path)
+    barrier = threading.Barrier(args.threads)
+    uids = [[] for _ in range(args.threads)]
+    errors = []
+
+    def student(t):
+        rng = random.Random(t)
+        barrier.wait()
+        try:
+            for q in range(args.quizzes):
+                items = [(rng.randint(1, 731), f"word{rng.randint(1, 731)}", rng.random() < 0.7)
+                         for _ in range(args.items)]
+                now = datetime.now()
+                uids[t].append(store.record_quiz(f"student-{t}", now, now, sum(c for _, _, c in items), items))
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=student, args=(t,)) for t in range(args.threads)]
+    t0 = time.perf_counter()
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    enqueue_s = time.perf_counter() - t0
+    store.flush()
+    total_s = time.perf_counter() - t0
+
+    expected = args.threads * args.quizzes
+    quizzes, items = store.count_quizzes(), store.count_items()
+    sample = uids[0][0]
+    ok = (not errors and quizzes == expected and items == expected * args.items
+          and len({u for us in uids for u in us}) == expected and len(store.quiz_items(sample)) == args.items)
+    print(f"{args.threads} threads x {args.quizzes} quizzes x {args.items} items")
+    print(f"  enqueue {enqueue_s * 1000:.1f} ms, committed after {total_s * 1000:.1f} ms "
+          f"({expected / total_s:,.0f} quizzes/s) in {store.batches_committed} batches")
+    print(f"  rows: quizzes {quizzes}/{expected}, items {items}/{expected * args.items} -> {'OK' if ok else 'MISMATCH'}")
+    store.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Cost of drawing a practice subset as the word list grows.
+
+    python benchmarks/sampling.py [--n 50] [--sizes 770,10000,100000,1000000]
+
+Compares the old DataFrame path (`df.sample(n)` / `sort_values("WID").head(n)`)
+with the sampler. "WID order" is a slice of a precomputed ordering; weighted
+draws from a prepared alias table ("+table") stay flat in list size, while
+passing the raw weight array adds one O(N) hash to find the cached table.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from phonology.sampling import Sampler
+
+
+def per_call_us(fn, number=200):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50, help="items per subset")
+    parser.add_argument("--sizes", default="770,10000,100000,1000000")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'df.sample':>11} {'sort+head':>11} {'WID order':>11} {'uniform':>11} {'weighted':>11} {'+table':>11}  (us/draw)")
+    for size in (int(s) for s in args.sizes.split(",")):
+        rng = np.random.default_rng(0)
+        wids = rng.permutation(size) + 1
+        groups = rng.choice(["G1", "G2", "G3", "G4"], size=size)
+        df = pd.DataFrame({"WID": wids, "Group": groups})
+        sampler = Sampler(wids, groups)
+        misses = np.zeros(size)
+        misses[rng.choice(size, size=min(size, 40), replace=False)] = 1
+        weights = sampler.weights({"G1": 2.0, "G4": 0.5}, misses=misses)
+        table = sampler.alias_table(weights)  # built once per weight vector, then reused
+
+        number = max(5, 200_000 // size)
+        row = [
+            per_call_us(lambda: df.sample(args.n), number),
+            per_call_us(lambda: df.sort_values("WID").head(args.n), number),
+            per_call_us(lambda: sampler.first(args.n), 2000),
+            per_call_us(lambda: sampler.uniform(args.n, rng), number),
+            per_call_us(lambda: sampler.weighted(args.n, weights, rng), number),
+            per_call_us(lambda: sampler.weighted(args.n, table, rng), 2000),
+        ]
+        print(f"{size:>9} " + " ".join(f"{v:>11.1f}" for v in row))
+
+    s1 = Sampler(np.arange(1, 771))
+    w = s1.weights(misses=np.arange(770) % 3)
+    same = np.array_equal(s1.weighted(20, w, seed=7), s1.weighted(20, w, seed=7))
+    print(f"same seed, same subset: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Startup time and per-session memory: pandas CSV + st.cache_data copies vs the
+shared memory-mapped snapshot.
+
+    python benchmarks/snapshot_sessions.py [--sessions 1 50 200]
+
+Each scenario runs in a fresh subprocess so RSS numbers do not leak between
+runs. `st.cache_data` hands every session its own unpickled copy of the
+cached frame; that is simulated with pickle round-trips.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHILD = r"""
+import json, pickle, sys, time
+def rss_kib():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+mode, n = sys.argv[1], int(sys.argv[2])
+import numpy, pandas as pd
+from phonology.snapshot import DEFAULT_CSV, load_snapshot
+base = rss_kib()
+t0 = time.perf_counter()
+if mode == "csv":
+    cached = pickle.dumps(pd.read_csv(DEFAULT_CSV, encoding="utf-8-sig"))
+    startup = time.perf_counter() - t0
+    sessions = [pickle.loads(cached) for _ in range(n)]
+    words = [s.iloc[i % len(s)]["Word"] for i, s in enumerate(sessions)]
+else:
+    table = load_snapshot(DEFAULT_CSV)
+    startup = time.perf_counter() - t0
+    sessions = [table for _ in range(n)]
+    words = [s.value(i % len(s), "Word") for i, s in enumerate(sessions)]
+print(json.dumps({"startup_ms": startup * 1000, "rss_kib": rss_kib() - base}))
+"""
+
+
+def run(mode, n):
+    out = subprocess.run([sys.executable, "-c", CHILD, mode, str(n)], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 50, 200])
+    args = parser.parse_args()
+
+    run("snapshot", 1)  # make sure the snapshot exists before timing it
+    print(f"{'sessions':>8} {'mode':>9} {'startup ms':>11} {'RSS KiB':>9} {'KiB/session':>12}")
+    for n in args.sessions:
+        for mode in ("csv", "snapshot"):
+            r = run(mode, n)
+            print(f"{n:>8} {mode:>9} {r['startup_ms']:>11.1f} {r['rss_kib']:>9} {r['rss_kib'] / n:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
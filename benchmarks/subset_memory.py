@@ -0,0 +1,76 @@
+"""
+Session memory for practice/quiz subsets: DataFrame copies vs index arrays.
+
+    python benchmarks/subset_memory.py [--sessions 100] [--n 50]
+
+Each simulated session holds the three subsets the Word & Transcription
+page keeps (tab1, tab2, quiz) and renders one item from each.
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from phonology.practice import ROW_FIELDS, make_subset
+from phonology.snapshot import DEFAULT_CSV, load_snapshot
+
+
+def measure(build):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    sessions = build()
+    elapsed = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sessions, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--n", type=int, default=50, help="items per subset")
+    args = parser.parse_args()
+
+    df = pd.read_csv(DEFAULT_CSV, encoding="utf-8-sig")
+    table = load_snapshot(DEFAULT_CSV)
+    rng = np.random.default_rng(0)
+
+    def frames():
+        out = []
+        for _ in range(args.sessions):
+            subsets = [df.sample(args.n).reset_index(drop=True) for _ in range(3)]
+            for s in subsets:
+                s.iloc[0]["Word"]
+            out.append(subsets)
+        return out
+
+    def arrays():
+        out = []
+        for _ in range(args.sessions):
+            subsets = [make_subset(table, args.n, "Random", rng) for _ in range(3)]
+            for s in subsets:
+                table.row(s[0], ROW_FIELDS)
+            out.append(subsets)
+        return out
+
+    print(f"{args.sessions} sessions x 3 subsets x {args.n} items")
+    for label, build in (("DataFrame copies", frames), ("int32 index arrays", arrays)):
+        _, nbytes, elapsed = measure(build)
+        print(f"{label:<20} {nbytes / 1024:>10.1f} KiB total  {nbytes / args.sessions / 1024:>8.2f} KiB/session"
+              f"  {elapsed * 1000:>8.1f} ms to build")
+
+    frame_subset = df.sample(args.n).reset_index(drop=True)
+    index_subset = make_subset(table, args.n)
+    iloc_us = min(timeit.repeat(lambda: frame_subset.iloc[3], number=5000, repeat=3)) / 5000 * 1e6
+    row_us = min(timeit.repeat(lambda: table.row(index_subset[3], ROW_FIELDS), number=5000, repeat=3)) / 5000 * 1e6
+    print(f"per-item access: subset.iloc[i] {iloc_us:.1f} us, table.row(i, ROW_FIELDS) {row_us:.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Latency and throughput of the TTS backends over the word list.
+
+    python benchmarks/tts_backends.py [--words 770] [--threads 4] [--backends stub,espeak-ng,gtts]
+
+Every word is synthesized uncached, once one at a time (per-word latency)
+and once on a thread pool (throughput). "gtts" is sent to the local
+stand-in server from tts_standin.py with `--latency` seconds per request
+unless `--live` is given, so the numbers are repeatable offline; backends
+that are not installed (e.g. eSpeak NG) are reported and skipped.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from phonology.snapshot import DEFAULT_CSV, load_snapshot
+from phonology.tts_backends import BACKENDS, GTTSBackend
+from phonology.tts_client import TTSClient
+from tts_standin import StandinServer
+
+
+class _ClientBackend(GTTSBackend):
+    def __init__(self, client):
+        self.client = client
+
+    def synthesize(self, text, lang="en", tld="com", slow=False):
+        return self.client.synthesize(text, lang=lang, tld=tld, slow=slow)
+
+
+def measure(backend, words, threads):
+    latencies = []
+    total_bytes = 0
+    t0 = time.perf_counter()
+    for word in words:
+        start = time.perf_counter()
+        total_bytes += len(backend.synthesize(word))
+        latencies.append(time.perf_counter() - start)
+    sequential = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(backend.synthesize, words))
+    parallel = time.perf_counter() - t0
+
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "median_ms": statistics.median(ms),
+        "p95_ms": ms[min(len(ms) - 1, int(0.95 * len(ms)))],
+        "seq_words_s": len(words) / sequential,
+        "par_words_s": len(words) / parallel,
+        "kib_per_word": total_bytes / len(words) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=770)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--backends", default="stub,espeak-ng,gtts")
+    parser.add_argument("--latency", type=float, default=0.02, help="stand-in server seconds per request")
+    parser.add_argument("--live", action="store_true", help="send gtts to Google instead of the stand-in")
+    args = parser.parse_args()
+
+    words = np.resize(load_snapshot(DEFAULT_CSV).strings("Word"), args.words).tolist()
+    print(f"{len(words)} words, {args.threads} threads")
+    print(f"{'backend':<18} {'median ms':>10} {'p95 ms':>9} {'seq w/s':>9} {'par w/s':>9} {'KiB/word':>9}")
+    for name in args.backends.split(","):
+        backend = BACKENDS[name]
+        if not backend.available():
+            print(f"{name:<18} not installed, skipped")
+            continue
+        if name == "gtts" and not args.live:
+            with StandinServer(args.latency) as server:
+                client = TTSClient(base_url=server.url, rate=10_000, burst=args.threads)
+                result = measure(_ClientBackend(client), words, args.threads)
+            name = "gtts (stand-in)"
+        else:
+            result = measure(backend, words, args.threads)
+        print(f"{name:<18} {result['median_ms']:>10.2f} {result['p95_ms']:>9.2f} {result['seq_words_s']:>9.1f} "
+              f"{result['par_words_s']:>9.1f} {result['kib_per_word']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
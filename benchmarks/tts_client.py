@@ -0,0 +1,95 @@
+"""
+gTTS-style requests vs the shared TTS client, against a flaky local server.
+
+    python benchmarks/tts_client.py [--words 120] [--threads 8] [--error-rate 0.2] [--stall-rate 0.02]
+
+"fresh session" sends each request the way `gTTS.write_to_fp` does: a new
+`requests.Session` per call and no retries, so every injected 429/503/stall
+is a failed page render. "shared client" is `phonology.tts_client.TTSClient`
+pointed at the same stand-in server (see tts_standin.py).
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from phonology.snapshot import DEFAULT_CSV, load_snapshot
+from phonology.tts_client import TTSClient, TTSError
+from tts_standin import StandinServer
+
+
+def fresh_session(client):
+    """What gTTS does per request, minus parsing: new session, one attempt."""
+    from gtts import gTTS
+
+    def synth(word):
+        for pr in gTTS(text=word)._prepare_requests():
+            with requests.Session() as s:
+                r = s.send(client._retarget(pr), timeout=client.timeout)
+            r.raise_for_status()
+            client._audio(r)
+
+    return synth
+
+
+def run(label, synth, words, threads, server):
+    failures = 0
+    latencies = []
+
+    def one(word):
+        t0 = time.perf_counter()
+        try:
+            synth(word)
+            ok = True
+        except (requests.RequestException, TTSError):
+            ok = False
+        return ok, time.perf_counter() - t0
+
+    before_conn, before_req = server.connections, server.requests
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for ok, elapsed in pool.map(one, words):
+            failures += not ok
+            latencies.append(elapsed)
+    wall = time.perf_counter() - t0
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    print(f"{label:<15} {len(words) - failures:>4}/{len(words)} ok  {wall:>6.2f} s  "
+          f"p95 {p95 * 1000:>7.1f} ms  {server.requests - before_req:>4} requests  "
+          f"{server.connections - before_conn:>4} connections")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=120)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--stall-rate", type=float, default=0.02)
+    parser.add_argument("--rate", type=float, default=200.0, help="client token-bucket rate (requests/s)")
+    args = parser.parse_args()
+
+    words = load_snapshot(DEFAULT_CSV).strings("Word")[: args.words]
+    with StandinServer(args.latency, args.error_rate, args.stall_rate, stall=1.0) as server:
+        client = TTSClient(base_url=server.url, rate=args.rate, burst=args.threads, timeout=0.5,
+                           deadline=5.0, backoff=0.05, seed=0)
+        print(f"{len(words)} words, {args.threads} threads, {args.error_rate:.0%} 429/503, "
+              f"{args.stall_rate:.0%} stalls, {args.latency * 1000:.0f} ms latency")
+        run("fresh session", fresh_session(client), words, args.threads, server)
+        run("shared client", client.synthesize, words, args.threads, server)
+        print(f"client stats: {client.stats}")
+
+        limited = TTSClient(base_url=server.url, rate=20.0, burst=1, timeout=0.5, deadline=30.0, seed=0)
+        t0 = time.perf_counter()
+        ok = sum(1 for _ in ThreadPoolExecutor(args.threads).map(limited.synthesize, words[:40]))
+        print(f"rate limit 20/s: {ok} words in {time.perf_counter() - t0:.2f} s "
+              f"({limited.stats['requests'] / (time.perf_counter() - t0):.1f} requests/s incl. retries)")
+
+
+if __name__ == "__main__":
+    main()
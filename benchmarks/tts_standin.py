@@ -0,0 +1,139 @@
+"""
+Local HTTP stand-in for the Google TTS endpoint.
+
+Answers every POST with a gTTS-shaped `batchexecute` response carrying a
+small fake MP3, after an injected latency, and fails a configurable share of
+requests with 429/503 or a stall longer than the client's timeout. It also
+counts the TCP connections it accepted, which shows whether a client reuses
+pooled connections, and keeps the arrival time of every request, which shows
+how a client paces them.
+
+    python benchmarks/tts_standin.py --port 8765 --error-rate 0.2
+    PHONOLOGY_TTS_URL=http://127.0.0.1:8765 streamlit run HOME.py
+
+or from Python: `with StandinServer(latency=0.05, error_rate=0.2) as server: ... server.url`
+"""
+import argparse
+import base64
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_audio(body: bytes) -> bytes:
+    return b"ID3-STANDIN" + hashlib.sha256(body).digest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse the socket
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            server.arrivals.append(time.monotonic())
+            roll = server.random.random()
+            latency = server.random.uniform(*server.latency)
+        time.sleep(latency)
+        if roll < server.stall_rate:
+            time.sleep(server.stall)
+        elif roll < server.stall_rate + server.error_rate:
+            status = 429 if roll < server.stall_rate + server.error_rate / 2 else 503
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        audio = base64.b64encode(fake_audio(body)).decode("ascii")
+        payload = (")]}'\n\n123\n"
+                   f'[["wrb.fr","jQ1olc","[\\"{audio}\\"]",null,null,null,"generic"]]\n').encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients that timed out on a stall hang up before the reply; that's expected
+
+
+class StandinServer:
+    def __init__(self, latency=(0.02, 0.05), error_rate: float = 0.0, stall_rate: float = 0.0,
+                 stall: float = 2.0, port: int = 0, seed: int = 0):
+        if not isinstance(latency, (tuple, list)):
+            latency = (latency, latency)
+        self.httpd = _Server(("127.0.0.1", port), _Handler)
+        self.httpd.latency = tuple(latency)
+        self.httpd.error_rate = error_rate
+        self.httpd.stall_rate = stall_rate
+        self.httpd.stall = stall
+        self.httpd.random = random.Random(seed)
+        self.httpd.lock = threading.Lock()
+        self.httpd.connections = 0
+        self.httpd.requests = 0
+        self.httpd.arrivals = []
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        return self.httpd.connections
+
+    @property
+    def requests(self) -> int:
+        return self.httpd.requests
+
+    @property
+    def arrivals(self) -> list:
+        """`time.monotonic()` of each request as it arrived, in order."""
+        with self.httpd.lock:
+            return list(self.httpd.arrivals)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    with StandinServer(args.latency, args.error_rate, args.stall_rate, port=args.port) as server:
+        print(f"TTS stand-in listening on {server.url}  (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
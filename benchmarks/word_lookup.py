@@ -0,0 +1,41 @@
+"""
+Word Lookup: pandas mask scan (previous implementation) vs the prebuilt index.
+
+    python benchmarks/word_lookup.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from phonology.lookup import WordIndex
+from phonology.snapshot import DEFAULT_CSV
+
+
+def per_call_us(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    df = pd.read_csv(DEFAULT_CSV, encoding="utf-8-sig")
+    words = df["Word"].tolist()
+    index = WordIndex(words)
+    query = "Resignation"
+
+    def mask_scan():
+        mask = df["Word"].str.lower() == query.strip().lower()
+        return df[mask].iloc[0] if mask.any() else None
+
+    build_ms = timeit.timeit(lambda: WordIndex(words), number=3) / 3 * 1000
+    print(f"{len(words)} words, index build {build_ms:.1f} ms (once per dataset version)")
+    print(f"{'mask scan (exact)':<24} {per_call_us(mask_scan, 200):>10.1f} us")
+    print(f"{'index exact':<24} {per_call_us(lambda: index.exact(query), 20000):>10.2f} us")
+    print(f"{'index prefix (re)':<24} {per_call_us(lambda: index.prefix('re'), 20000):>10.2f} us")
+    print(f"{'index fuzzy (resignaton)':<24} {per_call_us(lambda: index.fuzzy('resignaton'), 500):>10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import streamlit as st
 from datetime import datetime, timedelta
 import pandas as pd
-from gtts import gTTS
-import io
+
+from phonology.audio import text_audio
+from phonology.tts_backends import audio_mime
+from phonology.tts_client import TTSError
 
 st.set_page_config(page_title="📘 16-Week Course Schedule", layout="wide")
 st.title("📘 Course Overview")
@@ -80,17 +82,15 @@ with tab2:
 
     st.markdown(f"""{overview_text}""")
 
-    @st.cache_data
     def generate_tts_audio(text: str, lang: str = "en") -> bytes:
-        tts = gTTS(text=text, lang=lang)
-        audio_fp = io.BytesIO()
-        tts.write_to_fp(audio_fp)
-        audio_fp.seek(0)
-        return audio_fp.read()
-
-    audio_bytes = generate_tts_audio(overview_text)
-    # Click-to-play audio (no autoplay)
-    st.audio(audio_bytes, format="audio/mp3", start_time=0)
+        return text_audio(text, lang=lang)
+
+    try:
+        audio = generate_tts_audio(overview_text)
+        # Click-to-play audio (no autoplay)
+        st.audio(audio, format=audio_mime(audio), start_time=0)
+    except TTSError:
+        st.caption("🔇 Audio is unavailable right now.")
 
     # --- Textbook & Software ---
     st.markdown("### 📚 Textbook & Apps")
@@ -1,24 +1,24 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import qrcode
-from PIL import Image
-from wordcloud import WordCloud
 import streamlit.components.v1 as components  # For embedding YouTube videos
-from gtts import gTTS
 import io
+import time
 from streamlit_drawable_canvas import st_canvas
-import streamlit.components.v1 as components
-import random
 
-# Function to create word cloud
-def create_wordcloud(text):
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
-    return wordcloud
+from phonology.audio import text_audio
+from phonology.drawings import (LIVE_SYNC_SECONDS, compact_objects, get_drawing_store, payload_bytes, safe_name,
+                                to_initial_drawing)
+from phonology.grouping import GroupingError, form_groups, group_sizes, pairs_from_grouped
+from phonology.links import EXAM_VIDEOS, PHONETICS_APPS
+from phonology.qr import ERROR_LEVELS, parse_links, qr_png, render_sheet
+from phonology.roster import get_roster_index, roster_index_from_upload
+from phonology.tts_backends import audio_mime
+from phonology.tts_client import TTSError
+from phonology.word_cloud import FIELDS, get_cloud_renderer
+
 
 # Streamlit tabs
-tabs = st.tabs(["📈 QR", "⏳ Timer", "👥 Grouping", "🐤 GoogleSheet","🔊 Text-to-Speech", "🎨 Drawing"])
+tabs = st.tabs(["📈 QR", "⏳ Timer", "👥 Grouping", "🐤 GoogleSheet","🔊 Text-to-Speech", "🎨 Drawing", "☁️ Word Cloud"])
 
 # QR Code tab
 with tabs[0]:
@@ -35,26 +35,44 @@ with tabs[0]:
         st.write("")  # Add spacing for alignment
         generate_qr_button = st.button("🔆 Click to Generate QR", key="generate_qr")
 
-    if generate_qr_button and qr_link:
-        # ✅ Generate the QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(qr_link)
-        qr.make(fit=True)
-
-        qr_img = qr.make_image(fill='black', back_color='white')
+    error_level = st.select_slider(
+        "Error correction (higher survives smudges and logos, but makes denser codes)",
+        options=list(ERROR_LEVELS), value="L", key="qr_error_level",
+    )
 
-        # ✅ Convert the QR code image to RGB format and resize
-        qr_img = qr_img.convert('RGB')
-        qr_img = qr_img.resize((600, 600))
+    if generate_qr_button and qr_link:
+        # ✅ Generate the QR code (memoized per link and error level)
+        qr_img = qr_png(qr_link, error_level)
 
         # ✅ Display the QR code with caption
         st.image(qr_img, caption=caption if caption else "Generate", use_container_width=False, width=400)
 
+    # Batch mode: a printable sheet of many codes
+    with st.expander("📄 QR sheet for many links"):
+        preset = st.radio("Links", ["Phonetics apps", "Exam videos", "My own list"], horizontal=True,
+                          key="qr_sheet_preset")
+        if preset == "Phonetics apps":
+            sheet_items = [(app["url"], app["name"]) for app in PHONETICS_APPS]
+        elif preset == "Exam videos":
+            sheet_items = [(url, label) for label, url in sorted(EXAM_VIDEOS.items())]
+        else:
+            sheet_items = parse_links(st.text_area(
+                "One link per line, optionally with a caption: `caption | link`", key="qr_sheet_links"))
+        st.caption(f"{len(sheet_items)} link(s)")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            sheet_columns = st.radio("Codes per row", [2, 3, 4], index=1, horizontal=True, key="qr_sheet_columns")
+        with col2:
+            sheet_format = st.radio("Format", ["PDF", "PNG"], horizontal=True, key="qr_sheet_format")
+
+        if st.button("🖨️ Build QR sheet", key="qr_sheet_build") and sheet_items:
+            rows = {2: 3, 3: 4, 4: 5}[sheet_columns]
+            data, mime, ext = render_sheet(sheet_items, error_level=error_level, columns=sheet_columns,
+                                           rows=rows, fmt=sheet_format.lower())
+            st.download_button("📥 Download QR sheet", data=data, file_name=f"qr_sheet.{ext}", mime=mime,
+                               key="qr_sheet_download")
+
 
 # Timer tab
 with tabs[1]:
@@ -62,7 +80,7 @@ with tabs[1]:
     huggingface_space_url = "https://MK-316-mytimer.hf.space"
     
     # Use Streamlit components to embed the external page
-    st.components.v1.html(f"""
+    components.html(f"""
         <iframe src="{huggingface_space_url}" width="100%" height="600px" frameborder="0" allow="accelerometer; autoplay; encrypted-media; gyroscope; picture-in-picture" allowfullscreen></iframe>
     """, height=600)
 
@@ -70,23 +88,25 @@ with tabs[1]:
 with tabs[2]:
     st.subheader("👥 Grouping Tool")
     st.caption("Your CSV should have at least the columns `Course` and `Name_ori`.")
-    default_url = "https://raw.githubusercontent.com/MK316/mk316files/refs/heads/main/roster/roster_fall26_0820.csv"
-#    st.markdown(f"[📎 Sample File: S25DL-roster.csv]({default_url})")
     uploaded_file = st.file_uploader("🌱 Step1: Upload your CSV file (optional)", type=["csv"])
+    roster = None
     if uploaded_file is not None:
-        df = pd.read_csv(uploaded_file)
+        roster = roster_index_from_upload(uploaded_file.getvalue())
         source_label = "✅ File uploaded"
     else:
-        df = pd.read_csv(default_url)
-        source_label = "📂 Using default GitHub data"
-    if all(col in df.columns for col in ['Course', 'Name_ori']):
+        try:
+            roster = get_roster_index()
+            source_label = "📂 Using default GitHub data"
+        except Exception:
+            st.error("❗ Could not load the default roster. Please upload your CSV file.")
+    if roster is not None and roster.valid:
         st.success(source_label)
         # Step 1: Select Course
-        course_list = df['Course'].dropna().unique().tolist()
+        course_list = roster.courses
         selected_course = st.selectbox("🌱 Step 2: Select Course for Grouping", course_list)
 
         SPECIAL_COURSE = '디지털리터러시와영어교육'
-        is_special = (selected_course == SPECIAL_COURSE) and ('Year' in df.columns)
+        is_special = (selected_course == SPECIAL_COURSE) and roster.has_year
 
         # Step 2: Group size info / selection
         if is_special:
@@ -105,139 +125,64 @@ with tabs[2]:
                 "If 2 students remain, they form a separate small group."
             )
 
-        def distribute_standard(names, group_size):
-            """
-            Split `names` into groups of `group_size`.
-            - remainder == 0: all groups exactly `group_size`
-            - remainder == 1: folded into the last group (last group = group_size + 1)
-            - remainder == 2: kept as its own separate small group
-            - if there aren't enough members for even one full group,
-              everyone goes into a single group.
-            """
-            total = len(names)
-            if total == 0:
-                return []
-
-            base = total // group_size
-            remainder = total % group_size
-
-            if base == 0:
-                # Not enough members for a single full-size group
-                return [names]
-
-            groups = []
-            pos = 0
-
-            if remainder == 0:
-                for _ in range(base):
-                    groups.append(names[pos:pos + group_size])
-                    pos += group_size
-
-            elif remainder == 1:
-                # Build (base - 1) full groups, then fold remainder into the last group
-                for _ in range(base - 1):
-                    groups.append(names[pos:pos + group_size])
-                    pos += group_size
-                groups.append(names[pos:])  # last group gets group_size + 1 members
-
-            else:  # remainder == 2
-                for _ in range(base):
-                    groups.append(names[pos:pos + group_size])
-                    pos += group_size
-                groups.append(names[pos:])  # separate group of 2
-
-            return groups
+        balance_columns = st.multiselect(
+            "Balance groups by (optional)",
+            [c for c in roster.columns if c not in ("Course", "Name_ori")],
+            default=[],
+            help="Each group gets roughly the same mix of these columns as the whole course.",
+        )
+        previous_files = st.file_uploader(
+            "Avoid repeating pairs from earlier groupings (optional: grouped CSVs downloaded here)",
+            type=["csv"],
+            accept_multiple_files=True,
+        )
 
         if st.button("🌱 Step 4: Generate Groups"):
-            # Filter by course
-            course_df = df[df['Course'] == selected_course]
-            grouped_data = []
+            students = roster.rows(selected_course)
+            balance = {col: 1.0 for col in balance_columns}
+            limits = {}
 
             if is_special:
                 # --- Year-aware grouping for 디지털리터러시와영어교육 ---
-                try:
-                    course_df = course_df.copy()
-                    course_df['Year'] = course_df['Year'].astype(int)
-                except Exception:
+                if roster.years(selected_course) is None:
                     st.error("❗ The `Year` column must contain integer values (1 or 2).")
                     st.stop()
-
-                year1 = course_df.loc[course_df['Year'] == 1, 'Name_ori'].dropna().tolist()
-                year2 = course_df.loc[course_df['Year'] == 2, 'Name_ori'].dropna().tolist()
-                total_students = len(year1) + len(year2)
-
-                if total_students == 0:
-                    st.error(f"❗ No students found in {selected_course}.")
-                    st.stop()
-
-                # Same floor-division rule: remainder folds into the last group
-                num_groups = max(1, total_students // group_size)
-                n2 = len(year2)
-
-                # Each group must have 1 or 2 second-year students
-                if n2 < num_groups:
-                    st.error(
-                        f"❗ Only {n2} second-year students available, but {num_groups} groups need "
-                        f"at least 1 each. Not enough second-year students for this grouping."
-                    )
-                    st.stop()
-                if n2 > num_groups * 2:
-                    st.error(
-                        f"❗ {n2} second-year students is too many for {num_groups} groups "
-                        f"(max 2 per group). Consider adjusting the roster."
-                    )
-                    st.stop()
-
-                random.shuffle(year1)
-                random.shuffle(year2)
-
-                # Target overall size per group (4 each, last group absorbs remainder)
-                group_target_sizes = [group_size] * (num_groups - 1)
-                group_target_sizes.append(total_students - group_size * (num_groups - 1))
-
-                groups = [[] for _ in range(num_groups)]
-
-                # Distribute 2nd-years round-robin, 1 or 2 per group
-                base, extra = divmod(n2, num_groups)
-                idx = 0
-                for g in range(num_groups):
-                    take = base + (1 if g < extra else 0)
-                    for _ in range(take):
-                        groups[g].append(year2[idx])
-                        idx += 1
-
-                # Fill remaining slots per group with 1st-years
-                idx = 0
-                for g in range(num_groups):
-                    remaining = group_target_sizes[g] - len(groups[g])
-                    groups[g].extend(year1[idx:idx + remaining])
-                    idx += remaining
-
-                for grp in groups:
-                    random.shuffle(grp)
-
-                for i, grp in enumerate(groups, start=1):
-                    grouped_data.append([f"Group {i}"] + grp)
-
+                students = students[students['Year'].astype(int).isin([1, 2])]
+                students = students.assign(Year=students['Year'].astype(int))
+                balance.setdefault('Year', 1.0)
+                limits[('Year', 2)] = (1, 2)  # each group has 1 or 2 second-year students
+                sizes = group_sizes(len(students), group_size, remainder="fold")
             else:
                 # --- Standard grouping (user-selected group size, 3 or 4) ---
-                names = course_df['Name_ori'].dropna().tolist()
-                random.shuffle(names)
+                sizes = group_sizes(len(students), group_size)
 
-                if len(names) == 0:
-                    st.error(f"❗ No students found in {selected_course}.")
-                    st.stop()
+            if len(students) == 0:
+                st.error(f"❗ No students found in {selected_course}.")
+                st.stop()
 
-                groups = distribute_standard(names, group_size)
+            history = []
+            for f in previous_files or []:
+                history.extend(pairs_from_grouped(pd.read_csv(f)))
 
-                for i, grp in enumerate(groups, start=1):
-                    grouped_data.append([f"Group {i}"] + grp)
+            try:
+                result = form_groups(students, sizes, balance=balance, limits=limits, history=history)
+            except GroupingError as exc:
+                st.error(f"❗ {exc}")
+                st.stop()
+            if result.repeats:
+                st.warning(f"⚠️ {result.repeats} pair(s) from earlier groupings could not be separated.")
+
+            grouped_data = [[f"Group {i}"] + grp for i, grp in enumerate(result.names(), start=1)]
 
             # Prepare final DataFrame
             max_members = max(len(group) - 1 for group in grouped_data)
             columns = ['Group'] + [f'Member{i+1}' for i in range(max_members)]
             grouped_df = pd.DataFrame(grouped_data, columns=columns)
-            st.success(f"✅ {selected_course}: Grouping complete!")
+            if result.violations:
+                st.error(f"❗ {selected_course}: some groups break the Year rule (1 or 2 second-year "
+                         f"students per group), {result.violations} student(s) off. Check them or generate again.")
+            else:
+                st.success(f"✅ {selected_course}: Grouping complete!")
             st.write(grouped_df)
             # Download button
             csv_buffer = io.StringIO()
@@ -248,7 +193,7 @@ with tabs[2]:
                 file_name=f"grouped_{selected_course.replace(' ', '_')}.csv",
                 mime="text/csv"
             )
-    else:
+    elif roster is not None:
         st.error("The file must contain both `Course` and `Name_ori` columns.")
 
 with tabs[3]:
@@ -308,19 +253,15 @@ with tabs[4]:
         }
         language_code, tld = lang_codes[language]
 
-        # Assuming you have a version of gTTS that supports tld or you have modified it:
-        # This check ensures that the tld parameter is only used when not None.
-        if tld:
-            tts = gTTS(text=text_input, lang=language_code, tld=tld, slow=False)
+        # Cached on disk and shared with the other pages; tld=None means the default domain.
+        # Longer text is synthesized sentence by sentence in parallel and joined into one clip.
+        try:
+            speech = text_audio(text_input, lang=language_code, tld=tld, slow=False)
+        except TTSError:
+            st.error("The text-to-speech service is busy. Please try again in a moment.")
         else:
-            tts = gTTS(text=text_input, lang=language_code, slow=False)
-        
-        speech = io.BytesIO()
-        tts.write_to_fp(speech)
-        speech.seek(0)
-
-        # Display the audio file
-        st.audio(speech.getvalue(), format='audio/mp3')
+            # Display the audio file
+            st.audio(speech, format=audio_mime(speech))
     st.markdown("---")
     st.caption("🇺🇸 English text: Teacher-designed coding applications create tailored learning experiences, making complex concepts easier to understand through interactive and adaptive tools. They enhance engagement, provide immediate feedback, and support active learning.")
     st.caption("🇰🇷 Korean text: 교사가 직접 만든 코딩 기반 애플리케이션은 학습자의 필요에 맞춘 학습 경험을 제공하고, 복잡한 개념을 쉽게 이해하도록 돕습니다. 또한 학습 몰입도를 높이고 즉각적인 피드백을 제공하며, 능동적인 학습을 지원합니다.")
@@ -332,33 +273,132 @@ with tabs[4]:
 with tabs[5]:
     st.caption("Use the canvas below to draw freely. You can change the stroke width and color.")
 
-   # Place Stroke Width, Stroke Color, and Background Color in the same row
-    col1, col2, col3 = st.columns([1, 1, 1])
+    drawing_store = get_drawing_store()
+
+    def clear_canvas():
+        st.session_state["canvas_rev"] += 1  # a new key mounts an empty canvas
+        st.session_state["canvas_initial"] = None
+        st.session_state["canvas_objects"] = []
+
+    def load_drawing(name):
+        objects = drawing_store.load(name)["objects"]
+        st.session_state["canvas_rev"] += 1
+        st.session_state["canvas_initial"] = to_initial_drawing(objects)
+        st.session_state["canvas_objects"] = objects
 
+    # Outside the fragment: switching it re-registers the fragment with or without polling.
+    live_sync = st.toggle(
+        "Live sync", value=True, key="canvas_live_sync",
+        help=f"Send the drawing to the app while you draw, at most every {LIVE_SYNC_SECONDS} s. "
+             "The canvas toolbar's upload button sends it right away.",
+    )
+
+    # The tab reruns on its own: drawing, clearing, saving and loading never
+    # re-execute the other tabs. While live sync is on it also reruns every
+    # LIVE_SYNC_SECONDS to let the next sync through.
+    @st.fragment(run_every=LIVE_SYNC_SECONDS if live_sync else None)
+    def drawing_tab():
+        state = st.session_state
+        state.setdefault("canvas_rev", 0)
+        state.setdefault("canvas_initial", None)
+        state.setdefault("canvas_objects", [])
+        state.setdefault("canvas_syncs", 0)
+        state.setdefault("canvas_raw_bytes", 0)
+        state.setdefault("canvas_sync_after", 0.0)
+
+        # Place Stroke Width, Stroke Color, and Background Color in the same row
+        col1, col2, col3 = st.columns([1, 1, 1])
+
+        with col1:
+            stroke_width = st.slider("✏️ Stroke Width", 1, 10, 5)
+        with col2:
+            stroke_color = st.color_picker("🖌 Stroke Color", "#000000")
+        with col3:
+            bg_color = st.color_picker("🖼 Background Color", "#FFFFFF")
+
+        # Throttled live sync: after a sync the canvas holds further strokes back
+        # until LIVE_SYNC_SECONDS have passed, then sends them with the next stroke.
+        canvas_result = st_canvas(
+            fill_color="rgba(255, 165, 0, 0.3)",
+            stroke_width=stroke_width,
+            stroke_color=stroke_color,
+            background_color=bg_color,
+            update_streamlit=live_sync and time.monotonic() >= state["canvas_sync_after"],
+            height=400,
+            width=600,
+            drawing_mode="freedraw",
+            initial_drawing=state["canvas_initial"],
+            key=f"main_canvas_{state['canvas_rev']}",
+        )
+
+        # Keep only the compact stroke list; the raw Fabric JSON is dropped here.
+        if canvas_result.json_data is not None:
+            objects = compact_objects(canvas_result.json_data)
+            if objects != state["canvas_objects"]:
+                state["canvas_objects"] = objects
+                state["canvas_syncs"] += 1
+                state["canvas_raw_bytes"] = payload_bytes(canvas_result.json_data)
+                state["canvas_sync_after"] = time.monotonic() + LIVE_SYNC_SECONDS
+
+        objects = state["canvas_objects"]
+        st.caption(
+            f"{len(objects)} stroke(s) synced · {payload_bytes(objects) / 1024:.1f} KB kept "
+            f"({state['canvas_raw_bytes'] / 1024:.1f} KB as canvas JSON) · {state['canvas_syncs']} sync(s)"
+        )
+
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            drawing_name = st.text_input("Drawing name", key="canvas_save_name")
+            name_ok = bool(safe_name(drawing_name))
+            if drawing_name and not name_ok:
+                st.caption("Use letters or digits in the name.")
+            taken = name_ok and drawing_store.exists(drawing_name)
+            replace = taken and st.checkbox(f"Replace the saved drawing “{drawing_name}”", key="canvas_replace")
+            if st.button("💾 Save drawing", disabled=not (name_ok and objects and (replace or not taken))):
+                try:
+                    size = drawing_store.save(drawing_name, objects, width=600, height=400,
+                                              background=bg_color, overwrite=replace)
+                except FileExistsError:
+                    st.warning("A drawing with this name was just saved by someone else; pick another name.")
+                else:
+                    st.success(f"Saved {len(objects)} stroke(s) ({size / 1024:.1f} KB).")
+        with col2:
+            saved = drawing_store.names()
+            chosen = st.selectbox("Saved drawings", saved, index=None, key="canvas_load_name")
+            st.button("📂 Load drawing", disabled=chosen is None, on_click=load_drawing, args=(chosen,))
+        with col3:
+            # Clear Canvas button
+            st.button("🗑️ Clear Canvas", on_click=clear_canvas)
+
+    drawing_tab()
+
+# Word cloud tab
+with tabs[6]:
+    st.caption("Word cloud of the stress word list (rendered in the background and cached)")
+    renderer = get_cloud_renderer()
+    cloud_field = st.radio("Words from", FIELDS, horizontal=True, key="cloud_field")
+    col1, col2 = st.columns(2)
     with col1:
-        stroke_width = st.slider("✏️ Stroke Width", 1, 10, 5)
+        cloud_groups = st.multiselect("Group", renderer.groups(), key="cloud_groups")
     with col2:
-        stroke_color = st.color_picker("🖌 Stroke Color", "#000000")
-    with col3:
-        bg_color = st.color_picker("🖼 Background Color", "#FFFFFF")
-
-    # Initialize session state for clearing
-    if "clear_canvas" not in st.session_state:
-        st.session_state["clear_canvas"] = False
-
-    # Create the canvas (Unique key prevents duplication)
-    canvas_result = st_canvas(
-        fill_color="rgba(255, 165, 0, 0.3)",  
-        stroke_width=stroke_width,
-        stroke_color=stroke_color,
-        background_color=bg_color,
-        height=400,
-        width=600,
-        drawing_mode="freedraw",
-        key="main_canvas" if not st.session_state["clear_canvas"] else "new_canvas"
-    )
+        cloud_categories = st.multiselect("Grammatical category", renderer.categories(), key="cloud_categories")
+
+    def show_cloud(field, groups, categories, polling=False):
+        path = renderer.get(field, groups, categories)
+        error = renderer.error(field, groups, categories)
+        if polling and (path is not None or error):
+            # rerun the page so the result is shown outside the polling fragment
+            st.rerun(scope="app")
+        if path is not None:
+            st.image(path, use_container_width=True)
+        elif error:
+            st.warning(f"⚠️ No word cloud: {error}")
+        else:
+            st.info("☁️ Rendering the word cloud… it will appear here in a moment.")
 
-    # Clear Canvas button
-    if st.button("🗑️ Clear Canvas"):
-        st.session_state["clear_canvas"] = not st.session_state["clear_canvas"]
-        st.rerun()  # This forces Streamlit to reload and clear the drawing
+    # Poll only while the image is still being rendered; a cached one is shown directly.
+    cloud_args = (cloud_field, tuple(cloud_groups), tuple(cloud_categories))
+    if renderer.get(*cloud_args) is None and renderer.error(*cloud_args) is None:
+        st.fragment(show_cloud, run_every=1.0)(*cloud_args, polling=True)
+    else:
+        show_cloud(*cloud_args)
@@ -1,38 +1,14 @@
 import streamlit as st
 
+from phonology.links import PHONETICS_APPS
+
 st.set_page_config(page_title="My App Collection", layout="centered")
 
 st.title("📚 Chapter 1 Applications")
 st.write("Click a button below to open the app in a new tab. Each app is designed for English education with interactive features.")
 
-# Define your apps here
-apps = [
-    {
-        "name": "1. Vocal Anatomy",
-        "url": "https://vocal-anatomy.streamlit.app/",
-        "description": "Explore the structure and function of vocal organs involved in speech production."
-    },
-    {
-        "name": "2. Consonant Full Description",
-        "url": "https://sound-description-1.streamlit.app/",
-        "description": "Review English consonants by their voicing, place, manner, centrality, and oro-nasal process."
-    },
-    {
-        "name": "3. Chapter 1 Term Practice & Quiz",
-        "url": "https://ch1-term-practice.streamlit.app/",
-        "description": "Test your understanding of key phonetics terms from Chapter 1 through interactive quizzes."
-    },
-    {
-        "name": "4. IPA practice",
-        "url": "https://ipa-practice.streamlit.app/",
-        "description": "Practice your familiarity with English IPA symbols by identifying articulatory features."
-    },
-    {
-        "name": "5. IPA quiz",
-        "url": "https://ipa-quiz2.streamlit.app/",
-        "description": "IPA quiz application."
-    }
-]
+# Apps are listed in phonology/links.py (shared with the QR sheet tool)
+apps = PHONETICS_APPS
 
 
 # Display each app as a colored button with description
@@ -1,44 +1,18 @@
 import streamlit as st
-import pandas as pd
-import tempfile
-from gtts import gTTS
+
+from phonology.audio import word_audio
+from phonology.ipa import PRIMARY, get_phoneme_index
+from phonology.stress import STRESS_OPTIONS, full_pos, stress_circles_html, stress_partition
+from phonology.tts_backends import audio_mime
+from phonology.tts_client import TTSError
+from phonology.words import get_words
 
 # Set page configuration for wider layout
 st.set_page_config(layout="wide")
 
-# Load the dataset from GitHub
-@st.cache_data
-def load_data(url):
-    return pd.read_csv(url)
-
-csv_url = "https://raw.githubusercontent.com/MK316/stress2024/refs/heads/main/data/data20241216.csv"
-df = load_data(csv_url)
-
-# POS mapping
-pos_mapping = {
-    "n": "Noun",
-    "adj": "Adjective",
-    "v": "Verb",
-    "adv": "Adverb"
-}
-
-# Convert POS abbreviations to full forms
-def convert_pos(pos_abbrev):
-    return ", ".join([pos_mapping.get(p.strip(), p.strip()) for p in pos_abbrev.split(',')])
-
-# Function to add visual circles for stress patterns
-def add_stress_circles(stress):
-    stress_options = ["1st", "2nd", "antepenult", "penult", "ult"]
-    circle_html = "<div style='display: flex; flex-direction: row; justify-content: center; gap: 20px;'>"
-    for idx, option in enumerate(stress_options):
-        background_color = "yellow" if option == stress else "white"
-        text_color = "black" if option == stress else "gray"
-        border_color = "gray"
-        circle_html += f"<div style='width: 100px; height: 60px; background: {background_color}; border: 2px solid {border_color}; color: {text_color}; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-size: 16px;'>{option.capitalize()}</div>"
-        if option == "2nd":
-            circle_html += "<div style='display: flex; align-items: center; justify-content: center; color: gray; font-size: 16px;'> (optional syllables) </div>"
-    circle_html += "</div>"
-    return circle_html
+# Shared word list (last fetched copy on disk first; GitHub is revalidated in the background)
+words = get_words("stress2024")
+df = words.frame()
 
 # Initialize session state for button click
 if 'button_clicked' not in st.session_state:
@@ -49,17 +23,17 @@ st.markdown("### ⛄ 1. Words-by-stress")
 st.caption("Chapter 7. Stress; A total of 564 words")
 st.caption("Focus on learning the first word's details, and understand the variations as a reference.")
 st.markdown("[Error report](https://docs.google.com/spreadsheets/d/1luqWB2qoJ51QNyyLJ6AFUdhJw7d8oDyFsJFmPOsa5FM/edit?usp=sharing): If you find quesitonable item, report it on this Google Sheet.")
-selected_stress = st.selectbox("🔴 Select Stress Position", ["1st", "2nd", "antepenult", "penult", "ult", "compound"])
+selected_stress = st.selectbox("🔴 Select Stress Position", STRESS_OPTIONS)
 
 # Display stress circles
 if selected_stress:
-    st.markdown(add_stress_circles(selected_stress), unsafe_allow_html=True)
+    st.markdown(stress_circles_html(selected_stress), unsafe_allow_html=True)
 
-    # Display data based on selected stress
-    filtered_data = df[df['Stress'] == selected_stress]
+    # Display data based on selected stress (partitions are built once per dataset version)
+    filtered_data = stress_partition(words, selected_stress)
     st.write("")
     st.write(f"🌱 Total words with '{selected_stress}' stress: {len(filtered_data)}")
-    st.dataframe(filtered_data[['Word', 'POS', 'Transcription', 'Variation']], width=600, height=200)
+    st.dataframe(filtered_data, width=600, height=200)
 
 # Word Search with Audio Playback
 st.markdown("### ❄️ 2. Word details with Audio")
@@ -73,27 +47,31 @@ search_button = st.button("Search", on_click=on_search)
 
 if search_button or st.session_state.button_clicked:
     try:
-        # Convert user input to integer index
+        # Convert user input to the word's number
         index = int(user_input)
-        # Access the DataFrame by index
-        row = df.iloc[index]
-        
-        pos = row['POS']
-        full_pos = convert_pos(pos)
+        row = words.row(index)
+        if row is None:
+            raise IndexError(index)
+
+        full_pos_name = full_pos(words, index)
         stress = row['Stress']
         transcription = row['Transcription']
         word = row['Word']
         variation = row.get('Variation', 'N/A')  # Assuming 'Variation' might not exist
 
-        tts = gTTS(text=word, lang='en')
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        tts.save(temp_file.name)
+        try:
+            audio = word_audio(word)  # shares pre-rendered audio and caches with Word & Transcription
+        except TTSError:
+            audio = None
 
-        st.write(f"POS: {full_pos}")
+        st.write(f"POS: {full_pos_name}")
         st.write(f"Stress: {stress}")
         st.write(f"IPA: {transcription}")
         st.write(f"Variation: {variation}")
-        st.audio(temp_file.name)
+        if audio:
+            st.audio(audio, format=audio_mime(audio))
+        else:
+            st.caption("🔇 Audio is unavailable right now.")
 
     except ValueError:
         st.error("Please enter a valid integer index.")
@@ -101,3 +79,22 @@ if search_button or st.session_state.button_clicked:
         st.error("Index out of range. Please enter a valid index.")
     finally:
         st.session_state.button_clicked = False  # Reset state after the search attempt
+
+# Search by sound (phoneme inverted index over Transcription + Variation)
+st.markdown("### 🔍 3. Search by sound")
+st.caption("Type one or more IPA symbols (e.g. ʒ, ŋ, tʃ, eɪʃ) and/or choose where the primary stress falls.")
+phoneme_index = get_phoneme_index(words.dataset)
+
+s1, s2 = st.columns([2, 1])
+with s1:
+    sound_query = st.text_input("🔴 Sound or sound sequence", key="sound_query", placeholder="e.g., ʒ")
+    st.caption("Symbols in this list: " + " ".join(phoneme_index.symbols()))
+with s2:
+    stress_syllable = st.selectbox("Primary stress (ˈ) on syllable", ["Any", 1, 2, 3, 4, 5], key="sound_stress")
+
+if sound_query.strip() or stress_syllable != "Any":
+    stress_filter = None if stress_syllable == "Any" else (PRIMARY, stress_syllable)
+    rows = phoneme_index.search(sound_query.strip(), stress=stress_filter)
+    st.write(f"🌱 Matching words: {len(rows)}")
+    if rows:
+        st.dataframe(df.iloc[rows][['Word', 'POS', 'Stress', 'Transcription', 'Variation']], width=600, height=200)
@@ -1,85 +1,59 @@
 import streamlit as st
-import pandas as pd
-from gtts import gTTS
-from io import BytesIO
-from datetime import datetime
 
-# For PDF generation
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
+from phonology.analytics import write_quiz_log
+from phonology.audio import prefetch_word, word_audio
+from phonology.lookup import get_word_index
+from phonology.practice import ORDERS, ROW_FIELDS, make_subset
+from phonology.prefetch import DEFAULT_DEPTH, MAX_DEPTH
+from phonology.quiz import CORRECT, EMPTY, QuizEngine
+from phonology.report import cached_pdf_report
+from phonology.results_store import get_results_store
+from phonology.snapshot import get_word_table
+from phonology.tts_backends import audio_mime
+from phonology.tts_client import TTSError
 
 st.set_page_config(page_title="Word & Transcription Practice App", layout="wide")
 
-# ---- CSV URL ----
-CSV_URL = "https://raw.githubusercontent.com/MK316/English-phonology/refs/heads/main/data/Stress-wordlist-2025.csv"
-
-@st.cache_data
-def load_data():
-    df = pd.read_csv(CSV_URL, encoding="utf-8-sig")
-    return df
-
-@st.cache_resource
-def tts_audio(word: str) -> bytes:
-    tts = gTTS(text=word, lang="en")
-    fp = BytesIO()
-    tts.write_to_fp(fp)
-    fp.seek(0)
-    return fp.read()
-
-df = load_data()
-
-# ---------- PDF helper ----------
-def create_pdf_report(username, history, score, start_time, end_time):
-    """
-    Create a PDF report and return it as bytes.
-    history: list of dicts with keys {'word', 'correct'}.
-    """
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
-    y = height - 50
-
-    # Title
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y, "Word Quiz Report")
-    y -= 30
-
-    c.setFont("Helvetica", 11)
-    c.drawString(50, y, f"Name: {username}")
-    y -= 18
-    if start_time:
-        c.drawString(50, y, f"Start time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        y -= 18
-    if end_time:
-        c.drawString(50, y, f"End time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        y -= 18
-
-    total_items = len(history)
-    c.drawString(50, y, f"Score: {score} / {total_items}")
-    y -= 30
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Items practiced:")
-    y -= 20
-
-    c.setFont("Helvetica", 10)
-    for i, item in enumerate(history, start=1):
-        status = "Correct" if item["correct"] else "Incorrect"
-        line = f"{i}. {item['word']}  -  {status}"
-        if y < 50:  # new page if needed
-            c.showPage()
-            y = height - 50
-            c.setFont("Helvetica", 10)
-        c.drawString(50, y, line)
-        y -= 15
-
-    c.save()
-    pdf = buffer.getvalue()
-    buffer.close()
-    return pdf
+def tts_audio(word: str, wid=None):
+    # Pre-rendered audio first (python -m phonology.prerender), then the shared on-disk cache.
+    # Returns a content-hashed /app/static URL for st.audio (bytes if static serving is off).
+    try:
+        return word_audio(word, wid)
+    except TTSError:
+        st.warning("Audio is unavailable right now. Please try again in a moment.")
+        return None
+
+def prefetch_audio(subset, idx: int):
+    # synthesize the next few items' audio while the student works on this one
+    depth = st.session_state.get("prefetch_depth", DEFAULT_DEPTH)
+    for pos in subset[idx + 1: idx + 1 + depth]:
+        row = table.row(pos, ("WID", "Word"))
+        prefetch_word(row["Word"], row["WID"])
+
+# ---- Word list: bundled data/Stress-wordlist-2025.csv, shared read-only by every session ----
+table = get_word_table()
+word_index = get_word_index(table)
+quiz_engine = QuizEngine(lambda pos: table.value(pos, "Word"))
 
 # ---------- helpers for practice tabs ----------
+# Session keys holding row positions into `table`; they are only valid for the
+# dataset version (table.source_sha256) they were made from.
+ROW_KEYS = ("tab1_subset", "tab1_idx", "tab2_subset", "tab2_idx", "tab2_finished", "quiz", "missed_rows")
+
+def drop_stale_rows():
+    # a background revalidation swapped in a new word list: old positions point at other words
+    if st.session_state.get("rows_sha", table.source_sha256) != table.source_sha256:
+        for key in ROW_KEYS:
+            st.session_state.pop(key, None)
+        st.info("The word list was updated, so practice and quiz have been restarted.")
+    st.session_state["rows_sha"] = table.source_sha256
+
+def note_miss(pos):
+    # per-session miss counts (row position -> misses), used by "Review missed"
+    missed = st.session_state.setdefault("missed_rows", {})
+    missed[int(pos)] = missed.get(int(pos), 0) + 1
+    st.session_state["rows_sha"] = table.source_sha256
+
 def init_tab_subset(tab_prefix: str):
     n_key = f"{tab_prefix}_n"
     order_key = f"{tab_prefix}_order"
@@ -89,15 +63,12 @@ def init_tab_subset(tab_prefix: str):
     n = st.session_state.get(n_key, 10)
     order = st.session_state.get(order_key, "Random")
 
-    n = max(1, min(int(n), len(df)))
-
-    if order == "Random":
-        subset = df.sample(n).reset_index(drop=True)
-    else:
-        subset = df.sort_values("WID").head(n).reset_index(drop=True)
-
-    st.session_state[subset_key] = subset
+    # int32 row positions into the shared table, not a DataFrame copy
+    st.session_state[subset_key] = make_subset(
+        table, n, order, misses=st.session_state.get("missed_rows")
+    )
     st.session_state[idx_key] = 0
+    st.session_state["rows_sha"] = table.source_sha256
 
     if tab_prefix == "tab2":
         st.session_state["tab2_answer"] = ""
@@ -130,14 +101,16 @@ def check_tab2_answer():
     if subset is None:
         return
     user = st.session_state.get("tab2_answer", "").strip().lower()
-    correct = subset.iloc[idx]["Word"].strip().lower()
+    word = table.value(subset[idx], "Word")
+    correct = word.strip().lower()
     if not user:
         st.session_state["tab2_feedback"] = "Please type an answer."
     elif user == correct:
         st.session_state["tab2_feedback"] = "✅ Correct!"
     else:
+        note_miss(subset[idx])
         st.session_state["tab2_feedback"] = (
-            f"❌ Incorrect. Correct answer: **{subset.iloc[idx]['Word']}**"
+            f"❌ Incorrect. Correct answer: **{word}**"
         )
 
 # ---------- quiz helpers ----------
@@ -146,74 +119,60 @@ def start_quiz():
     n = st.session_state.get("tab3_n", 10)
     order = st.session_state.get("tab3_order", "Random")
 
-    n = max(1, min(int(n), len(df)))
-
-    if order == "Random":
-        subset = df.sample(n).reset_index(drop=True)
-    else:  # WID order
-        subset = df.sort_values("WID").head(n).reset_index(drop=True)
-
-    st.session_state["quiz_subset"] = subset
-    st.session_state["quiz_idx"] = 0
-    st.session_state["quiz_score"] = 0
+    # one compact QuizState per session (see phonology/quiz.py)
+    st.session_state["quiz"] = quiz_engine.start(
+        make_subset(table, n, order, misses=st.session_state.get("missed_rows")),
+        st.session_state.get("quiz_username", ""),
+    )
+    st.session_state["rows_sha"] = table.source_sha256
     st.session_state["quiz_answer"] = ""
     st.session_state["quiz_feedback"] = ""
-    st.session_state["quiz_finished"] = False
-    st.session_state["quiz_history"] = []  # store per-item results
-    # record time & username snapshot
-    st.session_state["quiz_start_time"] = datetime.now()
-    st.session_state["quiz_end_time"] = None
-    st.session_state["quiz_username_stored"] = (
-        st.session_state.get("quiz_username", "").strip() or "Anonymous"
-    )
 
 def check_quiz_answer():
-    subset = st.session_state.get("quiz_subset")
-    idx = st.session_state.get("quiz_idx", 0)
-    if subset is None:
+    state = st.session_state.get("quiz")
+    if state is None:
         return
 
-    user = st.session_state.get("quiz_answer", "").strip().lower()
-    correct_word = subset.iloc[idx]["Word"].strip().lower()
+    pos = state.current
+    status, word = quiz_engine.submit(state, st.session_state.get("quiz_answer", ""))
 
-    if not user:
+    if status == EMPTY:
         st.session_state["quiz_feedback"] = "Please type an answer."
         return
-
-    is_correct = user == correct_word
-
-    if is_correct:
-        st.session_state["quiz_score"] += 1
+    if status == CORRECT:
         st.session_state["quiz_feedback"] = "✅ Correct!"
     else:
+        note_miss(pos)
         st.session_state["quiz_feedback"] = (
-            f"❌ Incorrect. Correct answer: **{subset.iloc[idx]['Word']}**"
-        )
-
-    # Log result for this item (once)
-    history = st.session_state.get("quiz_history", [])
-    # avoid duplicate logging if user presses submit multiple times
-    already_logged = any(h["index"] == idx for h in history)
-    if not already_logged:
-        history.append(
-            {
-                "index": idx,
-                "word": subset.iloc[idx]["Word"],
-                "correct": is_correct,
-            }
+            f"❌ Incorrect. Correct answer: **{word}**"
         )
-        st.session_state["quiz_history"] = history
-
-    # Move on or finish
-    if st.session_state["quiz_idx"] < len(subset) - 1:
-        st.session_state["quiz_idx"] += 1
+    if not state.finished:
         st.session_state["quiz_answer"] = ""
     else:
-        st.session_state["quiz_finished"] = True
-        st.session_state["quiz_end_time"] = datetime.now()
+        # Queue the finished quiz for the durable results store (batched, non-blocking)
+        items = [
+            (table.value(state.items[i], "WID"), h["word"], h["correct"])
+            for i, h in zip(state.log_items, quiz_engine.history(state))
+        ]
+        quiz_uid = get_results_store().record_quiz(
+            state.username, state.start_time, state.end_time, state.score, items
+        )
+        # Per-quiz log for the item-difficulty analytics (python -m phonology.analytics)
+        try:
+            write_quiz_log(quiz_uid, state.username, items, state.end_time)
+        except OSError:
+            pass
 
 # ---------- UI ----------
 st.title("🎧 Word & Transcription Practice App")
+drop_stale_rows()
+
+st.sidebar.slider(
+    "Audio prefetch depth",
+    0, MAX_DEPTH, DEFAULT_DEPTH,
+    key="prefetch_depth",
+    help="How many upcoming practice items to prepare audio for in the background.",
+)
 
 tab1, tab2, tab3, tab4 = st.tabs(
     ["1️⃣ Listening Practice", "2️⃣ Transcription Reading", "3️⃣ Quiz", "4️⃣ Word Lookup"]
@@ -226,13 +185,13 @@ with tab1:
     with c1:
         st.number_input(
             "Number of words to practice",
-            1, len(df), 10, 1,
+            1, len(table), 10, 1,
             key="tab1_n",
         )
     with c2:
         st.radio(
             "Order",
-            ["Random", "WID order"],
+            ORDERS,
             index=0,
             key="tab1_order",
         )
@@ -242,12 +201,14 @@ with tab1:
     if "tab1_subset" in st.session_state:
         subset = st.session_state["tab1_subset"]
         idx = st.session_state.get("tab1_idx", 0)
-        row = subset.iloc[idx]
+        row = table.row(subset[idx], ROW_FIELDS)
         st.markdown(f"**Item {idx + 1} / {len(subset)}**")
         st.markdown(f"**Word:** {row['Word']}")
         st.text(f"Transcription: {row['Transcription']}")
-        audio_bytes = tts_audio(row["Word"])
-        st.audio(audio_bytes, format="audio/mp3")
+        audio = tts_audio(row["Word"], row["WID"])
+        if audio:
+            st.audio(audio, format=audio_mime(audio))
+        prefetch_audio(subset, idx)
         b1, b2 = st.columns(2)
         with b1:
             st.button("⬅️ Previous", on_click=nav_prev,
@@ -263,13 +224,13 @@ with tab2:
     with c1:
         st.number_input(
             "Number of words to practice",
-            1, len(df), 10, 1,
+            1, len(table), 10, 1,
             key="tab2_n",
         )
     with c2:
         st.radio(
             "Order",
-            ["Random", "WID order"],
+            ORDERS,
             index=0,
             key="tab2_order",
         )
@@ -282,11 +243,13 @@ with tab2:
         finished = st.session_state.get("tab2_finished", False)
 
         if not finished:
-            row = subset.iloc[idx]
+            row = table.row(subset[idx], ROW_FIELDS)
             st.markdown(f"**Item {idx + 1} / {len(subset)}**")
             st.text(f"Transcription: {row['Transcription']}")
-            audio_bytes = tts_audio(row["Word"])
-            st.audio(audio_bytes, format="audio/mp3")
+            audio = tts_audio(row["Word"], row["WID"])
+            if audio:
+                st.audio(audio, format=audio_mime(audio))
+            prefetch_audio(subset, idx)
 
             st.text_input(
                 "Type the word here",
@@ -321,7 +284,7 @@ with tab3:
         st.number_input(
             "Number of quiz items",
             min_value=1,
-            max_value=len(df),
+            max_value=len(table),
             value=10,
             step=1,
             key="tab3_n",
@@ -329,7 +292,7 @@ with tab3:
     with c2:
         st.radio(
             "Order",
-            options=["Random", "WID order"],
+            options=ORDERS,
             index=0,
             key="tab3_order",
         )
@@ -342,15 +305,12 @@ with tab3:
             start_quiz()
 
     # main quiz logic
-    if "quiz_subset" in st.session_state and not st.session_state.get("quiz_finished", False):
-        subset = st.session_state["quiz_subset"]
-        idx = st.session_state.get("quiz_idx", 0)
-        score = st.session_state.get("quiz_score", 0)
-
-        row = subset.iloc[idx]
-        st.markdown(f"**Question {idx + 1} / {len(subset)}**")
+    quiz = st.session_state.get("quiz")
+    if quiz is not None and not quiz.finished:
+        row = table.row(quiz.current, ROW_FIELDS)
+        st.markdown(f"**Question {quiz.idx + 1} / {len(quiz)}**")
         st.text(f"Transcription: {row['Transcription']}")
-        st.markdown(f"**Current score:** {score}")
+        st.markdown(f"**Current score:** {quiz.score}")
 
         st.text_input(
             "Type the word here",
@@ -364,15 +324,13 @@ with tab3:
             st.markdown(feedback)
 
     # quiz finished: show score, restart, and PDF download
-    if st.session_state.get("quiz_finished", False):
-        subset = st.session_state["quiz_subset"]
-        score = st.session_state.get("quiz_score", 0)
-        stored_name = st.session_state.get("quiz_username_stored", "Anonymous")
-        start_time = st.session_state.get("quiz_start_time", None)
-        end_time = st.session_state.get("quiz_end_time", None)
-        history = st.session_state.get("quiz_history", [])
+    if quiz is not None and quiz.finished:
+        score = quiz.score
+        stored_name = quiz.username
+        start_time = quiz.start_time
+        end_time = quiz.end_time
 
-        st.success(f"🎉 Quiz finished! Final score: {score} / {len(subset)}")
+        st.success(f"🎉 Quiz finished! Final score: {score} / {len(quiz)}")
 
         col_a, col_b = st.columns(2)
         with col_a:
@@ -383,13 +341,16 @@ with tab3:
                     start_quiz()
 
         with col_b:
-            if history:
-                pdf_bytes = create_pdf_report(
-                    stored_name, history, score, start_time, end_time
-                )
+            if len(quiz.log_items):
+                # Built on click (not on every rerun) and memoized per finished quiz
+                def quiz_pdf(quiz=quiz):
+                    return cached_pdf_report(
+                        stored_name, quiz_engine.history(quiz), score, start_time, end_time
+                    )
+
                 st.download_button(
                     "📄 Download PDF report",
-                    data=pdf_bytes,
+                    data=quiz_pdf,
                     file_name=f"{stored_name.replace(' ', '_')}_quiz_report.pdf",
                     mime="application/pdf",
                     key="quiz_pdf",
@@ -401,23 +362,47 @@ with tab3:
 with tab4:
     st.subheader("Word Lookup (Transcription + Audio)")
 
+    def pick_lookup_word(word: str):
+        st.session_state["lookup_word"] = word
+        st.session_state["lookup_go"] = True
+
     lookup_word = st.text_input(
         "Type a word to look up",
         key="lookup_word",
         placeholder="e.g., resignation",
     )
 
-    if st.button("Search", key="lookup_search"):
-        if not lookup_word.strip():
+    # As-you-type suggestions (prefix search on the shared index)
+    query = lookup_word.strip()
+    if query and word_index.exact(query) is None:
+        suggestions = word_index.prefix(query, limit=8)
+        if suggestions:
+            st.caption("Suggestions:")
+            cols = st.columns(len(suggestions))
+            for col, word in zip(cols, suggestions):
+                col.button(word, key=f"lookup_suggest_{word}",
+                           on_click=pick_lookup_word, args=(word,))
+
+    search_clicked = st.button("Search", key="lookup_search")
+    if search_clicked or st.session_state.pop("lookup_go", False):
+        if not query:
             st.warning("Please type a word to search.")
         else:
             # case-insensitive match
-            mask = df["Word"].str.lower() == lookup_word.strip().lower()
-            if mask.any():
-                row = df[mask].iloc[0]
+            pos = word_index.exact(query)
+            if pos is not None:
+                row = table.row(pos)
                 st.markdown(f"**Word:** {row['Word']}")
                 st.text(f"Transcription: {row['Transcription']}")
-                audio_bytes = tts_audio(row["Word"])
-                st.audio(audio_bytes, format="audio/mp3")
+                audio = tts_audio(row["Word"], row["WID"])
+                if audio:
+                    st.audio(audio, format=audio_mime(audio))
             else:
                 st.error("Word not found in the list.")
+                close = word_index.fuzzy(query)
+                if close:
+                    st.caption("Did you mean:")
+                    cols = st.columns(len(close))
+                    for col, (_, word) in zip(cols, close):
+                        col.button(word, key=f"lookup_fuzzy_{word}",
+                                   on_click=pick_lookup_word, args=(word,))
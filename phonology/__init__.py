@@ -0,0 +1,6 @@
+"""
+Shared helpers for the English Phonology Streamlit pages.
+
+The pages under `pages/` import from this package so that data and audio
+are loaded once per worker process instead of once per page or session.
+"""
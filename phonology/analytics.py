@@ -0,0 +1,188 @@
+"""
+Item-difficulty analytics over accumulated quiz logs.
+
+The quiz tab writes one small CSV per finished quiz into the log directory
+(`write_quiz_log`). `ItemAnalytics.update()` reads only the log files it has
+not seen before, folds them into running per-item sums with pandas
+group-bys, and saves those sums, so re-running after new quizzes arrive is
+proportional to the new files only. From the sums it derives, per WID:
+
+- accuracy: share of attempts answered correctly
+- discrimination: point-biserial correlation between getting the item right
+  and the student's score on the rest of that quiz
+- trend: weighted least-squares slope of weekly accuracy (per week)
+
+    python -m phonology.analytics                 # per-item table, hardest first
+    python -m phonology.analytics --by Group      # or --by Grammatical_Category
+"""
+import argparse
+import csv
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from phonology.snapshot import DEFAULT_CSV
+
+DATA_HOME = os.path.join(os.path.expanduser("~"), ".local", "share", "english-phonology")
+DEFAULT_LOG_DIR = os.environ.get("PHONOLOGY_QUIZ_LOG_DIR", os.path.join(DATA_HOME, "quiz_logs"))
+DEFAULT_STATE_DIR = os.environ.get("PHONOLOGY_ANALYTICS_DIR", os.path.join(DATA_HOME, "analytics"))
+LOG_COLUMNS = ["quiz_uid", "username", "WID", "word", "correct", "timestamp"]
+ITEM_SUMS = ["n", "sx", "sy", "sxy", "syy"]
+WEEK_SUMS = ["n", "correct"]
+
+
+def write_quiz_log(quiz_uid: str, username: str, items, timestamp, log_dir: str = DEFAULT_LOG_DIR) -> str:
+    """Write one finished quiz as `<log_dir>/<date>_<quiz_uid>.csv`. `items`: [(wid, word, correct), ...]."""
+    os.makedirs(log_dir, exist_ok=True)
+    stamp = timestamp.isoformat(timespec="seconds")
+    path = os.path.join(log_dir, f"{timestamp:%Y%m%d}_{quiz_uid}.csv")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_COLUMNS)
+        for wid, word, correct in items:
+            writer.writerow([quiz_uid, username, wid, word, int(bool(correct)), stamp])
+    os.replace(tmp, path)  # readers never see half-written logs
+    return path
+
+
+class ItemAnalytics:
+    def __init__(self, log_dir: str = DEFAULT_LOG_DIR, state_dir: str = DEFAULT_STATE_DIR):
+        self.log_dir = log_dir
+        self.state_dir = state_dir
+        self._processed_path = os.path.join(state_dir, "processed.txt")
+        self._items_path = os.path.join(state_dir, "item_sums.csv")
+        self._weeks_path = os.path.join(state_dir, "week_sums.csv")
+        self.processed = set()
+        self.item_sums = pd.DataFrame(columns=ITEM_SUMS, dtype=float).rename_axis("WID")
+        self.week_sums = pd.DataFrame(columns=WEEK_SUMS, dtype=float,
+                                      index=pd.MultiIndex.from_arrays([[], []], names=["WID", "week"]))
+        self._load_state()
+
+    # ---------- state ----------
+    def _load_state(self):
+        if os.path.exists(self._processed_path):
+            with open(self._processed_path, encoding="utf-8") as f:
+                self.processed = {line.strip() for line in f if line.strip()}
+        if os.path.exists(self._items_path):
+            self.item_sums = pd.read_csv(self._items_path, index_col="WID")
+        if os.path.exists(self._weeks_path):
+            self.week_sums = pd.read_csv(self._weeks_path, index_col=["WID", "week"])
+
+    def _save_state(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        for path, frame in ((self._items_path, self.item_sums), (self._weeks_path, self.week_sums)):
+            frame.to_csv(path + ".tmp")
+            os.replace(path + ".tmp", path)
+        with open(self._processed_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write("\n".join(sorted(self.processed)))
+        os.replace(self._processed_path + ".tmp", self._processed_path)
+
+    # ---------- incremental aggregation ----------
+    def new_files(self) -> list:
+        if not os.path.isdir(self.log_dir):
+            return []
+        return sorted(n for n in os.listdir(self.log_dir) if n.endswith(".csv") and n not in self.processed)
+
+    def update(self) -> int:
+        """Fold every unseen log file into the running sums. Returns the number of new files."""
+        names = self.new_files()
+        if not names:
+            return 0
+        logs = pd.concat(
+            [pd.read_csv(os.path.join(self.log_dir, n), usecols=LOG_COLUMNS) for n in names],
+            ignore_index=True,
+        )
+        logs = logs.dropna(subset=["WID"])
+        logs["WID"] = logs["WID"].astype(int)
+        x = logs["correct"].astype(float)
+
+        # Rest-of-quiz score for each attempt: (quiz correct - this item) / (quiz items - 1)
+        by_quiz = logs.groupby("quiz_uid")["correct"]
+        quiz_n = by_quiz.transform("size").astype(float)
+        rest_n = (quiz_n - 1).where(quiz_n > 1)
+        y = ((by_quiz.transform("sum") - x) / rest_n).fillna(0.0)
+
+        new_items = pd.DataFrame({"WID": logs["WID"], "n": 1.0, "sx": x, "sy": y, "sxy": x * y, "syy": y * y})
+        new_items = new_items.groupby("WID").sum()
+        self.item_sums = self.item_sums.add(new_items, fill_value=0.0)
+
+        week = pd.to_datetime(logs["timestamp"]).dt.to_period("W").dt.start_time.dt.strftime("%Y-%m-%d")
+        new_weeks = pd.DataFrame({"WID": logs["WID"], "week": week, "n": 1.0, "correct": x})
+        new_weeks = new_weeks.groupby(["WID", "week"]).sum()
+        self.week_sums = self.week_sums.add(new_weeks, fill_value=0.0)
+
+        self.processed.update(names)
+        self._save_state()
+        return len(names)
+
+    # ---------- derived statistics ----------
+    def _trend(self) -> pd.Series:
+        """Per-WID weighted slope of weekly accuracy against week number."""
+        if self.week_sums.empty:
+            return pd.Series(dtype=float, name="trend")
+        w = self.week_sums.reset_index()
+        weeks = pd.to_datetime(w["week"])
+        t = ((weeks - weeks.min()).dt.days / 7.0).to_numpy()
+        n = w["n"].to_numpy()
+        acc = (w["correct"] / w["n"]).to_numpy()
+        parts = pd.DataFrame({"WID": w["WID"], "sw": n, "st": n * t, "sa": n * acc,
+                              "sta": n * t * acc, "stt": n * t * t}).groupby("WID").sum()
+        denom = parts["sw"] * parts["stt"] - parts["st"] ** 2
+        slope = (parts["sw"] * parts["sta"] - parts["st"] * parts["sa"]) / denom.where(denom > 0)
+        return slope.rename("trend")
+
+    def item_stats(self, wordlist: pd.DataFrame = None) -> pd.DataFrame:
+        """One row per WID: attempts, accuracy, discrimination, trend (+ word list columns)."""
+        s = self.item_sums
+        n, sx, sy, sxy, syy = (s[c] for c in ITEM_SUMS)
+        cov = n * sxy - sx * sy
+        var = (n * sx - sx ** 2) * (n * syy - sy ** 2)
+        stats = pd.DataFrame({
+            "attempts": n.astype(int),
+            "accuracy": sx / n,
+            "discrimination": cov / np.sqrt(var.where(var > 0)),
+        })
+        stats = stats.join(self._trend())
+        if wordlist is not None:
+            cols = [c for c in ("Word", "Group", "Grammatical_Category") if c in wordlist.columns]
+            stats = wordlist.set_index("WID")[cols].join(stats, how="right")
+        return stats.sort_values(["accuracy", "attempts"], ascending=[True, False])
+
+    def breakdown(self, by: str, wordlist: pd.DataFrame) -> pd.DataFrame:
+        """Attempts and accuracy per `Group` / `Grammatical_Category` value."""
+        sums = wordlist.set_index("WID")[[by]].join(self.item_sums[["n", "sx"]], how="inner")
+        out = sums.groupby(by)[["n", "sx"]].sum()
+        out["items"] = sums.groupby(by).size()
+        out["accuracy"] = out["sx"] / out["n"]
+        out = out.rename(columns={"n": "attempts"}).astype({"attempts": int})
+        return out[["items", "attempts", "accuracy"]].sort_values("accuracy")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-item difficulty from quiz logs.")
+    parser.add_argument("--logs", default=DEFAULT_LOG_DIR)
+    parser.add_argument("--state", default=DEFAULT_STATE_DIR)
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="word list with WID, Group, Grammatical_Category")
+    parser.add_argument("--by", choices=["Group", "Grammatical_Category"], default=None)
+    parser.add_argument("--top", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    analytics = ItemAnalytics(args.logs, args.state)
+    added = analytics.update()
+    print(f"{added} new log files ({len(analytics.processed)} total)")
+    if analytics.item_sums.empty:
+        return 0
+    wordlist = pd.read_csv(args.csv, encoding="utf-8-sig")
+    with pd.option_context("display.width", 160, "display.max_columns", 20):
+        if args.by:
+            print(analytics.breakdown(args.by, wordlist).round(3).to_string())
+        else:
+            print(analytics.item_stats(wordlist).head(args.top).round(3).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Audio retrieval for the pages.
+
+Every page gets its audio from here, so all of them share the same
+pre-rendered files, on-disk TTS cache, background prefetches and static
+media URLs:
+
+- `word_audio(word, wid)` - one word from a word list; pre-rendered audio
+  by WID first (a word from another dataset is matched to its WID in the
+  main list by spelling), then the shared cache
+- `text_audio(text, lang, tld, slow)` - free text (overview, TTS tab); long
+  text is split into sentences that are synthesized in parallel on the
+  prefetch pool and cached one by one, so editing one sentence re-renders
+  only that sentence
+- `prefetch_word(word, wid)` - start synthesizing a word in the background
+
+The first two return what to pass to `st.audio` (a static URL, or bytes when
+static serving is off) and raise `TTSError` when no audio can be produced.
+"""
+import re
+
+from phonology.audio_cache import synthesize
+from phonology.prefetch import get_prefetcher
+from phonology.prerender import prerendered_path
+from phonology.static_media import audio_source, file_source
+from phonology.tts_backends import join_audio
+
+# After . ! ? followed by a space, after CJK full stops (no space needed), and at line breaks.
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])\s*|\s*\n\s*")
+_WORD = re.compile(r"\w")
+
+
+def main_list_wid(word: str):
+    """WID of `word` in the main word list, or None."""
+    from phonology.lookup import get_word_index
+    from phonology.snapshot import get_word_table
+
+    table = get_word_table()
+    row = get_word_index(table).exact(word)
+    return None if row is None else int(table.value(row, "WID"))
+
+
+def _prerendered(word: str, wid=None):
+    if wid is None:
+        wid = main_list_wid(word)
+    return None if wid is None else prerendered_path(wid, word)
+
+
+def word_audio(word: str, wid=None, lang: str = "en"):
+    path = _prerendered(word, wid) if lang == "en" else None
+    if path is not None:
+        return file_source(path)
+    # joins a background prefetch of the same word if one is still running
+    return audio_source(get_prefetcher().get(word, lang=lang))
+
+
+def prefetch_word(word: str, wid=None, lang: str = "en"):
+    if lang != "en" or _prerendered(word, wid) is None:
+        get_prefetcher().prefetch(word, lang=lang)
+
+
+def split_sentences(text: str) -> list:
+    """`text` as a list of sentences, each kept with its closing punctuation."""
+    sentences, pending = [], ""
+    for piece in _SENTENCE_BREAK.split(text):
+        piece = (piece or "").strip()
+        if not piece:
+            continue
+        # punctuation on its own ("Hello. ... World.") has nothing to speak
+        if not _WORD.search(piece):
+            if sentences:
+                sentences[-1] += " " + piece
+            else:
+                pending += piece + " "
+            continue
+        sentences.append(pending + piece)
+        pending = ""
+    return sentences
+
+
+def sentence_audio(sentences, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+    """Synthesize `sentences` concurrently (each one cached on its own) and join them in order."""
+    prefetcher = get_prefetcher()
+    for sentence in sentences[1:]:
+        prefetcher.prefetch(sentence, lang=lang, tld=tld, slow=slow)
+    # get() joins a running prefetch, or takes over one that is still queued
+    return join_audio([prefetcher.get(sentence, lang=lang, tld=tld, slow=slow) for sentence in sentences])
+
+
+def text_audio(text: str, lang: str = "en", tld: str = "com", slow: bool = False):
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        return audio_source(synthesize(text, lang=lang, tld=tld, slow=slow))
+    return audio_source(sentence_audio(sentences, lang=lang, tld=tld, slow=slow))
@@ -0,0 +1,177 @@
+"""
+Persistent on-disk cache for synthesized speech.
+
+Every page asks this module for audio instead of calling a TTS engine
+directly. Entries are keyed by a hash of (backend, text, lang, tld, slow),
+stored as files named `<key><backend suffix>` (.mp3, .wav) so they survive
+restarts, and evicted least-recently-used once the cache directory grows
+past its size cap. Misses are synthesized by
+the deployment's backend (see `phonology.tts_backends`).
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from phonology.tts_backends import BACKENDS, get_backend
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PHONOLOGY_TTS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "english-phonology", "tts"),
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("PHONOLOGY_TTS_CACHE_MB", "256")) * 1024 * 1024
+AUDIO_SUFFIXES = tuple(sorted({backend.suffix for backend in BACKENDS.values()}))
+
+
+def cache_key(text: str, lang: str = "en", tld: str = "com", slow: bool = False, backend: str = "gtts") -> str:
+    """Content address of one synthesis request."""
+    payload = "\x1f".join([backend, text, lang, tld or "com", "1" if slow else "0"])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Size-capped LRU cache of audio files in a single directory.
+
+    The in-memory index (file name -> size, oldest first) is rebuilt from
+    file modification times at startup, so the LRU order carries over
+    restarts. It covers every backend's files in the directory, so the size
+    cap holds when deployments with different backends share it.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES, backend=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backend = backend or get_backend()
+        self.suffix = self.backend.suffix
+        self._lock = threading.Lock()
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _name(self, key: str) -> str:
+        return key + self.suffix
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, self._name(key))
+
+    def _load_index(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(AUDIO_SUFFIXES):
+                continue
+            try:
+                info = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((info.st_mtime, name, info.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _evict(self):
+        # Caller holds the lock (or is __init__).
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def _read(self, key: str):
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(self._path(key))  # keep LRU order across restarts
+        except OSError:
+            pass
+        return data
+
+    def _store(self, key: str, data: bytes):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        name = self._name(key)
+        with self._lock:
+            if name in self._index:
+                self._total_bytes -= self._index[name]
+            self._index[name] = len(data)
+            self._index.move_to_end(name)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def key(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> str:
+        return cache_key(text, lang, tld, slow, backend=self.backend.name)
+
+    def contains(self, key: str) -> bool:
+        """Whether `key` is on disk, without reading it or touching the hit/miss counters."""
+        return os.path.exists(self._path(key))
+
+    def lookup(self, key: str):
+        """Return cached bytes for `key`, or None. Counts as a hit or miss."""
+        data = self._read(key)
+        name = self._name(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                size = self._index.pop(name, None)
+                if size is not None:
+                    self._total_bytes -= size
+                return None
+            self.hits += 1
+            if name not in self._index:
+                # Written by another worker process sharing the directory.
+                self._index[name] = len(data)
+                self._total_bytes += len(data)
+            self._index.move_to_end(name)
+        return data
+
+    def get(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        """Return audio for the request, synthesizing and storing it on a miss."""
+        tld = tld or "com"
+        key = self.key(text, lang, tld, slow)
+        data = self.lookup(key)
+        if data is None:
+            data = self.backend.synthesize(text, lang=lang, tld=tld, slow=slow)
+            self._store(key, data)
+        return data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "backend": self.backend.name,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache:
+    """Process-wide cache shared by every page and session."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AudioCache()
+    return _cache
+
+
+def synthesize(text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+    """Cached text-to-speech; the entry point used by the pages."""
+    return get_audio_cache().get(text, lang=lang, tld=tld, slow=slow)
@@ -0,0 +1,226 @@
+"""
+Instructor-side batch rendering of quiz reports for a whole class.
+
+    python -m phonology.class_reports histories.jsonl class_reports.zip [--workers N]
+
+The input has one finished quiz per line:
+
+    {"username": "Kim", "start_time": "2026-03-02T09:00:00",
+     "end_time": "2026-03-02T09:20:00", "score": 8,
+     "history": [{"word": "abate", "correct": true}, ...]}
+
+`score` is optional (it is recomputed from `history` if missing). Reports
+are rendered on a process pool and streamed into the ZIP as they finish,
+with a bounded number in flight, so memory stays flat however large the
+class is. A record that fails to render is skipped and listed in the
+one-page class summary (`00_class_summary.pdf`), which is added last.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from phonology.report import create_pdf_report
+
+SUMMARY_NAME = "00_class_summary.pdf"
+
+
+def _parse_time(value):
+    if not value:
+        return None
+    return datetime.fromisoformat(value)
+
+
+class BadRecord:
+    """Stands in for a line of the input that is not valid JSON."""
+
+    def __init__(self, label: str, error: str):
+        self.label = label
+        self.error = error
+
+
+def iter_records(path: str):
+    """
+    Yield one quiz record (dict) per non-empty line of a JSON-lines file; a
+    line that does not parse is yielded as a `BadRecord`, so one corrupt
+    line does not stop the batch.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield BadRecord(f"line {line_no}", f"invalid JSON: {exc}")
+
+
+def render_record(record: dict):
+    """
+    Worker entry point: render one report.
+
+    Returns (username, pdf_bytes, score, n_items, missed_words).
+    """
+    history = record.get("history", [])
+    score = record.get("score")
+    if score is None:
+        score = sum(1 for h in history if h.get("correct"))
+    username = (record.get("username") or "Anonymous").strip() or "Anonymous"
+    pdf = create_pdf_report(username, history, score,
+                            _parse_time(record.get("start_time")), _parse_time(record.get("end_time")))
+    missed = [h["word"] for h in history if not h.get("correct")]
+    return username, pdf, score, len(history), missed
+
+
+def create_class_summary(rows, missed: Counter, elapsed: float, failures=()) -> bytes:
+    """One-page PDF: per-class score statistics, reports that failed, and the most missed words."""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    y = height - 50
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, y, "Class Quiz Summary")
+    y -= 30
+
+    percents = sorted(100.0 * s / n for _, s, n in rows if n)
+    c.setFont("Helvetica", 11)
+    c.drawString(50, y, f"Reports: {len(rows)}")
+    y -= 18
+    if percents:
+        mean = sum(percents) / len(percents)
+        median = percents[len(percents) // 2]
+        c.drawString(50, y, f"Mean score: {mean:.1f}%   Median: {median:.1f}%   "
+                            f"Min: {percents[0]:.1f}%   Max: {percents[-1]:.1f}%")
+        y -= 18
+    c.drawString(50, y, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ({elapsed:.1f} s)")
+    y -= 30
+
+    if failures:
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(50, y, f"Reports that could not be rendered: {len(failures)}")
+        y -= 20
+        c.setFont("Helvetica", 10)
+        for shown, (name, error) in enumerate(failures):
+            if shown == 10:
+                c.drawString(50, y, f"... and {len(failures) - shown} more")
+                y -= 15
+                break
+            c.drawString(50, y, f"{name}  -  {error}"[:110])
+            y -= 15
+        y -= 15
+
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "Most missed words:")
+    y -= 20
+    c.setFont("Helvetica", 10)
+    for word, count in missed.most_common():
+        if y < 50:
+            break  # keep the summary to one page
+        c.drawString(50, y, f"{word}  -  missed by {count}")
+        y -= 15
+
+    c.save()
+    return buffer.getvalue()
+
+
+def _unique_name(username: str, used: set) -> str:
+    base = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in username) or "Anonymous"
+    name = f"{base}_quiz_report.pdf"
+    n = 2
+    while name in used:
+        name = f"{base}_{n}_quiz_report.pdf"
+        n += 1
+    used.add(name)
+    return name
+
+
+def build_class_zip(records, out_path: str, workers: int = None, max_in_flight: int = None, log=print) -> dict:
+    """
+    Render every record into `out_path` (a ZIP). `records` may be any iterable,
+    e.g. `iter_records(path)`; it is consumed lazily.
+
+    A record whose report fails to render, or a `BadRecord`, is skipped and
+    listed in the class summary. Returns {"reports", "failed", "seconds",
+    "reports_per_second", "workers"}.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    rows = []
+    failures = []  # (username or record number, error)
+    missed = Counter()
+    used_names = set()
+    records = iter(records)
+
+    start = time.perf_counter()
+    with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zf, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}  # future -> label for the failure list
+        exhausted = False
+        submitted = 0
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    record = next(records)
+                except StopIteration:
+                    exhausted = True
+                    break
+                submitted += 1
+                if isinstance(record, BadRecord):
+                    failures.append((record.label, record.error))
+                    log(f"skipped {record.label}: {record.error}")
+                    continue
+                label = record.get("username") if isinstance(record, dict) else None
+                pending[pool.submit(render_record, record)] = label or f"record {submitted}"
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                label = pending.pop(future)
+                try:
+                    username, pdf, score, n_items, missed_words = future.result()
+                except Exception as exc:
+                    failures.append((label, f"{type(exc).__name__}: {exc}"))
+                    log(f"skipped {label}: {type(exc).__name__}: {exc}")
+                    continue
+                zf.writestr(_unique_name(username, used_names), pdf)
+                rows.append((username, score, n_items))
+                missed.update(missed_words)
+        elapsed = time.perf_counter() - start
+        zf.writestr(SUMMARY_NAME, create_class_summary(rows, missed, elapsed, failures))
+
+    summary = {
+        "reports": len(rows),
+        "failed": len(failures),
+        "seconds": round(elapsed, 3),
+        "reports_per_second": round(len(rows) / elapsed, 1) if elapsed else None,
+        "workers": workers,
+    }
+    log(f"{summary['reports']} reports in {summary['seconds']} s "
+        f"({summary['reports_per_second']} reports/s, {workers} workers) -> {out_path}"
+        + (f"; {summary['failed']} failed, see {SUMMARY_NAME}" if failures else ""))
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render quiz reports for a whole class into one ZIP.")
+    parser.add_argument("histories", help="JSON-lines file, one finished quiz per line")
+    parser.add_argument("output", help="ZIP file to write")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+    summary = build_class_zip(iter_records(args.histories), args.output, workers=args.workers)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Local-first dataset loading with background revalidation.
+
+Pages call `get_dataset(name).frame()` and get a DataFrame immediately: the
+copy bundled in `data/` (or the last copy fetched from GitHub) is read at
+startup, and the remote URL is revalidated in a background thread with
+ETag / If-Modified-Since. A new frame is swapped in only when the remote
+content actually changed, so a slow GitHub never blocks page startup.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from io import BytesIO
+
+import pandas as pd
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PHONOLOGY_DATA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "english-phonology", "data"),
+)
+REVALIDATE_AFTER = float(os.environ.get("PHONOLOGY_REVALIDATE_SECONDS", "300"))
+FETCH_TIMEOUT = 10
+
+# name -> where the data lives
+DATASET_SPECS = {
+    "wordlist": {
+        "url": "https://raw.githubusercontent.com/MK316/English-phonology/refs/heads/main/data/Stress-wordlist-2025.csv",
+        "local_path": os.path.join(DATA_DIR, "Stress-wordlist-2025.csv"),
+        "read_kwargs": {"encoding": "utf-8-sig"},
+    },
+    "stress2024": {
+        "url": "https://raw.githubusercontent.com/MK316/stress2024/refs/heads/main/data/data20241216.csv",
+        "local_path": None,
+        "read_kwargs": {},
+    },
+    "roster": {
+        "url": "https://raw.githubusercontent.com/MK316/mk316files/refs/heads/main/roster/roster_fall26_0820.csv",
+        "local_path": None,
+        "read_kwargs": {},
+    },
+}
+
+
+class RevalidatingDataset:
+    """
+    A CSV-backed DataFrame that is served locally and refreshed from `url`.
+
+    `version` starts at 0 and is bumped every time a changed remote copy is
+    swapped in; callers can key derived caches on it. The frame returned by
+    `frame()` is shared by every session and must be treated as read-only.
+    """
+
+    def __init__(self, name: str, url: str, local_path: str = None, read_kwargs: dict = None,
+                 cache_dir: str = DEFAULT_CACHE_DIR, revalidate_after: float = REVALIDATE_AFTER):
+        self.name = name
+        self.url = url
+        self.local_path = local_path
+        self.read_kwargs = read_kwargs or {}
+        self.cache_dir = cache_dir
+        self.revalidate_after = revalidate_after
+        self.version = 0
+        self._lock = threading.Lock()
+        self._frame = None
+        self._sha256 = None
+        self._etag = None
+        self._last_modified = None
+        self._checked_at = 0.0
+        self._refreshing = False
+
+    # ---------- storage ----------
+    def _cache_paths(self):
+        base = os.path.join(self.cache_dir, self.name)
+        return base + ".csv", base + ".json"
+
+    def _parse(self, content: bytes) -> pd.DataFrame:
+        return pd.read_csv(BytesIO(content), **self.read_kwargs)
+
+    def _read_initial(self):
+        """Newest of (fetched copy, bundled copy), or None if neither exists."""
+        csv_path, meta_path = self._cache_paths()
+        candidates = []
+        if os.path.exists(csv_path):
+            candidates.append((os.path.getmtime(csv_path), csv_path, meta_path))
+        if self.local_path and os.path.exists(self.local_path):
+            candidates.append((os.path.getmtime(self.local_path), self.local_path, None))
+        if not candidates:
+            return None
+        _, path, meta = max(candidates)
+        with open(path, "rb") as f:
+            content = f.read()
+        if meta:
+            try:
+                with open(meta, encoding="utf-8") as f:
+                    info = json.load(f)
+                self._etag = info.get("etag")
+                self._last_modified = info.get("last_modified")
+            except (OSError, ValueError):
+                pass
+        return content
+
+    def _save_fetched(self, content: bytes):
+        csv_path, meta_path = self._cache_paths()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for path, data in ((csv_path, content),
+                               (meta_path, json.dumps({"etag": self._etag, "last_modified": self._last_modified,
+                                                       "sha256": self._sha256}).encode("utf-8"))):
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+        except OSError:
+            pass  # the cache is an optimization; a read-only disk is fine
+
+    # ---------- remote ----------
+    def _fetch(self, conditional: bool = True):
+        """GET the remote copy. Returns the body, or None if it is unchanged (304)."""
+        headers = {}
+        if conditional and self._etag:
+            headers["If-None-Match"] = self._etag
+        if conditional and self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        resp = requests.get(self.url, headers=headers, timeout=FETCH_TIMEOUT)
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+        self._etag = resp.headers.get("ETag")
+        self._last_modified = resp.headers.get("Last-Modified")
+        return resp.content
+
+    def _install(self, content: bytes, frame: pd.DataFrame = None, persist: bool = False) -> bool:
+        sha = hashlib.sha256(content).hexdigest()
+        if sha == self._sha256:
+            return False
+        if frame is None:
+            frame = self._parse(content)
+        with self._lock:
+            first = self._frame is None
+            self._frame = frame
+            self._sha256 = sha
+            if not first:
+                self.version += 1
+        if persist:
+            self._save_fetched(content)
+        return True
+
+    def refresh(self) -> bool:
+        """Revalidate against the remote now. Returns True if a new frame was swapped in."""
+        try:
+            content = self._fetch()
+            self._checked_at = time.time()
+            if content is None:
+                return False
+            return self._install(content, persist=True)
+        except Exception:
+            # Keep serving what we have; try again after the next interval.
+            self._checked_at = time.time()
+            return False
+        finally:
+            self._refreshing = False
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name=f"revalidate-{self.name}", daemon=True).start()
+
+    # ---------- public ----------
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            with self._lock:
+                initial = self._frame is None
+            if initial:
+                content = self._read_initial()
+                if content is not None:
+                    self._install(content)
+                else:
+                    # Nothing on disk yet: this one fetch has to block.
+                    self._install(self._fetch(conditional=False), persist=True)
+                    self._checked_at = time.time()
+        if time.time() - self._checked_at > self.revalidate_after:
+            self._refresh_in_background()
+        return self._frame
+
+    @property
+    def sha256(self):
+        return self._sha256
+
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+def get_dataset(name: str) -> RevalidatingDataset:
+    """Process-wide dataset handle, created on first use."""
+    with _datasets_lock:
+        ds = _datasets.get(name)
+        if ds is None:
+            ds = RevalidatingDataset(name, **DATASET_SPECS[name])
+            _datasets[name] = ds
+    return ds
@@ -0,0 +1,147 @@
+"""
+Compact storage for the Drawing tab's canvas.
+
+`st_canvas` reports the drawing as Fabric.js JSON, where every stroke
+carries ~30 properties (most of them defaults) and coordinates with
+15 significant digits. `compact_objects` drops properties that hold
+Fabric's defaults and rounds coordinates to 0.1 px, which is what the page
+keeps in session state and writes to disk; `to_initial_drawing` turns it
+back into an `initial_drawing` for replay (Fabric fills the defaults in
+again).
+
+Saved drawings are small JSON files in PHONOLOGY_DRAWINGS_DIR (default
+~/.local/share/english-phonology/drawings).
+"""
+import json
+import os
+import re
+import threading
+import time
+
+DATA_HOME = os.path.join(os.path.expanduser("~"), ".local", "share", "english-phonology")
+DEFAULT_DRAWINGS_DIR = os.environ.get("PHONOLOGY_DRAWINGS_DIR", os.path.join(DATA_HOME, "drawings"))
+PRECISION = 1  # decimal places kept for coordinates
+LIVE_SYNC_SECONDS = 3  # with live sync on, the Drawing tab receives the canvas at most this often
+
+# Properties dropped when they hold these values: they are Fabric.js defaults in
+# every version the canvas component has shipped (5.x to 7.x). Origin, fill and
+# line cap/join defaults changed between versions, so those are always kept.
+FABRIC_DEFAULTS = {
+    "strokeDashArray": None, "strokeDashOffset": 0, "strokeUniform": False, "strokeMiterLimit": 4,
+    "scaleX": 1, "scaleY": 1, "angle": 0, "flipX": False, "flipY": False, "opacity": 1,
+    "shadow": None, "visible": True, "backgroundColor": "", "fillRule": "nonzero",
+    "paintFirst": "fill", "globalCompositeOperation": "source-over", "skewX": 0, "skewY": 0,
+}
+
+
+def _round(value):
+    if isinstance(value, float):
+        value = round(value, PRECISION)
+        return int(value) if value.is_integer() else value
+    if isinstance(value, list):
+        return [_round(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _round(v) for k, v in value.items()}
+    return value
+
+
+def compact_objects(json_data) -> list:
+    """The canvas objects from `json_data` without default properties, coordinates rounded."""
+    objects = []
+    for obj in (json_data or {}).get("objects", []):
+        kept = {}
+        for key, value in obj.items():
+            if key == "version" or (key in FABRIC_DEFAULTS and value == FABRIC_DEFAULTS[key]):
+                continue
+            kept[key] = _round(value)
+        objects.append(kept)
+    return objects
+
+
+def to_initial_drawing(objects) -> dict:
+    """An `initial_drawing` for `st_canvas` that replays `objects`."""
+    return {"objects": [dict(obj) for obj in objects]}
+
+
+def payload_bytes(data) -> int:
+    """Size of `data` as compact JSON, as stored or sent."""
+    return len(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def safe_name(name: str) -> str:
+    """File-name part of a drawing name ("" when nothing usable is left, e.g. "???")."""
+    return re.sub(r"[^\w-]+", "_", name.strip()).strip("_")[:80]
+
+
+class DrawingStore:
+    def __init__(self, directory: str = DEFAULT_DRAWINGS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        safe = safe_name(name)
+        if not safe:
+            raise ValueError("a drawing needs a name")
+        return os.path.join(self.directory, safe + ".json")
+
+    def names(self) -> list:
+        """Saved drawings, newest first."""
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        except OSError:
+            return []
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [e.name[:-len(".json")] for e in entries]
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+
+    def save(self, name: str, objects, width: int, height: int, background: str = "",
+             overwrite: bool = False) -> int:
+        """
+        Write a drawing (atomically); returns its size in bytes.
+
+        Raises FileExistsError if a drawing with that name exists and
+        `overwrite` is False, so a save never silently replaces someone
+        else's drawing.
+        """
+        path = self._path(name)
+        record = {"saved_at": time.time(), "width": width, "height": height, "background": background,
+                  "objects": list(objects)}
+        data = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            if overwrite:
+                os.replace(tmp, path)
+            else:
+                try:
+                    os.link(tmp, path)  # fails if the name is taken, even by another process
+                finally:
+                    os.remove(tmp)
+        return len(data)
+
+    def load(self, name: str) -> dict:
+        with open(self._path(name), encoding="utf-8") as f:
+            return json.load(f)
+
+    def delete(self, name: str):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_drawing_store() -> DrawingStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DrawingStore()
+    return _store
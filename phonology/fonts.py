@@ -0,0 +1,21 @@
+"""
+Fonts for images drawn by the app (QR sheet captions, word clouds).
+
+Captions and translations are often Korean, so a CJK font is preferred when
+one is installed (`apt install fonts-nanum` or `fonts-noto-cjk`).
+"""
+import os
+
+FONT_PATHS = [  # first one present wins; the CJK fonts also cover Korean
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+
+def find_font():
+    """Path of the first installed font in FONT_PATHS, or None."""
+    for path in FONT_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
@@ -0,0 +1,284 @@
+"""
+Group formation for the Grouping tool.
+
+`form_groups(students, sizes, ...)` splits a roster into groups of the given
+sizes and tries to make every group look like the whole roster:
+
+- `balance` - {column: weight}; each group's mix of values in that column
+  should match the roster's (Year, Major, Gender, last week's group, ...)
+- `limits` - {(column, value): (min, max)} hard-ish per-group counts, e.g.
+  {("Year", 2): (1, 2)} for "one or two second-year students per group"
+- `history` - earlier groupings (lists of names); pairs that already worked
+  together are kept apart where possible
+
+It deals students round-robin in order of their rarest attribute values
+(which alone satisfies simple quotas like the Year rule), then improves the
+result with pairwise swaps between groups until the cost stops improving or
+`time_budget` runs out. A swap only touches two groups, so its cost change
+is computed from those groups' counters, which keeps rosters of thousands
+of students within a fraction of a second.
+"""
+import random
+import time
+from collections import Counter, defaultdict
+
+LIMIT_WEIGHT = 1000.0
+PAIR_WEIGHT = 10.0
+DEFAULT_TIME_BUDGET = 0.5
+
+
+class GroupingError(ValueError):
+    """The roster cannot be grouped as asked (e.g. a quota that no split can meet)."""
+
+
+def group_sizes(total: int, group_size: int, remainder: str = "split") -> list:
+    """
+    Sizes of the groups for `total` students.
+
+    remainder="split": 1 leftover student joins the last group, 2 or more
+    form their own smaller group. remainder="fold": the last group takes all
+    leftovers. Either way, fewer than `group_size` students make one group.
+    """
+    if total <= 0:
+        return []
+    base, rest = divmod(total, group_size)
+    if base == 0:
+        return [total]
+    if remainder == "fold":
+        return [group_size] * (base - 1) + [group_size + rest]
+    if rest == 1:
+        return [group_size] * (base - 1) + [group_size + 1]
+    return [group_size] * base + ([rest] if rest else [])
+
+
+def pairs_from_grouped(df) -> list:
+    """Groups (lists of names) from a CSV downloaded from the Grouping tool."""
+    members = [c for c in df.columns if c != "Group"]
+    return [[name for name in row if isinstance(name, str) and name]
+            for row in df[members].itertuples(index=False)]
+
+
+class Grouping:
+    def __init__(self, groups, names, cost, greedy_cost, violations, repeats, swaps, elapsed):
+        self.groups = groups            # lists of row positions in `students`
+        self._names = names
+        self.cost = cost
+        self.greedy_cost = greedy_cost  # cost before local search
+        self.violations = violations    # total distance from the `limits`
+        self.repeats = repeats          # pairs that already met in `history`
+        self.swaps = swaps
+        self.elapsed = elapsed
+
+    def names(self) -> list:
+        return [[self._names[i] for i in grp] for grp in self.groups]
+
+
+class _Search:
+    def __init__(self, students, sizes, balance, limits, history, name_column, pair_weight, rng):
+        self.n = len(students)
+        self.sizes = sizes
+        self.rng = rng
+        self.names = students[name_column].tolist()
+        self.pair_weight = pair_weight
+
+        columns = list(dict.fromkeys([col for col, _ in limits] + list(balance)))
+        self.columns = columns
+        self.weights = [float(balance.get(col, 0.0)) for col in columns]
+        # NaN != NaN, so missing values are mapped to one shared None
+        self.values = [[None if v != v else v for v in students[col].tolist()] for col in columns]
+        self.share = []   # per column: value -> fraction of the roster
+        self.square = []  # per column: sum of share**2
+        for vals in self.values:
+            counts = Counter(vals)
+            share = {v: c / self.n for v, c in counts.items()}
+            self.share.append(share)
+            self.square.append(sum(p * p for p in share.values()))
+        self.limits = defaultdict(list)  # (column index, value) -> [(lo, hi)]
+        for (col, value), (lo, hi) in limits.items():
+            self.limits[(columns.index(col), value)].append((lo, hi))
+
+        self.met = defaultdict(Counter)
+        if history:
+            positions = defaultdict(list)
+            for pos, name in enumerate(self.names):
+                positions[name].append(pos)
+            for grp in history:
+                members = [p for name in grp for p in positions.get(name, ())]
+                for a in members:
+                    for b in members:
+                        if a != b:
+                            self.met[a][b] += 1
+
+    # ---------- cost ----------
+    @staticmethod
+    def _violation(count, lo, hi):
+        return max(0, lo - count) + max(0, count - hi)
+
+    def _group_cost(self, g):
+        size = self.sizes[g]
+        cost = 0.0
+        for a, counts in enumerate(self.counts[g]):
+            if self.weights[a]:
+                share = self.share[a]
+                dev = size * size * self.square[a]
+                for v, c in counts.items():
+                    e = size * share[v]
+                    dev += (c - e) ** 2 - e * e
+                cost += self.weights[a] * dev
+        return cost + LIMIT_WEIGHT * self._group_violations(g) + self.pair_weight * self._group_repeats(g)
+
+    def _group_violations(self, g):
+        total = 0
+        for (a, value), bounds in self.limits.items():
+            c = self.counts[g][a].get(value, 0)
+            total += sum(self._violation(c, lo, hi) for lo, hi in bounds)
+        return total
+
+    def _group_repeats(self, g):
+        if not self.met:
+            return 0
+        members = self.groups[g]
+        return sum(self.met[x][y] for i, x in enumerate(members) for y in members[i + 1:])
+
+    def _swap_delta(self, x, g, y, h):
+        """Cost change of moving x from group g to h and y from h to g."""
+        delta = 0.0
+        for a in range(len(self.columns)):
+            u, w = self.values[a][x], self.values[a][y]
+            if u == w:
+                continue
+            for grp, out, into in ((g, u, w), (h, w, u)):
+                counts = self.counts[grp][a]
+                cu, cw = counts.get(out, 0), counts.get(into, 0)
+                if self.weights[a]:
+                    size = self.sizes[grp]
+                    eu, ew = size * self.share[a][out], size * self.share[a][into]
+                    delta += self.weights[a] * (2 * (cw - ew) - 2 * (cu - eu) + 2)
+                for lo, hi in self.limits.get((a, out), ()):
+                    delta += LIMIT_WEIGHT * (self._violation(cu - 1, lo, hi) - self._violation(cu, lo, hi))
+                for lo, hi in self.limits.get((a, into), ()):
+                    delta += LIMIT_WEIGHT * (self._violation(cw + 1, lo, hi) - self._violation(cw, lo, hi))
+        if self.met:
+            mx, my = self.met[x], self.met[y]
+            for k in self.groups[g]:
+                if k != x:
+                    delta += self.pair_weight * (my[k] - mx[k])
+            for k in self.groups[h]:
+                if k != y:
+                    delta += self.pair_weight * (mx[k] - my[k])
+        return delta
+
+    # ---------- search ----------
+    def deal(self):
+        """Round-robin over the groups, rarest attribute values first."""
+        order = list(range(self.n))
+        self.rng.shuffle(order)
+        ranks = []
+        for a, vals in enumerate(self.values):
+            counts = Counter(vals)
+            ranks.append({v: r for r, (v, _) in enumerate(sorted(counts.items(), key=lambda kv: kv[1]))})
+        order.sort(key=lambda i: tuple(ranks[a][self.values[a][i]] for a in range(len(self.values))))
+
+        self.groups = [[] for _ in self.sizes]
+        g = 0
+        for i in order:
+            while len(self.groups[g]) >= self.sizes[g]:
+                g = (g + 1) % len(self.sizes)
+            self.groups[g].append(i)
+            g = (g + 1) % len(self.sizes)
+        self.counts = [[Counter(self.values[a][i] for i in grp) for a in range(len(self.values))]
+                       for grp in self.groups]
+
+    def cost(self):
+        return sum(self._group_cost(g) for g in range(len(self.groups)))
+
+    def _apply(self, g, i, h, j):
+        x, y = self.groups[g][i], self.groups[h][j]
+        self.groups[g][i], self.groups[h][j] = y, x
+        for a, vals in enumerate(self.values):
+            u, w = vals[x], vals[y]
+            if u != w:
+                self.counts[g][a][u] -= 1
+                self.counts[g][a][w] += 1
+                self.counts[h][a][w] -= 1
+                self.counts[h][a][u] += 1
+
+    def _hot_groups(self):
+        return [g for g in range(len(self.groups))
+                if (self.limits and self._group_violations(g)) or self._group_repeats(g)]
+
+    def improve(self, deadline):
+        n_groups = len(self.groups)
+        if n_groups < 2:
+            return 0
+        patience = max(2000, 20 * self.n)
+        swaps = stale = tries = 0
+        hot = self._hot_groups()
+        rng = self.rng
+        while stale < patience:
+            tries += 1
+            if tries % 256 == 0:
+                if time.perf_counter() > deadline:
+                    break
+                if tries % 4096 == 0:
+                    hot = self._hot_groups()
+            g = rng.choice(hot) if hot and tries & 1 else rng.randrange(n_groups)
+            h = rng.randrange(n_groups)
+            if g == h:
+                continue
+            i, j = rng.randrange(len(self.groups[g])), rng.randrange(len(self.groups[h]))
+            if self._swap_delta(self.groups[g][i], g, self.groups[h][j], h) < -1e-9:
+                self._apply(g, i, h, j)
+                swaps += 1
+                stale = 0
+            else:
+                stale += 1
+        return swaps
+
+
+def check_limits(counts: Counter, column, limits: dict, n_groups: int):
+    """Raise GroupingError if no split into `n_groups` groups can meet the quotas on `column`."""
+    for (col, value), (lo, hi) in limits.items():
+        if col != column:
+            continue
+        have = counts.get(value, 0)
+        if have < lo * n_groups:
+            raise GroupingError(
+                f"Only {have} students with {col} = {value} available, but {n_groups} groups need "
+                f"at least {lo} each."
+            )
+        if have > hi * n_groups:
+            raise GroupingError(
+                f"{have} students with {col} = {value} is too many for {n_groups} groups "
+                f"(max {hi} per group)."
+            )
+
+
+def form_groups(students, sizes, balance: dict = None, limits: dict = None, history=None,
+                name_column: str = "Name_ori", pair_weight: float = PAIR_WEIGHT, seed=None,
+                time_budget: float = DEFAULT_TIME_BUDGET) -> Grouping:
+    """Split the rows of `students` (a DataFrame) into groups of `sizes` (see the module docstring)."""
+    start = time.perf_counter()
+    balance = dict(balance or {})
+    limits = dict(limits or {})
+    sizes = list(sizes)
+    if sum(sizes) != len(students):
+        raise GroupingError(f"group sizes add up to {sum(sizes)}, but there are {len(students)} students")
+    if not sizes:
+        return Grouping([], [], 0.0, 0.0, 0, 0, 0, time.perf_counter() - start)
+    for col in {col for col, _ in limits}:
+        check_limits(Counter(students[col].tolist()), col, limits, len(sizes))
+
+    search = _Search(students, sizes, balance, limits, history, name_column, pair_weight,
+                     random.Random(seed))
+    search.deal()
+    greedy_cost = search.cost()
+    swaps = 0
+    if greedy_cost > 1e-9:
+        swaps = search.improve(start + time_budget)
+    for grp in search.groups:
+        search.rng.shuffle(grp)
+    violations = sum(search._group_violations(g) for g in range(len(sizes)))
+    repeats = sum(search._group_repeats(g) for g in range(len(sizes)))
+    return Grouping(search.groups, search.names, search.cost(), greedy_cost, violations, repeats,
+                    swaps, time.perf_counter() - start)
@@ -0,0 +1,184 @@
+"""
+IPA tokenizing and a phoneme inverted index for searching by transcription.
+
+Transcriptions such as "[kəˈnæl]" or "[ˈsɛl ə bɪt, -ˌbeɪt]" are split into
+segments (multi-character symbols like eɪ, oʊ, tʃ, dʒ are kept whole) plus
+stress marks. `PhonemeIndex` maps every segment and every segment bigram to
+the set of rows containing it, and every (stress mark, syllable number) to
+the rows with that stress pattern, so a query is a handful of set
+intersections instead of a regex scan over every row.
+"""
+import threading
+
+# Longest match first.
+MULTI_SEGMENTS = ("tʃ", "dʒ", "eɪ", "aɪ", "ɔɪ", "oʊ", "aʊ", "əʊ")
+PRIMARY = "ˈ"
+SECONDARY = "ˌ"
+SYLLABLE_BREAKS = set(" .·-")
+IGNORED = set("[]()/")
+LENGTH = "ː"
+# Spelling variants found in the word lists -> one canonical symbol.
+CANONICAL = {"g": "ɡ", "ε": "ɛ", "ӕ": "æ", "ɹ": "r", "'": PRIMARY, "ɚ": "ər"}
+VOWELS = set("aeiouæɑɒɔəɚɛɜɪʊʌɐɝy")
+
+
+def _normalize(text: str) -> str:
+    return "".join(CANONICAL.get(ch, ch) for ch in text)
+
+
+def split_variants(transcription) -> list:
+    """'[ˈsɛl ə bɪt, -ˌbeɪt]' -> ['ˈsɛl ə bɪt', '-ˌbeɪt']"""
+    if not isinstance(transcription, str):
+        return []
+    return [part.strip() for part in transcription.split(",") if part.strip(" []")]
+
+
+def tokenize(transcription: str) -> list:
+    """
+    Split one transcription into segments and stress marks.
+
+    Syllable breaks (space, '.', '·', '-') and brackets are dropped;
+    'ː' is attached to the preceding segment.
+    """
+    text = _normalize(transcription)
+    tokens = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch in IGNORED or ch in SYLLABLE_BREAKS or ch == ",":
+            i += 1
+            continue
+        if ch == LENGTH and tokens:
+            tokens[-1] += LENGTH
+            i += 1
+            continue
+        for seg in MULTI_SEGMENTS:
+            if text.startswith(seg, i):
+                tokens.append(seg)
+                i += len(seg)
+                break
+        else:
+            tokens.append(ch)
+            i += 1
+    return tokens
+
+
+def is_vowel(token: str) -> bool:
+    return token[0] in VOWELS
+
+
+def segments(tokens) -> list:
+    return [t for t in tokens if t not in (PRIMARY, SECONDARY)]
+
+
+def stress_positions(tokens):
+    """[(mark, syllable number)] with syllables counted by vowel nuclei, from 1."""
+    out = []
+    nucleus = 0
+    in_vowel = False
+    pending = []
+    for t in tokens:
+        if t in (PRIMARY, SECONDARY):
+            pending.append(t)
+            continue
+        vowel = is_vowel(t)
+        if vowel and not in_vowel:
+            nucleus += 1
+            out.extend((mark, nucleus) for mark in pending)
+            pending = []
+        in_vowel = vowel
+    return out
+
+
+class PhonemeIndex:
+    """Inverted index over one or more transcription columns."""
+
+    def __init__(self, transcriptions_by_row):
+        """`transcriptions_by_row`: iterable of lists of transcription strings (one list per row)."""
+        self._segments = {}
+        self._bigrams = {}
+        self._stress = {}
+        self._tokens = []
+        for row, cells in enumerate(transcriptions_by_row):
+            variants = []
+            for cell in cells:
+                for variant in split_variants(cell):
+                    tokens = tokenize(variant)
+                    segs = segments(tokens)
+                    if not segs:
+                        continue
+                    variants.append(segs)
+                    for seg in segs:
+                        self._segments.setdefault(seg, set()).add(row)
+                    for pair in zip(segs, segs[1:]):
+                        self._bigrams.setdefault(pair, set()).add(row)
+                    for key in stress_positions(tokens):
+                        self._stress.setdefault(key, set()).add(row)
+            self._tokens.append(variants)
+        self.n_rows = len(self._tokens)
+
+    def symbols(self) -> list:
+        """Every segment in the index, most frequent first."""
+        return sorted(self._segments, key=lambda s: (-len(self._segments[s]), s))
+
+    @staticmethod
+    def _intersect(sets):
+        sets = sorted(sets, key=len)
+        if not sets:
+            return set()
+        result = set(sets[0])
+        for s in sets[1:]:
+            result &= s
+            if not result:
+                break
+        return result
+
+    def _contains(self, row: int, query) -> bool:
+        n = len(query)
+        for segs in self._tokens[row]:
+            for i in range(len(segs) - n + 1):
+                if segs[i:i + n] == query:
+                    return True
+        return False
+
+    def search(self, sequence: str = "", stress=None) -> list:
+        """
+        Rows whose transcription contains `sequence` (e.g. "ʒ", "ŋk", "tʃ ə")
+        and, if given, has `stress` = (mark, syllable), e.g. ("ˈ", 2).
+        Returns sorted row positions.
+        """
+        query = segments(tokenize(sequence)) if sequence else []
+        sets = []
+        if query:
+            if len(query) == 1:
+                sets.append(self._segments.get(query[0], set()))
+            else:
+                sets.extend(self._bigrams.get(pair, set()) for pair in zip(query, query[1:]))
+        if stress is not None:
+            sets.append(self._stress.get(tuple(stress), set()))
+        if not sets:
+            return []
+        rows = self._intersect(sets)
+        if len(query) > 2:
+            # Bigram hits can come from different places in the word; confirm adjacency.
+            rows = {r for r in rows if self._contains(r, query)}
+        return sorted(rows)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_phoneme_index(dataset, columns=("Transcription", "Variation")) -> PhonemeIndex:
+    """Shared index for a `RevalidatingDataset`, rebuilt when its content changes."""
+    df = dataset.frame()
+    key = (dataset.name, dataset.sha256, tuple(columns))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            present = [c for c in columns if c in df.columns]
+            index = PhonemeIndex(zip(*(df[c].tolist() for c in present)))
+            for k in [k for k in _indexes if k[0] == dataset.name]:
+                del _indexes[k]
+            _indexes[key] = index
+        return index
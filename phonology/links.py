@@ -0,0 +1,50 @@
+"""
+Links shared between pages: the Phonetics Apps collection and the exam video
+archive are listed on their own pages and can also be printed as QR sheets
+from the Course Management page.
+"""
+
+# Phonetics Apps page
+PHONETICS_APPS = [
+    {
+        "name": "1. Vocal Anatomy",
+        "url": "https://vocal-anatomy.streamlit.app/",
+        "description": "Explore the structure and function of vocal organs involved in speech production."
+    },
+    {
+        "name": "2. Consonant Full Description",
+        "url": "https://sound-description-1.streamlit.app/",
+        "description": "Review English consonants by their voicing, place, manner, centrality, and oro-nasal process."
+    },
+    {
+        "name": "3. Chapter 1 Term Practice & Quiz",
+        "url": "https://ch1-term-practice.streamlit.app/",
+        "description": "Test your understanding of key phonetics terms from Chapter 1 through interactive quizzes."
+    },
+    {
+        "name": "4. IPA practice",
+        "url": "https://ipa-practice.streamlit.app/",
+        "description": "Practice your familiarity with English IPA symbols by identifying articulatory features."
+    },
+    {
+        "name": "5. IPA quiz",
+        "url": "https://ipa-quiz2.streamlit.app/",
+        "description": "IPA quiz application."
+    }
+]
+
+# Exam video archive: year-session -> YouTube URL
+EXAM_VIDEOS = {
+    "2005-1": "https://youtu.be/lQifRHNOvQU?si=hTHnHeA8e6lE7XQO",
+    "2005-2": "https://youtu.be/U6DUlOx7BA4?si=mCHKL4bhIkh9UutH",
+    "2007-1": "https://youtu.be/Eh08ksF4cBY?si=pnt1vV5_yk8CKR_E",
+    "2008-2": "https://youtu.be/e-yVJrLD9BM",
+    "2011-1": "https://youtu.be/V-mVg9yMALc",
+    "2012-2": "https://youtu.be/clH-AL6_Zmg",
+    "2013-2": "https://youtu.be/0ctVnCBFF-8",
+    "2015-1": "https://youtu.be/v-yMQcii6hM?si=vMQcHEelkSMn1VAa",
+    "2015-2": "https://youtu.be/5dhmyHosP4c",
+    "2016-3": "https://youtu.be/PVFo0xgUmEA?si=WYA3j7OGk06vcuoU",
+    "2018-3": "https://youtu.be/a00mqL6pRiU?si=YdH4Z19RkXp2U5Q8",
+    "2020-2": "https://youtu.be/ntqgNYfpQ-g?si=mhdPTKxO8wMFIWwK",
+}
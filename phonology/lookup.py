@@ -0,0 +1,116 @@
+"""
+Prebuilt word lookup index for the Word Lookup tab.
+
+Built once per word-table version and shared by all sessions:
+
+- exact hits: casefolded word -> row positions (dict)
+- as-you-type suggestions: sorted casefolded words searched with bisect
+  (results are shown in the word's original spelling; the casefolded form
+  is only used for matching)
+- "did you mean": deletion-neighbourhood index (every word with up to
+  `max_distance` characters deleted), verified with restricted
+  Damerau-Levenshtein distance
+"""
+import bisect
+import threading
+
+
+def normalize(word: str) -> str:
+    return word.strip().casefold()
+
+
+def deletions(word: str, max_distance: int):
+    """All strings obtained by deleting up to `max_distance` characters."""
+    out = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        out |= frontier
+    return out
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance; returns limit + 1 once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        best = cur[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            best = min(best, cur[j])
+        if best > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class WordIndex:
+    def __init__(self, words, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._exact = {}
+        self._display = {}  # casefolded word -> spelling of its first row
+        for row, word in enumerate(words):
+            key = normalize(word)
+            if key:
+                self._exact.setdefault(key, []).append(row)
+                self._display.setdefault(key, word.strip())
+        self._sorted = sorted(self._exact)
+        self._deletes = {}
+        for key in self._sorted:
+            for variant in deletions(key, max_distance):
+                self._deletes.setdefault(variant, []).append(key)
+
+    def exact(self, query: str):
+        """Row position of the first exact (case-insensitive) match, or None."""
+        rows = self._exact.get(normalize(query))
+        return rows[0] if rows else None
+
+    def prefix(self, query: str, limit: int = 10):
+        """Words starting with `query` (case-insensitive), alphabetically, in their original spelling."""
+        q = normalize(query)
+        if not q:
+            return []
+        start = bisect.bisect_left(self._sorted, q)
+        end = bisect.bisect_left(self._sorted, q + "\U0010ffff", start)
+        return [self._display[key] for key in self._sorted[start:min(end, start + limit)]]
+
+    def fuzzy(self, query: str, limit: int = 5):
+        """Closest words within `max_distance` edits, as [(distance, word), ...] in their original spelling."""
+        q = normalize(query)
+        if not q:
+            return []
+        candidates = set()
+        for variant in deletions(q, self.max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+        scored = []
+        for word in candidates:
+            d = edit_distance(q, word, self.max_distance)
+            if d <= self.max_distance:
+                scored.append((d, word))
+        scored.sort()
+        return [(d, self._display[word]) for d, word in scored[:limit]]
+
+    def rows(self, word: str):
+        return self._exact.get(normalize(word), [])
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_word_index(table) -> WordIndex:
+    """Shared index for a `WordTable`, rebuilt only when the table version changes."""
+    key = table.source_sha256
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = WordIndex(table.strings("Word"))
+            _indexes.clear()
+            _indexes[key] = index
+        return index
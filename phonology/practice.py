@@ -0,0 +1,41 @@
+"""
+Practice and quiz subsets as index arrays into the shared word table.
+
+A subset is a small int32 array of row positions, so a session that opens
+all three practice tabs holds three arrays of a few hundred bytes instead of
+three DataFrame copies with every text column.
+"""
+import numpy as np
+
+from phonology.sampling import get_sampler
+
+ROW_FIELDS = ("WID", "Word", "Transcription")
+ORDERS = ["Random", "WID order", "Review missed"]
+
+
+def make_subset(table, n: int, order: str = "Random", rng=None, misses: dict = None) -> np.ndarray:
+    """
+    `n` row positions into `table`:
+
+    - "Random": uniform, without replacement
+    - "WID order": the first `n` words by WID (ordering precomputed once)
+    - "Review missed": rows in `misses` ({row: miss count}) first, drawn
+      by miss count; other rows only fill up the rest when fewer than `n`
+      words were missed
+    """
+    sampler = get_sampler(table)
+    n = max(1, min(int(n), len(table)))
+    if order == "WID order":
+        return sampler.first(n)
+    if order == "Review missed" and misses:
+        rng = np.random.default_rng(rng)  # one generator for both draws and the shuffle
+        counts = np.zeros(len(table), dtype=np.float64)
+        rows = np.fromiter(misses.keys(), dtype=np.int64, count=len(misses))
+        counts[rows] = np.fromiter(misses.values(), dtype=np.float64, count=len(misses))
+        chosen = sampler.weighted(n, counts, seed=rng)
+        if len(chosen) < n:
+            rest = sampler.weighted(n - len(chosen), (counts == 0).astype(np.float64), seed=rng)
+            chosen = np.concatenate([chosen, rest])
+        rng.shuffle(chosen)
+        return chosen
+    return sampler.uniform(n, seed=rng)
@@ -0,0 +1,93 @@
+"""
+Background audio prefetch for the practice tabs.
+
+When a student is on item i, the page asks for the audio of items
+i+1 .. i+depth to be synthesized ahead of time. Requests go to a small
+bounded thread pool and are deduplicated by cache key: if a word is already
+being synthesized (for this session or any other), the page waits on that
+same future instead of starting a second gTTS call; a prefetch still waiting
+in the queue is taken over by the page rather than waited for. Finished
+audio lands in the shared `AudioCache`, so the "Next" click is just a cache
+read.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from phonology.audio_cache import get_audio_cache
+
+DEFAULT_DEPTH = int(os.environ.get("PHONOLOGY_PREFETCH_DEPTH", "3"))
+DEFAULT_WORKERS = int(os.environ.get("PHONOLOGY_PREFETCH_WORKERS", "4"))
+MAX_DEPTH = 10
+
+
+class AudioPrefetcher:
+    def __init__(self, cache=None, workers: int = DEFAULT_WORKERS, max_pending: int = 256):
+        self.cache = cache if cache is not None else get_audio_cache()
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-prefetch")
+        self._lock = threading.Lock()
+        self._inflight = {}  # cache key -> Future
+        self.submitted = 0
+        self.joined = 0  # foreground requests that waited on an in-flight future
+
+    def _fetch(self, key, text, lang, tld, slow):
+        try:
+            return self.cache.get(text, lang=lang, tld=tld, slow=slow)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def prefetch(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False):
+        """Start synthesizing `text` in the background unless it is cached or already queued."""
+        tld = tld or "com"
+        key = self.cache.key(text, lang, tld, slow)
+        if self.cache.contains(key):
+            return None
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            if len(self._inflight) >= self.max_pending:
+                return None  # pool is saturated; the page will synthesize on demand
+            future = self._pool.submit(self._fetch, key, text, lang, tld, slow)
+            self._inflight[key] = future
+            self.submitted += 1
+        return future
+
+    def get(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        """Audio for `text`: joins an in-flight prefetch if there is one, else reads or fills the cache."""
+        tld = tld or "com"
+        key = self.cache.key(text, lang, tld, slow)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None and future.cancel():
+                # Still queued behind other prefetches: don't wait for a free worker.
+                self._inflight.pop(key, None)
+                future = None
+            elif future is not None:
+                self.joined += 1
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass  # the background attempt failed; retry in the foreground
+        return self.cache.get(text, lang=lang, tld=tld, slow=slow)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> AudioPrefetcher:
+    """Process-wide prefetcher over the shared audio cache."""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = AudioPrefetcher()
+    return _prefetcher
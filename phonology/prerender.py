@@ -0,0 +1,215 @@
+"""
+Offline pre-render of word audio for the Stress word list.
+
+Run once before the semester (or whenever the list changes):
+
+    python -m phonology.prerender
+    python -m phonology.prerender --backend espeak-ng                # local engine
+    python -m phonology.prerender --backend stub --out /tmp/audio   # no network
+
+Audio is written to `data/audio/<WID>.mp3` (`.wav` for eSpeak NG) next to a `manifest.json` that maps
+each WID to its file and SHA-256 checksum. Re-running skips every word that
+is already rendered with a matching checksum, so an interrupted run resumes
+where it stopped. The Word & Transcription page reads the manifest before
+falling back to live synthesis.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from phonology.tts_backends import BACKENDS, DEFAULT_BACKEND, get_backend
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CSV = os.path.join(REPO_ROOT, "data", "Stress-wordlist-2025.csv")
+DEFAULT_OUT = os.path.join(REPO_ROOT, "data", "audio")
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_words(csv_path: str):
+    """Return [(wid, word), ...] from the word list CSV."""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        return [(int(row["WID"]), row["Word"].strip()) for row in csv.DictReader(f) if row["Word"].strip()]
+
+
+def load_manifest(out_dir: str) -> dict:
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "items": {}}
+    manifest.setdefault("items", {})
+    return manifest
+
+
+def save_manifest(out_dir: str, manifest: dict):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def audio_filename(wid: int, suffix: str = ".mp3") -> str:
+    return f"{wid:04d}{suffix}"
+
+
+def is_rendered(out_dir: str, entry, word: str) -> bool:
+    if not entry or entry.get("word") != word:
+        return False
+    path = os.path.join(out_dir, entry["file"])
+    return os.path.exists(path) and sha256_file(path) == entry["sha256"]
+
+
+def prerender(csv_path: str = DEFAULT_CSV, out_dir: str = DEFAULT_OUT, synthesize=None,
+              backend_name: str = "gtts", lang: str = "en", workers: int = 4, limit: int = None,
+              checkpoint_every: int = 25, suffix: str = None, log=print) -> dict:
+    """
+    Render audio for every word that is not already in the manifest.
+
+    Returns a summary dict with counts of rendered, skipped and failed words.
+    """
+    if backend_name == "stub" and os.path.abspath(out_dir) == os.path.abspath(DEFAULT_OUT):
+        raise ValueError(f"stub audio must not be written to {DEFAULT_OUT}; pick another out_dir")
+    backend = get_backend(backend_name)
+    synthesize = synthesize or backend.synthesize
+    suffix = suffix or backend.suffix
+    os.makedirs(out_dir, exist_ok=True)
+    words = read_words(csv_path)
+    if limit:
+        words = words[:limit]
+
+    manifest = load_manifest(out_dir)
+    if manifest.get("backend") not in (None, backend_name) or manifest.get("lang") not in (None, lang):
+        log(f"Manifest was rendered with {manifest.get('backend')}/{manifest.get('lang')}; re-rendering.")
+        manifest = {"version": MANIFEST_VERSION, "items": {}}
+    manifest["backend"] = backend_name
+    manifest["lang"] = lang
+    items = manifest["items"]
+
+    todo = [(wid, word) for wid, word in words if not is_rendered(out_dir, items.get(str(wid)), word)]
+    skipped = len(words) - len(todo)
+    log(f"{len(words)} words, {skipped} already rendered, {len(todo)} to render ({workers} workers)")
+
+    lock = threading.Lock()
+    failed = []
+    done = 0
+
+    def render(wid, word):
+        data = synthesize(word, lang=lang)
+        name = audio_filename(wid, suffix)
+        path = os.path.join(out_dir, name)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return {"word": word, "file": name, "sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(render, wid, word): (wid, word) for wid, word in todo}
+        for future in as_completed(futures):
+            wid, word = futures[future]
+            try:
+                entry = future.result()
+            except Exception as exc:  # keep going; the next run retries it
+                failed.append(wid)
+                log(f"  ! WID {wid} ({word}): {exc}")
+                continue
+            with lock:
+                items[str(wid)] = entry
+                done += 1
+                if done % checkpoint_every == 0:
+                    save_manifest(out_dir, manifest)
+                    log(f"  {done}/{len(todo)} rendered")
+    save_manifest(out_dir, manifest)
+
+    elapsed = time.perf_counter() - start
+    summary = {"rendered": done, "skipped": skipped, "failed": len(failed), "seconds": round(elapsed, 2)}
+    log(f"Done: {summary}")
+    return summary
+
+
+# ---------- read side (used by the pages) ----------
+_manifest_lock = threading.Lock()
+_manifests = {}  # real path of out_dir -> {"stamp", "backend", "items"}
+
+
+def prerendered_path(wid, word: str, out_dir: str = DEFAULT_OUT, backend: str = None):
+    """
+    Path of the pre-rendered file for `wid` if the manifest has it for `word`, else None.
+
+    Only audio from `backend` (default: the active TTS backend) is served;
+    a stub dry run or a manifest from another engine is ignored.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == "stub":
+        return None
+    try:
+        info = os.stat(os.path.join(out_dir, MANIFEST_NAME))
+    except OSError:
+        return None
+    stamp = (info.st_mtime_ns, info.st_size)
+    with _manifest_lock:
+        state = _manifests.get(os.path.realpath(out_dir))
+        if state is None or state["stamp"] != stamp:
+            manifest = load_manifest(out_dir)
+            # manifests written before backends existed were always gTTS
+            state = {"stamp": stamp, "backend": manifest.get("backend", "gtts"), "items": manifest["items"]}
+            _manifests[os.path.realpath(out_dir)] = state
+        if state["backend"] != backend:
+            return None
+        entry = state["items"].get(str(int(wid)))
+    if not entry or entry.get("word") != word:
+        return None
+    return os.path.join(out_dir, entry["file"])
+
+
+def prerendered_audio(wid, word: str, out_dir: str = DEFAULT_OUT, backend: str = None):
+    """Return pre-rendered bytes for `wid` if the manifest has it for `word`, else None."""
+    path = prerendered_path(wid, word, out_dir, backend)
+    if path is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render word audio for the Stress word list.")
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="word list CSV (needs WID and Word columns)")
+    parser.add_argument("--out", default=None,
+                        help=f"output directory for audio files and manifest (default: {DEFAULT_OUT}; "
+                             "required with --backend stub)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND)
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--workers", type=int, default=4, help="size of the synthesis thread pool")
+    parser.add_argument("--limit", type=int, default=None, help="only render the first N words")
+    args = parser.parse_args(argv)
+    if args.backend == "stub" and args.out is None:
+        parser.error("--backend stub writes placeholder audio; pass --out to keep it out of data/audio")
+
+    summary = prerender(args.csv, args.out or DEFAULT_OUT, backend_name=args.backend,
+                        lang=args.lang, workers=args.workers, limit=args.limit)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
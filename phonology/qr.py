@@ -0,0 +1,202 @@
+"""
+QR codes for the Course Management page.
+
+- `qr_png(link, error_level)` - one 600x600 code, memoized, so pressing the
+  button again (or any rerun showing the same code) costs nothing
+- `render_sheet(items, ...)` - a printable A4 sheet of (link, caption)
+  codes, as a multi-page PDF or PNG pages; tiles are memoized by
+  (link, caption, error level) and the missing ones are rendered across a
+  long-lived spawn process pool when there are enough of them to be worth it
+"""
+import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+from phonology.fonts import find_font
+
+ERROR_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+QR_PIXELS = 600
+
+# A4 at 150 dpi
+PAGE_SIZE = (1240, 1754)
+PAGE_MARGIN = 90
+PAGE_DPI = 150
+TILE_PIXELS = 480
+CAPTION_PIXELS = 28
+PARALLEL_MIN_TILES = 8  # below this, starting worker processes costs more than it saves
+MAX_CACHED_TILES = 512
+
+
+def _qr_image(link: str, error_level: str) -> Image.Image:
+    qr = qrcode.QRCode(version=1, error_correction=ERROR_LEVELS[error_level], box_size=10, border=4)
+    qr.add_data(link)
+    qr.make(fit=True)
+    return qr.make_image(fill_color="black", back_color="white").convert("RGB")
+
+
+def _png(img: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=256)
+def qr_png(link: str, error_level: str = "L") -> bytes:
+    """A QR_PIXELS x QR_PIXELS PNG of `link`."""
+    return _png(_qr_image(link, error_level).resize((QR_PIXELS, QR_PIXELS), Image.NEAREST))
+
+
+def _font(size: int):
+    path = find_font()
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+
+
+def _fit_caption(draw, text: str, font, width: int) -> str:
+    if draw.textlength(text, font=font) <= width:
+        return text
+    while text and draw.textlength(text + "…", font=font) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+def _tile_png(key) -> bytes:
+    """One sheet tile: the code with its caption underneath (runs in a worker process)."""
+    link, caption, error_level = key
+    code = _qr_image(link, error_level)
+    modules = code.width // 10  # box_size=10
+    side = modules * max(1, TILE_PIXELS // modules)  # whole pixels per module keeps edges sharp
+    code = code.resize((side, side), Image.NEAREST)
+    tile = Image.new("RGB", (TILE_PIXELS, TILE_PIXELS + 2 * CAPTION_PIXELS), "white")
+    tile.paste(code, ((TILE_PIXELS - side) // 2, (TILE_PIXELS - side) // 2))
+    if caption:
+        draw = ImageDraw.Draw(tile)
+        font = _font(CAPTION_PIXELS - 6)
+        text = _fit_caption(draw, caption, font, TILE_PIXELS - 20)
+        draw.text((TILE_PIXELS // 2, TILE_PIXELS + CAPTION_PIXELS // 2), text, fill="black",
+                  font=font, anchor="mt")
+    return _png(tile)
+
+
+_tiles = OrderedDict()  # (link, caption, error_level) -> PNG
+_tiles_lock = threading.Lock()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process-wide tile pool, started on first use.
+
+    Workers are spawned rather than forked: the Streamlit server runs many
+    threads, and a forked child can inherit a lock one of them was holding.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def render_tiles(items, error_level: str = "M", workers: int = None) -> list:
+    """PNG tiles for (link, caption) pairs; uncached ones are rendered in parallel."""
+    keys = [(link, caption or "", error_level) for link, caption in items]
+    with _tiles_lock:
+        found = {key: _tiles[key] for key in keys if key in _tiles}
+    missing = list(dict.fromkeys(key for key in keys if key not in found))
+    workers = workers or os.cpu_count() or 1
+    rendered = None
+    if len(missing) >= PARALLEL_MIN_TILES and workers > 1:
+        pool = _get_pool(workers)
+        try:
+            rendered = list(pool.map(_tile_png, missing, chunksize=4))
+        except BrokenProcessPool:
+            _reset_pool(pool)  # a worker died; start a fresh pool next time
+    if rendered is None:
+        rendered = [_tile_png(key) for key in missing]
+    found.update(zip(missing, rendered))
+    with _tiles_lock:
+        for key, png in zip(missing, rendered):
+            _tiles[key] = png
+        for key in keys:
+            _tiles.move_to_end(key)
+        while len(_tiles) > MAX_CACHED_TILES:
+            _tiles.popitem(last=False)
+    return [found[key] for key in keys]
+
+
+def _pages(tiles, columns: int, rows: int) -> list:
+    cell_w = (PAGE_SIZE[0] - 2 * PAGE_MARGIN) // columns
+    cell_h = (PAGE_SIZE[1] - 2 * PAGE_MARGIN) // rows
+    per_page = columns * rows
+    pages = []
+    for start in range(0, len(tiles), per_page):
+        page = Image.new("RGB", PAGE_SIZE, "white")
+        for n, png in enumerate(tiles[start:start + per_page]):
+            tile = Image.open(io.BytesIO(png))
+            tile.thumbnail((cell_w - 20, cell_h - 20))
+            col, row = n % columns, n // columns
+            x = PAGE_MARGIN + col * cell_w + (cell_w - tile.width) // 2
+            y = PAGE_MARGIN + row * cell_h + (cell_h - tile.height) // 2
+            page.paste(tile, (x, y))
+        pages.append(page)
+    return pages
+
+
+def render_sheet(items, error_level: str = "M", columns: int = 3, rows: int = 4, fmt: str = "pdf",
+                 workers: int = None):
+    """
+    A printable sheet of QR codes for (link, caption) pairs.
+
+    Returns (data, mime, file extension): a multi-page PDF, or for fmt="png"
+    a single PNG when everything fits on one page and a ZIP of pages otherwise.
+    """
+    pages = _pages(render_tiles(items, error_level, workers), columns, rows)
+    if not pages:
+        raise ValueError("no links to render")
+    if fmt == "pdf":
+        buffer = io.BytesIO()
+        pages[0].save(buffer, format="PDF", save_all=True, append_images=pages[1:], resolution=PAGE_DPI)
+        return buffer.getvalue(), "application/pdf", "pdf"
+    if len(pages) == 1:
+        return _png(pages[0]), "image/png", "png"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for n, page in enumerate(pages, start=1):
+            zf.writestr(f"qr_sheet_page{n:02d}.png", _png(page))
+    return buffer.getvalue(), "application/zip", "zip"
+
+
+def parse_links(text: str) -> list:
+    """(link, caption) pairs from lines of `link` or `caption | link`."""
+    items = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        caption, sep, link = line.rpartition("|")
+        items.append((link.strip(), caption.strip()) if sep else (line, ""))
+    return items
@@ -0,0 +1,101 @@
+"""
+UI-independent quiz engine for the Word & Transcription quiz.
+
+`QuizEngine` holds the rules (how answers are compared, when the quiz is
+finished); `QuizState` holds one student's progress in a few compact
+fields. The page keeps a single `QuizState` in `st.session_state` and calls
+the engine from its button callbacks, so the same logic can be unit-tested
+and driven by simulated sessions without Streamlit.
+"""
+from array import array
+from datetime import datetime
+
+EMPTY = "empty"
+CORRECT = "correct"
+INCORRECT = "incorrect"
+
+
+class QuizState:
+    """
+    Progress of one quiz attempt.
+
+    `items` are row positions into the word table; `answered` is one byte
+    per item (0/1) so the "already logged?" check is O(1); the history log
+    is two parallel compact arrays (item number, correct flag) in answer
+    order.
+    """
+
+    __slots__ = ("items", "idx", "score", "finished", "answered", "log_items", "log_correct",
+                 "username", "start_time", "end_time")
+
+    def __init__(self, items, username: str = "Anonymous", start_time: datetime = None):
+        self.items = items
+        self.idx = 0
+        self.score = 0
+        self.finished = False
+        self.answered = bytearray(len(items))
+        self.log_items = array("i")
+        self.log_correct = bytearray()
+        self.username = username
+        self.start_time = start_time
+        self.end_time = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def current(self) -> int:
+        """Row position of the item being asked."""
+        return int(self.items[self.idx])
+
+
+class QuizEngine:
+    def __init__(self, word_of):
+        """`word_of(row_position) -> str` returns the expected answer for a row."""
+        self.word_of = word_of
+
+    @staticmethod
+    def normalize(answer: str) -> str:
+        return answer.strip().lower()
+
+    def start(self, items, username: str = "", now: datetime = None) -> QuizState:
+        return QuizState(items, username.strip() or "Anonymous", now or datetime.now())
+
+    def submit(self, state: QuizState, answer: str, now: datetime = None):
+        """
+        Check `answer` for the current item and advance.
+
+        Returns (status, expected_word) where status is EMPTY, CORRECT or
+        INCORRECT. An empty answer changes nothing.
+        """
+        if state.finished:
+            return EMPTY, None
+        idx = state.idx
+        word = self.word_of(state.items[idx])
+        user = self.normalize(answer)
+        if not user:
+            return EMPTY, word
+
+        is_correct = user == self.normalize(word)
+        if is_correct:
+            state.score += 1
+
+        # Log once per item even if submitted more than once.
+        if not state.answered[idx]:
+            state.answered[idx] = 1
+            state.log_items.append(idx)
+            state.log_correct.append(is_correct)
+
+        if idx < len(state.items) - 1:
+            state.idx += 1
+        else:
+            state.finished = True
+            state.end_time = now or datetime.now()
+        return (CORRECT if is_correct else INCORRECT), word
+
+    def history(self, state: QuizState) -> list:
+        """Per-item results as [{'index', 'word', 'correct'}, ...] in answer order."""
+        return [
+            {"index": i, "word": self.word_of(state.items[i]), "correct": bool(c)}
+            for i, c in zip(state.log_items, state.log_correct)
+        ]
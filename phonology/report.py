@@ -0,0 +1,96 @@
+"""
+PDF quiz reports.
+
+`create_pdf_report` renders one report; `cached_pdf_report` memoizes it by a
+fingerprint of the finished quiz (name, start/end time, score, history), so
+the finished-quiz screen renders the PDF at most once per quiz no matter
+how many times the page reruns or the button is clicked.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+MAX_CACHED_REPORTS = 64
+
+
+def create_pdf_report(username, history, score, start_time, end_time):
+    """
+    Create a PDF report and return it as bytes.
+    history: list of dicts with keys {'word', 'correct'}.
+    """
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    y = height - 50
+
+    # Title
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, y, "Word Quiz Report")
+    y -= 30
+
+    c.setFont("Helvetica", 11)
+    c.drawString(50, y, f"Name: {username}")
+    y -= 18
+    if start_time:
+        c.drawString(50, y, f"Start time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        y -= 18
+    if end_time:
+        c.drawString(50, y, f"End time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        y -= 18
+
+    total_items = len(history)
+    c.drawString(50, y, f"Score: {score} / {total_items}")
+    y -= 30
+
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "Items practiced:")
+    y -= 20
+
+    c.setFont("Helvetica", 10)
+    for i, item in enumerate(history, start=1):
+        status = "Correct" if item["correct"] else "Incorrect"
+        line = f"{i}. {item['word']}  -  {status}"
+        if y < 50:  # new page if needed
+            c.showPage()
+            y = height - 50
+            c.setFont("Helvetica", 10)
+        c.drawString(50, y, line)
+        y -= 15
+
+    c.save()
+    pdf = buffer.getvalue()
+    buffer.close()
+    return pdf
+
+
+def report_fingerprint(username, history, score, start_time, end_time) -> str:
+    h = hashlib.sha256()
+    h.update(f"{username}\x1f{score}\x1f{start_time}\x1f{end_time}\x1e".encode("utf-8"))
+    for item in history:
+        h.update(f"{item['word']}\x1f{int(bool(item['correct']))}\x1e".encode("utf-8"))
+    return h.hexdigest()
+
+
+_reports = OrderedDict()
+_reports_lock = threading.Lock()
+
+
+def cached_pdf_report(username, history, score, start_time, end_time) -> bytes:
+    """`create_pdf_report`, memoized per finished-quiz fingerprint (small LRU shared by all sessions)."""
+    key = report_fingerprint(username, history, score, start_time, end_time)
+    with _reports_lock:
+        pdf = _reports.get(key)
+        if pdf is not None:
+            _reports.move_to_end(key)
+            return pdf
+    pdf = create_pdf_report(username, history, score, start_time, end_time)
+    with _reports_lock:
+        _reports[key] = pdf
+        while len(_reports) > MAX_CACHED_REPORTS:
+            _reports.popitem(last=False)
+    return pdf
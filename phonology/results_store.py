@@ -0,0 +1,208 @@
+"""
+Durable store for finished quizzes and their per-item outcomes.
+
+Results go to SQLite in WAL mode. Sessions never write to the database
+themselves: `record_quiz` only puts the result on an in-memory queue, and a
+single writer thread drains the queue and commits whole batches in one
+transaction. A full class finishing at the same moment therefore costs one
+or two commits instead of one locked write per student.
+
+    store = get_results_store()
+    quiz_uid = store.record_quiz("Kim", start, end, score, [(wid, word, correct), ...])
+
+Whatever is still queued is committed when the process exits (`atexit`).
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+DEFAULT_DB_PATH = os.environ.get(
+    "PHONOLOGY_RESULTS_DB",
+    os.path.join(os.path.expanduser("~"), ".local", "share", "english-phonology", "results.sqlite3"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quizzes (
+    id         INTEGER PRIMARY KEY,
+    quiz_uid   TEXT NOT NULL UNIQUE,
+    username   TEXT NOT NULL,
+    start_time TEXT,
+    end_time   TEXT,
+    score      INTEGER NOT NULL,
+    n_items    INTEGER NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+CREATE TABLE IF NOT EXISTS quiz_items (
+    quiz_id  INTEGER NOT NULL REFERENCES quizzes(id),
+    position INTEGER NOT NULL,
+    wid      INTEGER,
+    word     TEXT NOT NULL,
+    correct  INTEGER NOT NULL,
+    PRIMARY KEY (quiz_id, position)
+);
+CREATE INDEX IF NOT EXISTS quiz_items_wid ON quiz_items(wid);
+"""
+
+_STOP = object()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+def _iso(value):
+    return value.isoformat(timespec="seconds") if value is not None else None
+
+
+class ResultsStore:
+    def __init__(self, path: str = DEFAULT_DB_PATH, batch_size: int = 200, flush_interval: float = 0.25):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.batches_committed = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self._queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)  # commit what is still queued on shutdown
+
+    # ---------- write side ----------
+    def record_quiz(self, username: str, start_time, end_time, score: int, items) -> str:
+        """
+        Queue one finished quiz. `items` is a sequence of (wid, word, correct)
+        in quiz order. Returns the quiz's unique id immediately.
+        """
+        quiz_uid = uuid.uuid4().hex
+        items = [(None if wid is None else int(wid), str(word), 1 if correct else 0) for wid, word, correct in items]
+        self._queue.put((quiz_uid, username, _iso(start_time), _iso(end_time), int(score), items))
+        return quiz_uid
+
+    def _run(self):
+        conn = _connect(self.path)
+        stopping = False
+        while not stopping:
+            batch = []
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                break
+            batch.append(first)
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            try:
+                self._write_batch(conn, batch)
+            except Exception as exc:
+                # Keep the writer alive; the page must never fail because of the store.
+                print(f"results store: dropped batch of {len(batch)} quizzes: {exc!r}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch):
+        with conn:  # one transaction per batch
+            for quiz_uid, username, start, end, score, items in batch:
+                cur = conn.execute(
+                    "INSERT INTO quizzes (quiz_uid, username, start_time, end_time, score, n_items) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (quiz_uid, username, start, end, score, len(items)),
+                )
+                quiz_id = cur.lastrowid
+                conn.executemany(
+                    "INSERT INTO quiz_items (quiz_id, position, wid, word, correct) VALUES (?, ?, ?, ?, ?)",
+                    [(quiz_id, pos, wid, word, correct) for pos, (wid, word, correct) in enumerate(items)],
+                )
+        self.batches_committed += 1
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """
+        Wait until everything queued so far is committed. Returns False if
+        that did not happen within `timeout` seconds (or the writer is gone).
+        """
+        deadline = time.monotonic() + timeout
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._writer.is_alive():
+                    return False
+                done.wait(min(remaining, 0.5))
+        return True
+
+    def close(self, timeout: float = 30.0):
+        """Commit what is queued and stop the writer (safe to call twice)."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._writer.join(timeout)
+
+    # ---------- read side ----------
+    def _query(self, sql: str, params=()):
+        conn = _connect(self.path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def count_quizzes(self) -> int:
+        return self._query("SELECT COUNT(*) FROM quizzes")[0][0]
+
+    def count_items(self) -> int:
+        return self._query("SELECT COUNT(*) FROM quiz_items")[0][0]
+
+    def recent_quizzes(self, limit: int = 20):
+        """[(quiz_uid, username, start_time, end_time, score, n_items), ...], newest first."""
+        return self._query(
+            "SELECT quiz_uid, username, start_time, end_time, score, n_items FROM quizzes "
+            "ORDER BY id DESC LIMIT ?", (limit,),
+        )
+
+    def quiz_items(self, quiz_uid: str):
+        """[(position, wid, word, correct), ...] for one quiz."""
+        return self._query(
+            "SELECT i.position, i.wid, i.word, i.correct FROM quiz_items i "
+            "JOIN quizzes q ON q.id = i.quiz_id WHERE q.quiz_uid = ? ORDER BY i.position",
+            (quiz_uid,),
+        )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_results_store() -> ResultsStore:
+    """Process-wide store (one writer thread per worker process)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultsStore()
+    return _store
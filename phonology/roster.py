@@ -0,0 +1,94 @@
+"""
+Class rosters for the Grouping tool.
+
+The default roster is a `RevalidatingDataset` ("roster" in
+`phonology.datasets.DATASET_SPECS`), so it is read from the local cache and
+revalidated in the background instead of being downloaded on every rerun.
+`RosterIndex` is built once per roster version (or once per uploaded file,
+keyed by its content hash) and answers everything the tab asks - the course
+list, a course's students and its `Year` buckets - without touching the
+frame again.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+
+from phonology.words import get_words
+
+REQUIRED_COLUMNS = ("Course", "Name_ori")
+MAX_UPLOADS = 8
+
+
+class RosterIndex:
+    def __init__(self, df: pd.DataFrame):
+        self.columns = list(df.columns)
+        self.valid = all(col in df.columns for col in REQUIRED_COLUMNS)
+        self.has_year = "Year" in df.columns
+        self.courses = []
+        self._empty = df.iloc[0:0]
+        self._rows = {}
+        self._names = {}
+        self._years = {}
+        if not self.valid:
+            return
+        self.courses = df["Course"].dropna().unique().tolist()
+        for course, rows in df.groupby("Course", sort=False):
+            rows = rows[rows["Name_ori"].notna()]
+            self._rows[course] = rows
+            self._names[course] = rows["Name_ori"].tolist()
+            if self.has_year:
+                self._years[course] = self._year_buckets(rows)
+
+    @staticmethod
+    def _year_buckets(rows):
+        try:
+            years = rows["Year"].astype(int)
+        except (TypeError, ValueError):
+            return None  # reported when the course is grouped, as before
+        buckets = {}
+        for year, names in rows["Name_ori"].groupby(years, sort=True):
+            buckets[int(year)] = names.dropna().tolist()
+        return buckets
+
+    def rows(self, course) -> pd.DataFrame:
+        """The course's students (rows with a name) as a shared, read-only frame."""
+        return self._rows.get(course, self._empty)
+
+    def names(self, course) -> list:
+        """Students of `course` in roster order (a fresh list the caller may shuffle)."""
+        return list(self._names.get(course, []))
+
+    def years(self, course):
+        """{year: names} for `course`, or None if its `Year` values are not all integers."""
+        buckets = self._years.get(course, {})
+        if buckets is None:
+            return None
+        return {year: list(names) for year, names in buckets.items()}
+
+
+def get_roster_index() -> RosterIndex:
+    """Index of the default roster, rebuilt only when a changed roster is fetched."""
+    return get_words("roster").derived("roster_index", RosterIndex)
+
+
+_uploads = OrderedDict()  # sha256 -> RosterIndex
+_uploads_lock = threading.Lock()
+
+
+def roster_index_from_upload(content: bytes) -> RosterIndex:
+    """Index of an uploaded CSV; the same file is parsed only once."""
+    sha = hashlib.sha256(content).hexdigest()
+    with _uploads_lock:
+        index = _uploads.get(sha)
+        if index is not None:
+            _uploads.move_to_end(sha)
+            return index
+    index = RosterIndex(pd.read_csv(BytesIO(content)))
+    with _uploads_lock:
+        _uploads[sha] = index
+        while len(_uploads) > MAX_UPLOADS:
+            _uploads.popitem(last=False)
+    return index
@@ -0,0 +1,164 @@
+"""
+Sampling engine for practice and quiz subsets.
+
+`Sampler` is built once per word-table version: it precomputes the WID
+ordering and the row -> Group codes, so "WID order" is a slice and weighted
+draws never touch the DataFrame. Weighted draws use a Walker/Vose alias
+table (O(1) per draw after an O(N) build), drawing without replacement by
+rejecting repeats; when more than half the list is requested it switches to
+Efraimidis-Spirakis keys, which is O(N) but never degenerates. All draws
+take a seed or a numpy Generator, so a subset can be reproduced exactly.
+"""
+import hashlib
+import threading
+
+import numpy as np
+
+MAX_ALIAS_TABLES = 16
+
+
+class AliasTable:
+    """Walker's alias method (Vose's construction) over non-negative weights."""
+
+    def __init__(self, weights):
+        w = np.asarray(weights, dtype=np.float64)
+        if w.ndim != 1 or len(w) == 0 or (w < 0).any() or not w.sum() > 0:
+            raise ValueError("weights must be a non-empty 1-D array of non-negative numbers with a positive sum")
+        n = len(w)
+        self.weights = w
+        self.support = int(np.count_nonzero(w > 0))
+        scaled = w * (n / w.sum())
+        self.prob = np.ones(n, dtype=np.float64)
+        self.alias = np.arange(n, dtype=np.int64)
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        self.n = n
+
+    def draw(self, rng, size: int) -> np.ndarray:
+        cols = rng.integers(0, self.n, size=size)
+        keep = rng.random(size) < self.prob[cols]
+        return np.where(keep, cols, self.alias[cols])
+
+
+class Sampler:
+    def __init__(self, wids, groups=None):
+        wids = np.asarray(wids)
+        self.n = len(wids)
+        self.wid_order = np.argsort(wids, kind="stable").astype(np.int32)
+        if groups is not None:
+            self.group_names, self.group_codes = np.unique(np.asarray(groups, dtype=object).astype(str),
+                                                           return_inverse=True)
+        else:
+            self.group_names, self.group_codes = np.array([]), None
+        self._alias_tables = {}
+        self._alias_lock = threading.Lock()
+
+    @classmethod
+    def from_table(cls, table) -> "Sampler":
+        groups = table.strings("Group") if "Group" in table.columns else None
+        return cls(table.ints("WID"), groups)
+
+    # ---------- weights ----------
+    def weights(self, group_weights: dict = None, misses=None, miss_boost: float = 3.0,
+                due=None, now: float = None, not_due_weight: float = 0.1) -> np.ndarray:
+        """
+        Per-row weights (1.0 = neutral), combined multiplicatively:
+
+        - group_weights: {"G1": 2.0, "G4": 0.0, ...}; unlisted groups keep 1.0
+        - misses: per-row miss counts -> 1 + miss_boost * misses
+        - due: per-row spaced-repetition due timestamps; rows not yet due
+          (due > now) get `not_due_weight`
+        """
+        w = np.ones(self.n, dtype=np.float64)
+        if group_weights and self.group_codes is not None:
+            per_group = np.array([group_weights.get(g, 1.0) for g in self.group_names], dtype=np.float64)
+            w *= per_group[self.group_codes]
+        if misses is not None:
+            w *= 1.0 + miss_boost * np.asarray(misses, dtype=np.float64)
+        if due is not None:
+            due = np.asarray(due, dtype=np.float64)
+            now = np.inf if now is None else now
+            w *= np.where(due <= now, 1.0, not_due_weight)
+        return w
+
+    @staticmethod
+    def _rng(seed):
+        return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+    def alias_table(self, weights) -> AliasTable:
+        """Alias table for `weights`, reused while the same weights keep being asked for."""
+        key = hashlib.blake2b(weights.tobytes(), digest_size=16).digest()
+        with self._alias_lock:
+            table = self._alias_tables.get(key)
+            if table is None:
+                table = AliasTable(weights)
+                if len(self._alias_tables) >= MAX_ALIAS_TABLES:
+                    self._alias_tables.pop(next(iter(self._alias_tables)))
+                self._alias_tables[key] = table
+            return table
+
+    # ---------- draws ----------
+    def first(self, n: int) -> np.ndarray:
+        """First `n` rows in WID order."""
+        return self.wid_order[:n].copy()
+
+    def uniform(self, n: int, seed=None) -> np.ndarray:
+        return self._rng(seed).choice(self.n, size=n, replace=False).astype(np.int32)
+
+    def weighted(self, n: int, weights, seed=None) -> np.ndarray:
+        """
+        `n` distinct rows drawn with probability proportional to `weights`.
+
+        `weights` may also be an `AliasTable` from `alias_table()`; callers that
+        draw repeatedly with the same weights skip hashing them, so a draw
+        costs O(n) whatever the list size.
+        """
+        rng = self._rng(seed)
+        if isinstance(weights, AliasTable):
+            table = weights
+        else:
+            table = self.alias_table(np.asarray(weights, dtype=np.float64))
+        weights, support = table.weights, table.support
+        n = min(n, support)
+        if n <= 0:
+            return np.empty(0, dtype=np.int32)
+        if 2 * n <= support:
+            chosen = []
+            seen = set()
+            for _ in range(8):
+                # Over-draw a little so most calls finish in one vectorized batch.
+                for row in table.draw(rng, (n - len(chosen)) * 2 + 8).tolist():
+                    if row not in seen:
+                        seen.add(row)
+                        chosen.append(row)
+                        if len(chosen) == n:
+                            return np.asarray(chosen, dtype=np.int32)
+            # A few rows hold almost all the weight; rejection would spin.
+
+        # Efraimidis-Spirakis: the n largest keys log(u) / w (same law as u ** (1 / w))
+        with np.errstate(divide="ignore"):
+            keys = np.where(weights > 0, np.log(rng.random(self.n)) / weights, -np.inf)
+        top = np.argpartition(-keys, n - 1)[:n]
+        return top[np.argsort(-keys[top])].astype(np.int32)
+
+
+_samplers = {}
+_samplers_lock = threading.Lock()
+
+
+def get_sampler(table) -> Sampler:
+    """Shared sampler for a `WordTable`, rebuilt only when the table version changes."""
+    key = table.source_sha256
+    with _samplers_lock:
+        sampler = _samplers.get(key)
+        if sampler is None:
+            sampler = Sampler.from_table(table)
+            _samplers.clear()
+            _samplers[key] = sampler
+        return sampler
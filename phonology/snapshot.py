@@ -0,0 +1,202 @@
+"""
+Compact columnar snapshot of the word list.
+
+`build_snapshot` turns `data/Stress-wordlist-2025.csv` into a directory of
+NumPy arrays: integer columns are stored as-is, and every text column is a
+single UTF-8 byte buffer plus an int64 offset table. `WordTable` opens those
+files with `mmap_mode="r"`, so every session (and every worker process on
+the same machine) shares the same read-only pages instead of holding its own
+object-dtype DataFrame.
+
+    python -m phonology.snapshot build            # writes the snapshot
+    python -m phonology.snapshot info             # prints where it lives
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+from phonology.datasets import DEFAULT_CACHE_DIR, get_dataset, DATASET_SPECS
+
+DEFAULT_CSV = DATASET_SPECS["wordlist"]["local_path"]
+SNAPSHOT_ROOT = os.path.join(DEFAULT_CACHE_DIR, "snapshots")
+INT_COLUMNS = ("WID",)
+META_NAME = "meta.json"
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def snapshot_dir_for(sha256: str, root: str = SNAPSHOT_ROOT) -> str:
+    return os.path.join(root, f"wordlist-{sha256[:16]}")
+
+
+def _encode_columns(columns, rows):
+    """rows: list of dicts (str values). Returns {file_stem: ndarray}."""
+    arrays = {}
+    for col in columns:
+        if col in INT_COLUMNS:
+            arrays[col] = np.asarray([int(r[col]) for r in rows], dtype=np.int32)
+            continue
+        encoded = [(r[col] or "").encode("utf-8") for r in rows]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        arrays[f"{col}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        arrays[f"{col}.offsets"] = offsets
+    return arrays
+
+
+def build_snapshot(csv_path: str = DEFAULT_CSV, out_dir: str = None) -> str:
+    """Write the snapshot for `csv_path` and return its directory."""
+    with open(csv_path, "rb") as f:
+        content = f.read()
+    sha = _sha256_bytes(content)
+    out_dir = out_dir or snapshot_dir_for(sha)
+
+    text = content.decode("utf-8-sig")
+    reader = csv.DictReader(text.splitlines())
+    columns = list(reader.fieldnames)
+    rows = list(reader)
+
+    tmp_dir = f"{out_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    for stem, arr in _encode_columns(columns, rows).items():
+        np.save(os.path.join(tmp_dir, stem + ".npy"), arr)
+    with open(os.path.join(tmp_dir, META_NAME), "w", encoding="utf-8") as f:
+        json.dump({"columns": columns, "rows": len(rows), "source_sha256": sha}, f)
+    try:
+        os.replace(tmp_dir, out_dir)
+    except OSError:
+        # Another worker finished first; its snapshot is identical.
+        for name in os.listdir(tmp_dir):
+            os.remove(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+    return out_dir
+
+
+class WordTable:
+    """
+    Read-only, column-oriented view of the word list.
+
+    Text is decoded lazily per cell, so holding a `WordTable` costs only the
+    shared arrays; nothing is copied per session.
+    """
+
+    def __init__(self, columns, arrays, n_rows: int, source_sha256: str = None):
+        self.columns = list(columns)
+        self._arrays = arrays
+        self._n = n_rows
+        self.source_sha256 = source_sha256
+
+    @classmethod
+    def open(cls, snapshot_dir: str) -> "WordTable":
+        with open(os.path.join(snapshot_dir, META_NAME), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {}
+        for name in os.listdir(snapshot_dir):
+            if name.endswith(".npy"):
+                arrays[name[:-4]] = np.load(os.path.join(snapshot_dir, name), mmap_mode="r")
+        return cls(meta["columns"], arrays, meta["rows"], meta.get("source_sha256"))
+
+    @classmethod
+    def from_frame(cls, df, source_sha256: str = None) -> "WordTable":
+        """In-memory table from a DataFrame (used when a newer remote copy was swapped in)."""
+        columns = [str(c) for c in df.columns]
+        rows = df.fillna("").astype(str).to_dict("records")
+        return cls(columns, _encode_columns(columns, rows), len(rows), source_sha256)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def value(self, i: int, col: str):
+        arr = self._arrays.get(col)
+        if arr is not None:
+            return int(arr[i])
+        offsets = self._arrays[f"{col}.offsets"]
+        start, end = offsets[i], offsets[i + 1]
+        return self._arrays[f"{col}.data"][start:end].tobytes().decode("utf-8")
+
+    def row(self, i: int, columns=None) -> dict:
+        """Plain dict of one row (only `columns`, if given); no pandas objects are built."""
+        return {col: self.value(i, col) for col in (columns or self.columns)}
+
+    def ints(self, col: str) -> np.ndarray:
+        return self._arrays[col]
+
+    def strings(self, col: str) -> list:
+        """Decode a whole text column (for building indexes once, not per rerun)."""
+        offsets = self._arrays[f"{col}.offsets"]
+        buf = self._arrays[f"{col}.data"].tobytes()
+        return [buf[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self._n)]
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def load_snapshot(csv_path: str = DEFAULT_CSV) -> WordTable:
+    """Open (building first if needed) the snapshot of a local CSV."""
+    with open(csv_path, "rb") as f:
+        sha = _sha256_bytes(f.read())
+    out_dir = snapshot_dir_for(sha)
+    if not os.path.exists(os.path.join(out_dir, META_NAME)):
+        build_snapshot(csv_path, out_dir)
+    return WordTable.open(out_dir)
+
+
+def get_word_table() -> WordTable:
+    """
+    Shared table for the current version of the "wordlist" dataset.
+
+    The memory-mapped snapshot is used while the dataset matches the bundled
+    CSV; if background revalidation swapped in a different copy, an
+    in-memory table is built from it once per dataset version.
+    """
+    ds = get_dataset("wordlist")
+    df = ds.frame()
+    key = ds.sha256
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is not None:
+            return table
+        table = None
+        if ds.local_path and os.path.exists(ds.local_path):
+            try:
+                local = load_snapshot(ds.local_path)
+                if local.source_sha256 == key:
+                    table = local
+            except OSError:
+                table = None
+        if table is None:
+            table = WordTable.from_frame(df, source_sha256=key)
+        _tables.clear()  # only the current version is worth keeping
+        _tables[key] = table
+        return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the word list snapshot.")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--out", default=None, help="snapshot directory (default: content-addressed cache dir)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        out_dir = build_snapshot(args.csv, args.out)
+    else:
+        table = load_snapshot(args.csv)
+        out_dir = snapshot_dir_for(table.source_sha256)
+    table = WordTable.open(out_dir)
+    size = sum(os.path.getsize(os.path.join(out_dir, n)) for n in os.listdir(out_dir))
+    print(f"{out_dir}: {len(table)} rows, {len(table.columns)} columns, {size / 1024:.1f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Audio served as content-hashed static files.
+
+`st.audio(bytes)` registers the bytes with Streamlit's media manager again
+on every rerun and hands the browser a new, uncacheable URL each time.
+Instead, pages publish audio into `static/media/<sha256 prefix>.<ext>` and
+pass the resulting `/app/static/...` URL to `st.audio` (below
+`server.baseUrlPath` when the app is served under a path prefix):
+
+- the file name is the content hash, so identical audio is stored once and
+  a URL never changes meaning; browsers (and any proxy in front of the app)
+  can keep it indefinitely
+- Streamlit's static route answers with ETag/Last-Modified and supports
+  HTTP Range requests, so seeking and repeat plays never re-download
+- the websocket only carries the short URL
+
+Static serving is switched on in `.streamlit/config.toml`
+(`server.enableStaticServing`). When it is off, `audio_source` returns the
+bytes unchanged and pages behave as before.
+"""
+import hashlib
+import os
+import shutil
+import threading
+import time
+
+from phonology.tts_backends import audio_mime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEDIA_DIR = os.path.join(REPO_ROOT, "static", "media")
+STATIC_PATH = "app/static/media/"
+HASH_CHARS = 20
+MAX_BYTES = int(os.environ.get("PHONOLOGY_STATIC_MEDIA_MB", "512")) * 1024 * 1024
+MIN_AGE_SECONDS = 3600  # never prune files a page may still be pointing at
+
+_lock = threading.Lock()
+_file_names = {}  # (realpath, mtime_ns, size) -> published file name
+_state = {"published_bytes": None}
+
+
+def _option(name: str, default):
+    try:
+        import streamlit as st
+
+        return st.get_option(name)
+    except Exception:
+        return default
+
+
+def static_serving_enabled() -> bool:
+    return bool(_option("server.enableStaticServing", False))
+
+
+def url_prefix() -> str:
+    """URL path of MEDIA_DIR, e.g. "/app/static/media/" or "/phonology/app/static/media/"."""
+    base = (_option("server.baseUrlPath", "") or "").strip("/")
+    return f"/{base}/{STATIC_PATH}" if base else f"/{STATIC_PATH}"
+
+
+def _suffix(data: bytes) -> str:
+    return ".wav" if audio_mime(data) == "audio/wav" else ".mp3"
+
+
+def _media_bytes() -> int:
+    total = 0
+    for entry in os.scandir(MEDIA_DIR):
+        if entry.is_file():
+            total += entry.stat().st_size
+    return total
+
+
+def prune(max_bytes: int = MAX_BYTES, min_age: float = MIN_AGE_SECONDS) -> int:
+    """Delete the least recently published files over `max_bytes`. Returns files removed."""
+    try:
+        entries = [e for e in os.scandir(MEDIA_DIR) if e.is_file() and not e.name.endswith(".tmp")]
+    except OSError:
+        return 0
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    total = sum(e.stat().st_size for e in entries)
+    cutoff = time.time() - min_age
+    removed = 0
+    for entry in entries:
+        if total <= max_bytes or entry.stat().st_mtime > cutoff:
+            break
+        try:
+            os.remove(entry.path)
+        except OSError:
+            continue
+        total -= entry.stat().st_size  # DirEntry caches its stat
+        removed += 1
+    return removed
+
+
+def _install(name: str, write, touch: bool = True) -> str:
+    """Put `name` into MEDIA_DIR (via `write(tmp_path)`) unless it is there; returns `name`."""
+    path = os.path.join(MEDIA_DIR, name)
+    if os.path.exists(path):
+        if touch:
+            os.utime(path)  # publishing again counts as a recent use for prune()
+    else:
+        os.makedirs(MEDIA_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(tmp)
+        os.replace(tmp, path)
+        with _lock:
+            if _state["published_bytes"] is None:
+                _state["published_bytes"] = _media_bytes()
+            _state["published_bytes"] += os.path.getsize(path)
+            over = _state["published_bytes"] > MAX_BYTES
+        if over:
+            prune()
+            with _lock:
+                _state["published_bytes"] = _media_bytes()
+    return name
+
+
+def publish(data: bytes) -> str:
+    """Store `data` under its content hash and return its static URL."""
+    name = hashlib.sha256(data).hexdigest()[:HASH_CHARS] + _suffix(data)
+
+    def write(tmp):
+        with open(tmp, "wb") as f:
+            f.write(data)
+
+    return url_prefix() + _install(name, write)
+
+
+def publish_file(path: str) -> str:
+    """Static URL for an audio file on disk; the file is hashed once per (mtime, size)."""
+    info = os.stat(path)
+    memo = (os.path.realpath(path), info.st_mtime_ns, info.st_size)
+    with _lock:
+        name = _file_names.get(memo)
+    if name is not None and os.path.exists(os.path.join(MEDIA_DIR, name)):
+        return url_prefix() + name
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        head = f.read(4)
+        digest.update(head)
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    name = digest.hexdigest()[:HASH_CHARS] + _suffix(head)
+
+    def write(tmp):
+        try:
+            os.link(path, tmp)  # same filesystem: no second copy on disk
+        except OSError:
+            shutil.copyfile(path, tmp)
+
+    # No touch: the file may be a hard link, and bumping its mtime would change `memo`.
+    name = _install(name, write, touch=False)
+    with _lock:
+        _file_names[memo] = name
+    return url_prefix() + name
+
+
+def audio_source(data: bytes):
+    """What to pass to `st.audio`: a static URL when static serving is on, else the bytes."""
+    if data and static_serving_enabled():
+        try:
+            return publish(data)
+        except OSError:
+            pass
+    return data
+
+
+def file_source(path: str):
+    """Like `audio_source` for a file on disk (falls back to the file path)."""
+    if static_serving_enabled():
+        try:
+            return publish_file(path)
+        except OSError:
+            pass
+    return path
@@ -0,0 +1,65 @@
+"""
+Precomputed views for the Words-by-Stress page.
+
+Everything the page shows for a stress choice is built once per dataset
+version (through `WordList.derived`) instead of on every rerun: the word
+table for each stress position (already projected to the displayed
+columns), the full part-of-speech names for every row, and the six
+possible stress-circle HTML fragments.
+"""
+from functools import lru_cache
+
+STRESS_OPTIONS = ["1st", "2nd", "antepenult", "penult", "ult", "compound"]
+CIRCLE_OPTIONS = ["1st", "2nd", "antepenult", "penult", "ult"]
+DISPLAY_COLUMNS = ["Word", "POS", "Transcription", "Variation"]
+
+POS_MAPPING = {
+    "n": "Noun",
+    "adj": "Adjective",
+    "v": "Verb",
+    "adv": "Adverb",
+}
+
+
+def convert_pos(pos_abbrev) -> str:
+    """'n, v' -> 'Noun, Verb'; unknown abbreviations are kept as they are."""
+    if not isinstance(pos_abbrev, str):
+        return ""
+    return ", ".join(POS_MAPPING.get(p.strip(), p.strip()) for p in pos_abbrev.split(","))
+
+
+@lru_cache(maxsize=None)
+def stress_circles_html(stress: str) -> str:
+    """Row of circles with `stress` highlighted (one fragment per option, built once)."""
+    circle_html = "<div style='display: flex; flex-direction: row; justify-content: center; gap: 20px;'>"
+    for option in CIRCLE_OPTIONS:
+        background_color = "yellow" if option == stress else "white"
+        text_color = "black" if option == stress else "gray"
+        border_color = "gray"
+        circle_html += f"<div style='width: 100px; height: 60px; background: {background_color}; border: 2px solid {border_color}; color: {text_color}; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-size: 16px;'>{option.capitalize()}</div>"
+        if option == "2nd":
+            circle_html += "<div style='display: flex; align-items: center; justify-content: center; color: gray; font-size: 16px;'> (optional syllables) </div>"
+    circle_html += "</div>"
+    return circle_html
+
+
+def _partitions(df) -> dict:
+    columns = [c for c in DISPLAY_COLUMNS if c in df.columns]
+    parts = {stress: group for stress, group in df[columns].groupby(df["Stress"], sort=False)}
+    empty = df[columns].iloc[0:0]
+    return {stress: parts.get(stress, empty) for stress in set(parts) | set(STRESS_OPTIONS)}
+
+
+def _full_pos(df) -> list:
+    return [convert_pos(p) for p in df["POS"].tolist()]
+
+
+def stress_partition(words, stress: str):
+    """Rows with `stress`, projected to the displayed columns (original row numbers kept)."""
+    return words.derived("stress_partitions", _partitions)[stress]
+
+
+def full_pos(words, wid) -> str:
+    """Expanded part of speech for one word id."""
+    pos = words.position(wid)
+    return "" if pos is None else words.derived("full_pos", _full_pos)[pos]
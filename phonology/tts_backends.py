@@ -0,0 +1,141 @@
+"""
+Text-to-speech backends.
+
+Every page gets audio through `phonology.audio_cache`, which calls one of
+these backends on a cache miss. The backend is chosen per deployment with
+PHONOLOGY_TTS_BACKEND:
+
+- "gtts" (default): Google TTS through the shared client in `tts_client`
+- "espeak-ng": the local eSpeak NG synthesizer; no network, WAV output
+- "stub": deterministic fake audio for tests, benchmarks and dry runs
+
+A backend is a small object with a `name`, the `mime` type and file
+`suffix` of what it returns, `available()`, and
+`synthesize(text, lang, tld, slow) -> bytes`. The cache key includes the
+backend name, so switching backends never serves another engine's audio.
+"""
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import time
+import wave
+
+DEFAULT_BACKEND = os.environ.get("PHONOLOGY_TTS_BACKEND", "gtts")
+
+
+def audio_mime(data) -> str:
+    """MIME type for `st.audio`: sniffed from bytes (WAV or MP3), or from a path/URL suffix."""
+    if isinstance(data, str):
+        return "audio/wav" if data.endswith(".wav") else "audio/mp3"
+    return "audio/wav" if data[:4] == b"RIFF" else "audio/mp3"
+
+
+def join_audio(parts) -> bytes:
+    """Concatenate clips from one backend: MP3 frames chain as they are, WAV clips are re-muxed."""
+    parts = [p for p in parts if p]
+    if len(parts) < 2 or not all(p[:4] == b"RIFF" for p in parts):
+        return b"".join(parts)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as dst:
+        for n, part in enumerate(parts):
+            with wave.open(io.BytesIO(part), "rb") as src:
+                if n == 0:
+                    dst.setparams(src.getparams())
+                dst.writeframes(src.readframes(src.getnframes()))
+    return out.getvalue()
+
+
+def stub_synthesize(text: str, lang: str = "en", tld: str = "com", slow: bool = False,
+                    delay: float = 0.0) -> bytes:
+    """Deterministic offline stand-in for gTTS (for tests and dry runs)."""
+    if delay:
+        time.sleep(delay)
+    digest = hashlib.sha256(f"{text}|{lang}|{tld}|{slow}".encode("utf-8")).digest()
+    return b"STUB-MP3" + digest
+
+
+class TTSBackend:
+    name = "base"
+    mime = "audio/mp3"
+    suffix = ".mp3"
+
+    def available(self) -> bool:
+        return True
+
+    def synthesize(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    name = "gtts"
+
+    def synthesize(self, text, lang="en", tld="com", slow=False):
+        from phonology.tts_client import get_tts_client
+
+        return get_tts_client().synthesize(text, lang=lang, tld=tld, slow=slow)
+
+
+class EspeakBackend(TTSBackend):
+    """eSpeak NG (`apt install espeak-ng`), run as a subprocess writing WAV to stdout."""
+
+    name = "espeak-ng"
+    mime = "audio/wav"
+    suffix = ".wav"
+    # (gTTS lang, tld) -> eSpeak voice; unlisted languages use the gTTS code as is
+    VOICES = {("en", "com"): "en-us", ("en", "co.uk"): "en-gb", ("en", None): "en-us",
+              ("zh-CN", None): "cmn", ("zh", None): "cmn"}
+    WORDS_PER_MINUTE = 165
+    SLOW_WORDS_PER_MINUTE = 110
+
+    def __init__(self, executable: str = None, timeout: float = 20.0):
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+        self.timeout = timeout
+
+    def available(self):
+        return self.executable is not None
+
+    def voice(self, lang: str, tld: str = None) -> str:
+        return self.VOICES.get((lang, tld)) or self.VOICES.get((lang, None)) or lang
+
+    def synthesize(self, text, lang="en", tld="com", slow=False):
+        from phonology.tts_client import TTSError
+
+        if not self.available():
+            raise TTSError("espeak-ng is not installed")
+        speed = self.SLOW_WORDS_PER_MINUTE if slow else self.WORDS_PER_MINUTE
+        try:
+            proc = subprocess.run(
+                [self.executable, "-v", self.voice(lang, tld), "-s", str(speed), "--stdout", "--", text],
+                capture_output=True, timeout=self.timeout, check=True,
+            )
+        except (OSError, subprocess.SubprocessError) as exc:
+            raise TTSError(f"espeak-ng failed: {exc}") from exc
+        return proc.stdout
+
+
+class StubBackend(TTSBackend):
+    name = "stub"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def synthesize(self, text, lang="en", tld="com", slow=False):
+        return stub_synthesize(text, lang=lang, tld=tld, slow=slow, delay=self.delay)
+
+
+BACKENDS = {
+    "gtts": GTTSBackend(),
+    "espeak-ng": EspeakBackend(),
+    "stub": StubBackend(),
+}
+
+
+def get_backend(name: str = None) -> TTSBackend:
+    """Backend by name (default: PHONOLOGY_TTS_BACKEND, else gTTS)."""
+    name = name or DEFAULT_BACKEND
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown TTS backend {name!r}; choose from {', '.join(sorted(BACKENDS))}") from None
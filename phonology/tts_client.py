@@ -0,0 +1,197 @@
+"""
+Shared HTTP client for Google TTS.
+
+`gTTS.write_to_fp` opens a new `requests.Session` (and a new TLS connection)
+for every request and turns the first 429 or timeout into an exception. This
+client keeps gTTS for building the requests (`gTTS._prepare_requests`) and
+parsing conventions, but sends them itself:
+
+- one pooled `requests.Session` per process, so connections are reused
+- a token bucket shared by every session/thread in the process
+- retries with full-jitter exponential backoff on 429, 5xx, timeouts and
+  connection errors (honouring a numeric `Retry-After`)
+- a deadline per synthesis call; attempts, backoff sleeps and waits for a
+  rate-limit token all count against it
+- proxy and CA settings from the environment (HTTPS_PROXY, NO_PROXY,
+  REQUESTS_CA_BUNDLE, ...) passed explicitly, as `Session.request` would;
+  `Session.send` alone skips the CA bundle and, before requests 2.32, proxies
+
+`_prepare_requests` and the response format are gTTS internals, so gTTS is
+pinned in requirements.txt; if either changes, synthesis fails with a
+`TTSError` saying so instead of an AttributeError deep in a page.
+
+Settings come from the environment (PHONOLOGY_TTS_RATE, PHONOLOGY_TTS_BURST,
+PHONOLOGY_TTS_RETRIES, PHONOLOGY_TTS_DEADLINE); PHONOLOGY_TTS_URL points the
+client at a stand-in server instead of translate.google.<tld>.
+"""
+import base64
+import os
+import random
+import re
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+_GTTS_VERSION = "2.5.4"  # the pinned version whose internals are used below
+_AUDIO_RE = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+
+class TTSError(Exception):
+    """Synthesis failed after retries, or could not finish before its deadline."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` banked."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: float = None) -> bool:
+        """Take one token, sleeping until one is available. False if `deadline` comes first."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = (1.0 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class TTSClient:
+    def __init__(self, base_url: str = None, rate: float = 5.0, burst: int = 10, retries: int = 4,
+                 backoff: float = 0.25, max_backoff: float = 4.0, timeout: float = 10.0,
+                 deadline: float = 20.0, pool_size: int = 16, seed=None):
+        self.base_url = base_url
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.deadline = deadline
+        self.bucket = TokenBucket(rate, burst)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _jitter(self, attempt: int) -> float:
+        with self._lock:
+            return self._random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _retarget(self, prepared):
+        if self.base_url:
+            base = urlsplit(self.base_url)
+            url = urlsplit(prepared.url)
+            prepared.url = urlunsplit((base.scheme, base.netloc, base.path.rstrip("/") + url.path,
+                                       url.query, url.fragment))
+        return prepared
+
+    def _send(self, prepared, deadline: float) -> requests.Response:
+        last_error = None
+        # what Session.request would add: proxies, verify and cert from the environment
+        settings = self.session.merge_environment_settings(prepared.url, {}, None, None, None)
+        for attempt in range(self.retries + 1):
+            if not self.bucket.acquire(deadline):
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            retry_after = 0.0
+            self._count("requests")
+            try:
+                response = self.session.send(prepared, timeout=min(self.timeout, remaining), **settings)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                last_error = exc
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    if response.ok:
+                        return response
+                    self._count("failures")
+                    raise TTSError(f"TTS request failed with HTTP {response.status_code}")
+                last_error = f"HTTP {response.status_code}"
+                try:
+                    retry_after = float(response.headers.get("Retry-After", 0))
+                except ValueError:
+                    retry_after = 0.0
+                response.close()
+            if attempt == self.retries:
+                break
+            pause = max(retry_after, self._jitter(attempt))
+            if time.monotonic() + pause >= deadline:
+                break
+            self._count("retries")
+            time.sleep(pause)
+        self._count("failures")
+        raise TTSError(f"TTS request gave up: {last_error or 'deadline exceeded'}")
+
+    @staticmethod
+    def _audio(response: requests.Response) -> bytes:
+        for line in response.text.splitlines():
+            if "jQ1olc" in line:
+                match = _AUDIO_RE.search(line)
+                if match:
+                    try:
+                        return base64.b64decode(match.group(1).encode("ascii"), validate=True)
+                    except ValueError:
+                        break
+        raise TTSError(f"TTS response contained no audio; the response format may have changed "
+                       f"(written for gTTS {_GTTS_VERSION})")
+
+    def synthesize(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False,
+                   deadline: float = None) -> bytes:
+        """MP3 bytes for `text`. Raises `TTSError` once retries or the deadline run out."""
+        from gtts import gTTS
+
+        deadline = time.monotonic() + (self.deadline if deadline is None else deadline)
+        try:
+            prepared = gTTS(text=text, lang=lang, tld=tld or "com", slow=slow)._prepare_requests()
+        except (AssertionError, ValueError) as exc:
+            # nothing speakable ("..."), or an unsupported language
+            raise TTSError(f"cannot synthesize {text[:40]!r}: {exc}") from exc
+        except (AttributeError, TypeError) as exc:
+            raise TTSError(f"gTTS._prepare_requests is not usable in the installed gTTS; this client "
+                           f"was written for gTTS {_GTTS_VERSION}: {exc}") from exc
+        return b"".join(self._audio(self._send(self._retarget(pr), deadline)) for pr in prepared)
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_tts_client() -> TTSClient:
+    """Process-wide client: one connection pool and one rate limit for every session."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TTSClient(
+                    base_url=os.environ.get("PHONOLOGY_TTS_URL") or None,
+                    rate=_env_float("PHONOLOGY_TTS_RATE", 5.0),
+                    burst=int(_env_float("PHONOLOGY_TTS_BURST", 10)),
+                    retries=int(_env_float("PHONOLOGY_TTS_RETRIES", 4)),
+                    deadline=_env_float("PHONOLOGY_TTS_DEADLINE", 20.0),
+                )
+    return _client
@@ -0,0 +1,157 @@
+"""
+Word clouds of the word list, rendered in the background and cached on disk.
+
+`WordCloud.generate` takes a second or more of CPU per image, so a page
+never calls it directly. `CloudRenderer.get(field, groups, categories)`
+returns the path of a cached PNG, or None after queueing the render on a
+single background worker; the page shows a placeholder and looks again
+later. Images are keyed by the dataset's content hash plus the field and
+the filters, so a changed word list gets fresh clouds and every other
+combination is rendered only once per dataset version, across sessions
+and restarts.
+"""
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from phonology.fonts import find_font
+from phonology.words import get_words
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PHONOLOGY_WORDCLOUD_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "english-phonology", "wordclouds"),
+)
+FIELDS = ["Meaning", "Translation", "Word"]
+CLOUD_SIZE = (800, 400)
+RETRY_AFTER = 30  # seconds before a failed render is tried again
+
+# Grammatical_Category is spelled several ways in the word list
+CATEGORY_NAMES = {
+    "n": "noun", "noun": "noun",
+    "v": "verb", "verb": "verb",
+    "adj": "adjective", "adjective": "adjective",
+    "adv": "adverb", "adverb": "adverb",
+}
+
+
+def normalize_category(value) -> str:
+    """'N/V' -> 'noun/verb', 'Adj' -> 'adjective'; missing values become ''."""
+    if not isinstance(value, str):
+        return ""
+    parts = [p.strip().lower() for p in value.split("/")]
+    return "/".join(CATEGORY_NAMES.get(p, p) for p in parts if p)
+
+
+def _categories(df) -> list:
+    return [normalize_category(v) for v in df["Grammatical_Category"].tolist()]
+
+
+def render_png(text: str, path: str):
+    """Render `text` as a word cloud PNG at `path` (atomically)."""
+    from wordcloud import WordCloud
+
+    cloud = WordCloud(width=CLOUD_SIZE[0], height=CLOUD_SIZE[1], background_color="white",
+                      font_path=find_font(), collocations=False)
+    image = cloud.generate(text).to_image()
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    image.save(tmp, format="PNG")
+    os.replace(tmp, path)
+
+
+class CloudRenderer:
+    def __init__(self, words=None, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.words = words if words is not None else get_words("wordlist")
+        self.cache_dir = cache_dir
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordcloud")
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Future
+        self.failed = {}  # key -> (time, error message) of the last failed render
+
+    # ---------- filters ----------
+    def groups(self) -> list:
+        return sorted(self.words.derived("cloud_groups", lambda df: df["Group"].dropna().unique().tolist()))
+
+    def categories(self) -> list:
+        return sorted(c for c in set(self.words.derived("cloud_categories", _categories)) if c)
+
+    def text(self, field: str, groups=(), categories=()) -> str:
+        df = self.words.frame()
+        mask = df[field].notna()
+        if groups:
+            mask &= df["Group"].isin(list(groups))
+        if categories:
+            wanted = set(categories)
+            mask &= [c in wanted for c in self.words.derived("cloud_categories", _categories)]
+        return " ".join(df.loc[mask, field].astype(str).tolist())
+
+    # ---------- cache ----------
+    def key(self, field: str, groups=(), categories=()) -> str:
+        payload = "\x1f".join([self.words.dataset.sha256 or "", field,
+                               ",".join(sorted(groups)), ",".join(sorted(categories))])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def _render(self, key, text):
+        error = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            render_png(text, self.path(key))
+        except Exception as exc:
+            error = str(exc)
+        with self._lock:
+            if error is None:
+                self.failed.pop(key, None)
+            else:
+                self.failed[key] = (time.monotonic(), error)
+            self._inflight.pop(key, None)
+
+    def _failure(self, key):
+        """Error of a recent failed render of `key`; forgotten after RETRY_AFTER seconds (call under _lock)."""
+        failure = self.failed.get(key)
+        if failure is None:
+            return None
+        if time.monotonic() - failure[0] > RETRY_AFTER:
+            del self.failed[key]
+            return None
+        return failure[1]
+
+    def get(self, field: str, groups=(), categories=()):
+        """Path of the cached cloud, or None while it is being rendered in the background."""
+        self.words.frame()  # make sure the dataset (and its sha256) is loaded
+        key = self.key(field, groups, categories)
+        path = self.path(key)
+        if os.path.exists(path):
+            return path
+        with self._lock:
+            if key in self._inflight or self._failure(key) is not None:
+                return None
+            text = self.text(field, groups, categories)
+            if not text.strip():
+                self.failed[key] = (time.monotonic(), "no words match these filters")
+                return None
+            self._inflight[key] = self._pool.submit(self._render, key, text)
+        return None
+
+    def error(self, field: str, groups=(), categories=()):
+        """Why the cloud could not be rendered, or None."""
+        key = self.key(field, groups, categories)
+        with self._lock:
+            return self._failure(key)
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_cloud_renderer() -> CloudRenderer:
+    """Process-wide renderer for the main word list."""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = CloudRenderer()
+    return _renderer
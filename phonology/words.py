@@ -0,0 +1,90 @@
+"""
+Shared word data for every page.
+
+`get_words(name)` wraps the process-wide `RevalidatingDataset` and adds what
+the pages need on top of the raw DataFrame: row access by word id and a
+place for derived per-version caches. A word id is the `WID` column when
+the dataset has one, and otherwise the row number shown next to each word
+in the page's tables. Everything derived from a frame is keyed by the
+dataset's content hash, so each worker builds it once per dataset version
+no matter how many sessions or pages ask.
+"""
+import threading
+
+from phonology.datasets import get_dataset
+
+ID_COLUMN = "WID"
+
+
+class WordList:
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self._lock = threading.Lock()
+        self._sha = None
+        self._derived = {}
+
+    @property
+    def name(self) -> str:
+        return self.dataset.name
+
+    def frame(self):
+        """The shared, read-only DataFrame."""
+        return self.dataset.frame()
+
+    def derived(self, key, build):
+        """`build(frame)` computed once per dataset version and shared by every caller."""
+        df = self.frame()
+        sha = self.dataset.sha256
+        with self._lock:
+            if sha != self._sha:
+                self._derived = {}
+                self._sha = sha
+            if key in self._derived:
+                return self._derived[key]
+        value = build(df)
+        with self._lock:
+            if sha == self._sha:
+                self._derived.setdefault(key, value)
+                return self._derived[key]
+        return value
+
+    @property
+    def id_column(self):
+        return ID_COLUMN if ID_COLUMN in self.frame().columns else None
+
+    def _positions(self, df):
+        if ID_COLUMN in df.columns:
+            return {int(wid): pos for pos, wid in enumerate(df[ID_COLUMN].tolist()) if wid == wid}
+        return None
+
+    def position(self, wid):
+        """Row position for a word id, or None if there is no such word."""
+        try:
+            wid = int(wid)
+        except (TypeError, ValueError):
+            return None
+        positions = self.derived("positions", self._positions)
+        if positions is not None:
+            return positions.get(wid)
+        return wid if 0 <= wid < len(self.frame()) else None
+
+    def row(self, wid):
+        """One word as a dict of column -> value, or None if there is no such word."""
+        pos = self.position(wid)
+        if pos is None:
+            return None
+        return self.frame().iloc[pos].to_dict()
+
+
+_lists = {}
+_lists_lock = threading.Lock()
+
+
+def get_words(name: str) -> WordList:
+    """Process-wide word list for a dataset name (see `phonology.datasets.DATASET_SPECS`)."""
+    with _lists_lock:
+        words = _lists.get(name)
+        if words is None:
+            words = WordList(get_dataset(name))
+            _lists[name] = words
+    return words
@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the pages import `phonology` from the repo root; the TTS tests import `benchmarks.tts_standin`
+sys.path.insert(0, ROOT)
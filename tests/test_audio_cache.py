@@ -0,0 +1,40 @@
+import os
+
+from phonology.audio_cache import AudioCache
+from phonology.tts_backends import StubBackend, TTSBackend
+
+
+class WavBackend(TTSBackend):
+    name = "wav-test"
+    mime = "audio/wav"
+    suffix = ".wav"
+
+    def __init__(self):
+        self.calls = 0
+
+    def synthesize(self, text, lang="en", tld="com", slow=False):
+        self.calls += 1
+        return b"RIFF" + text.encode("utf-8").ljust(100, b"\0")
+
+
+def test_files_take_the_backend_suffix(tmp_path):
+    backend = WavBackend()
+    cache = AudioCache(str(tmp_path), backend=backend)
+    data = cache.get("hello")
+    assert cache.get("hello") == data and backend.calls == 1
+    assert os.listdir(tmp_path) == [cache.key("hello") + ".wav"]
+
+    reopened = AudioCache(str(tmp_path), backend=WavBackend())
+    assert reopened.stats()["entries"] == 1
+    assert reopened.lookup(reopened.key("hello")) == data
+
+
+def test_size_cap_covers_every_suffix(tmp_path):
+    AudioCache(str(tmp_path), backend=WavBackend()).get("wav clip")
+    mp3 = AudioCache(str(tmp_path), max_bytes=150, backend=StubBackend())
+    assert mp3.stats()["entries"] == 1
+    for word in ("one", "two", "three"):
+        mp3.get(word)
+    names = os.listdir(tmp_path)
+    assert not any(name.endswith(".wav") for name in names)  # oldest entry evicted first
+    assert sum(os.path.getsize(tmp_path / name) for name in names) <= 150
@@ -0,0 +1,48 @@
+import json
+import zipfile
+
+from phonology.class_reports import SUMMARY_NAME, BadRecord, build_class_zip, iter_records
+
+
+def quiz(username, *words):
+    return {"username": username, "start_time": "2026-03-02T09:00:00", "end_time": "2026-03-02T09:20:00",
+            "history": [{"word": w, "correct": i % 2 == 0} for i, w in enumerate(words)]}
+
+
+def write_jsonl(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_corrupt_line_is_reported_not_fatal(tmp_path):
+    histories = write_jsonl(tmp_path / "histories.jsonl", [
+        json.dumps(quiz("Kim", "abate", "bask")),
+        '{"username": "Lee", "history": [',
+        json.dumps(quiz("Park", "cede")),
+    ])
+    records = list(iter_records(histories))
+    assert isinstance(records[1], BadRecord) and records[1].label == "line 2"
+
+    out = tmp_path / "reports.zip"
+    logged = []
+    summary = build_class_zip(iter_records(histories), str(out), workers=1, log=logged.append)
+    assert summary["reports"] == 2
+    assert summary["failed"] == 1
+    assert any("line 2" in line for line in logged)
+    names = zipfile.ZipFile(out).namelist()
+    assert sorted(names) == sorted(["Kim_quiz_report.pdf", "Park_quiz_report.pdf", SUMMARY_NAME])
+
+
+def test_render_errors_are_skipped(tmp_path):
+    records = [quiz("Kim", "abate"), {"username": "Lee", "history": [{"correct": False}]}, ["not", "a", "quiz"]]
+    out = tmp_path / "reports.zip"
+    summary = build_class_zip(records, str(out), workers=1, log=lambda *_: None)
+    assert (summary["reports"], summary["failed"]) == (1, 2)
+    assert SUMMARY_NAME in zipfile.ZipFile(out).namelist()
+
+
+def test_duplicate_usernames_get_distinct_files(tmp_path):
+    out = tmp_path / "reports.zip"
+    build_class_zip([quiz("Kim", "a"), quiz("Kim", "b")], str(out), workers=2, log=lambda *_: None)
+    names = zipfile.ZipFile(out).namelist()
+    assert "Kim_quiz_report.pdf" in names and "Kim_2_quiz_report.pdf" in names
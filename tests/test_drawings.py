@@ -0,0 +1,36 @@
+import pytest
+
+from phonology.drawings import DrawingStore, compact_objects, safe_name, to_initial_drawing
+
+STROKE = {"type": "Path", "version": "7.4.0", "left": 10.123456, "top": 20.0, "scaleX": 1, "opacity": 1,
+          "stroke": "#000000", "path": [["M", 1.04, 2.0], ["L", 3.333, 4.999]]}
+
+
+def test_compact_objects_drops_defaults_and_rounds():
+    (obj,) = compact_objects({"objects": [STROKE]})
+    assert obj == {"type": "Path", "left": 10.1, "top": 20, "stroke": "#000000",
+                   "path": [["M", 1, 2], ["L", 3.3, 5]]}
+    assert to_initial_drawing([obj]) == {"objects": [obj]}
+
+
+@pytest.mark.parametrize("name, expected", [("Week 3 / vowels", "Week_3_vowels"), ("???", ""), ("  ", "")])
+def test_safe_name(name, expected):
+    assert safe_name(name) == expected
+
+
+def test_save_refuses_to_overwrite(tmp_path):
+    store = DrawingStore(str(tmp_path))
+    store.save("board", [STROKE], 600, 400)
+    assert store.exists("board")
+    with pytest.raises(FileExistsError):
+        store.save("board", [], 600, 400)
+    assert store.load("board")["objects"] == [STROKE]
+    store.save("board", [], 600, 400, overwrite=True)
+    assert store.load("board")["objects"] == []
+    assert store.names() == ["board"]
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_unusable_name_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DrawingStore(str(tmp_path)).save("???", [STROKE], 600, 400)
@@ -0,0 +1,80 @@
+import random
+
+import pandas as pd
+import pytest
+
+from phonology.grouping import GroupingError, form_groups, group_sizes, pairs_from_grouped
+
+YEAR_LIMITS = {("Year", 2): (1, 2)}
+
+
+def old_distribute_sizes(total, group_size):
+    """Group sizes produced by the Grouping tab's former `distribute_standard`."""
+    base, remainder = divmod(total, group_size)
+    if total == 0:
+        return []
+    if base == 0:
+        return [total]
+    if remainder == 0:
+        return [group_size] * base
+    if remainder == 1:
+        return [group_size] * (base - 1) + [group_size + 1]
+    return [group_size] * base + [remainder]
+
+
+def year_roster(total, second_years):
+    return pd.DataFrame({"Name_ori": [f"S{i}" for i in range(total)],
+                         "Year": [2] * second_years + [1] * (total - second_years)})
+
+
+@pytest.mark.parametrize("group_size", [3, 4])
+def test_group_sizes_match_distribute_standard(group_size):
+    for total in range(60):
+        assert group_sizes(total, group_size) == old_distribute_sizes(total, group_size), total
+
+
+def test_group_sizes_fold():
+    assert group_sizes(11, 4, remainder="fold") == [4, 7]
+    assert group_sizes(12, 4, remainder="fold") == [4, 4, 4]
+    assert group_sizes(3, 4, remainder="fold") == [3]
+
+
+def test_year_rule_on_feasible_rosters():
+    rng = random.Random(0)
+    checked = 0
+    while checked < 40:
+        total = rng.randint(4, 60)
+        sizes = group_sizes(total, 4, remainder="fold")
+        second_years = rng.randint(len(sizes), 2 * len(sizes))
+        if second_years > total:
+            continue
+        roster = year_roster(total, second_years)
+        result = form_groups(roster, sizes, balance={"Year": 1}, limits=YEAR_LIMITS,
+                             seed=rng.random(), time_budget=0.2)
+        assert [len(g) for g in result.groups] == sizes
+        assert sorted(i for g in result.groups for i in g) == list(range(total))
+        for grp in result.groups:
+            assert 1 <= sum(roster["Year"].iloc[i] == 2 for i in grp) <= 2
+        assert result.violations == 0
+        checked += 1
+
+
+@pytest.mark.parametrize("total, second_years", [(12, 2), (12, 7), (20, 0)])
+def test_infeasible_year_rule_is_rejected(total, second_years):
+    with pytest.raises(GroupingError):
+        form_groups(year_roster(total, second_years), group_sizes(total, 4, remainder="fold"),
+                    balance={"Year": 1}, limits=YEAR_LIMITS)
+
+
+def test_sizes_must_cover_the_roster():
+    with pytest.raises(GroupingError):
+        form_groups(year_roster(10, 3), [4, 4])
+
+
+def test_history_pairs_are_kept_apart():
+    roster = year_roster(16, 4)
+    first = form_groups(roster, group_sizes(16, 4), seed=1)
+    grouped = pd.DataFrame([[f"Group {i}"] + grp for i, grp in enumerate(first.names(), start=1)],
+                           columns=["Group", "Member1", "Member2", "Member3", "Member4"])
+    second = form_groups(roster, group_sizes(16, 4), history=pairs_from_grouped(grouped), seed=2)
+    assert second.repeats == 0
@@ -0,0 +1,32 @@
+from phonology.lookup import WordIndex
+
+WORDS = ["Paris", "paris", "Parade", "pARk", "apple", "  Resignation ", ""]
+
+
+def test_exact_is_case_insensitive():
+    index = WordIndex(WORDS)
+    assert index.exact("PARIS") == 0
+    assert index.rows("paris") == [0, 1]
+    assert index.exact("resignation") == 5
+    assert index.exact("nope") is None
+
+
+def test_prefix_returns_original_spelling():
+    index = WordIndex(WORDS)
+    assert index.prefix("par") == ["Parade", "Paris", "pARk"]
+    assert index.prefix("PAR", limit=2) == ["Parade", "Paris"]
+    assert index.prefix("res") == ["Resignation"]
+    assert index.prefix("  ") == []
+
+
+def test_suggestions_round_trip_through_exact():
+    # the page feeds a clicked suggestion back into the search box
+    index = WordIndex(WORDS)
+    for word in index.prefix("p") + [w for _, w in index.fuzzy("resignaton")]:
+        assert index.exact(word) is not None
+
+
+def test_fuzzy_returns_original_spelling():
+    index = WordIndex(WORDS)
+    assert index.fuzzy("resignaton") == [(1, "Resignation")]
+    assert index.fuzzy("prak")[0] == (1, "pARk")
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from phonology.practice import make_subset
+from phonology.snapshot import WordTable
+
+
+def word_table(n=731):
+    df = pd.DataFrame({"WID": range(1, n + 1), "Word": [f"w{i}" for i in range(n)],
+                       "Group": [f"G{i % 6 + 1}" for i in range(n)]})
+    return WordTable.from_frame(df, source_sha256=f"test-{n}")
+
+
+def test_review_missed_is_mostly_missed_words():
+    table = word_table()
+    misses = {3: 1, 40: 2, 100: 1, 500: 4, 700: 1}
+    hits = []
+    for seed in range(200):
+        subset = make_subset(table, 10, "Review missed", rng=seed, misses=misses)
+        assert len(subset) == len(set(subset.tolist())) == 10
+        hits.append(len(set(subset.tolist()) & set(misses)))
+    # every missed word is in every subset; the other five only fill up
+    assert min(hits) == len(misses)
+
+
+def test_review_missed_prefers_frequent_misses():
+    table = word_table()
+    misses = {row: 1 for row in range(20)}
+    misses[5] = 20
+    picked = sum(5 in make_subset(table, 5, "Review missed", rng=seed, misses=misses).tolist()
+                 for seed in range(200))
+    assert picked > 150
+
+
+def test_review_missed_without_misses_is_random():
+    table = word_table()
+    subset = make_subset(table, 10, "Review missed", rng=1, misses={})
+    assert len(set(subset.tolist())) == 10
+
+
+def test_wid_order_and_size_limits():
+    table = word_table(50)
+    assert make_subset(table, 5, "WID order").tolist() == [0, 1, 2, 3, 4]
+    assert len(make_subset(table, 500, "Random", rng=0)) == 50
+    assert make_subset(table, 10, "Review missed", rng=0, misses={7: 1}).dtype == np.int32
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from phonology import prerender
+from phonology.tts_backends import stub_synthesize
+
+
+def quiet(*_):
+    pass
+
+
+@pytest.fixture
+def word_csv(tmp_path):
+    path = tmp_path / "words.csv"
+    path.write_text("WID,Word\n" + "".join(f"{wid},word{wid}\n" for wid in range(1, 41)), encoding="utf-8")
+    return str(path)
+
+
+def test_stub_prerender_and_resume(tmp_path, word_csv):
+    out = str(tmp_path / "audio")
+    first = prerender.prerender(word_csv, out, backend_name="stub", limit=30, log=quiet)
+    assert (first["rendered"], first["skipped"], first["failed"]) == (30, 0, 0)
+
+    second = prerender.prerender(word_csv, out, backend_name="stub", log=quiet)
+    assert (second["rendered"], second["skipped"], second["failed"]) == (10, 30, 0)
+
+    manifest = prerender.load_manifest(out)
+    assert manifest["backend"] == "stub" and len(manifest["items"]) == 40
+    assert sorted(os.listdir(out)) == sorted([prerender.MANIFEST_NAME] +
+                                             [prerender.audio_filename(wid) for wid in range(1, 41)])
+
+
+def test_failed_and_changed_files_are_rendered_again(tmp_path, word_csv):
+    out = str(tmp_path / "audio")
+
+    def flaky(word, lang="en"):
+        if word == "word7":
+            raise RuntimeError("rate limited")
+        return stub_synthesize(word, lang=lang)
+
+    first = prerender.prerender(word_csv, out, synthesize=flaky, backend_name="stub", workers=2, log=quiet)
+    assert (first["rendered"], first["failed"]) == (39, 1)
+    with open(os.path.join(out, prerender.audio_filename(3)), "wb") as f:
+        f.write(b"truncated")
+    second = prerender.prerender(word_csv, out, backend_name="stub", log=quiet)
+    assert (second["rendered"], second["skipped"]) == (2, 38)
+
+
+def test_stub_needs_an_explicit_out(word_csv):
+    with pytest.raises(ValueError):
+        prerender.prerender(word_csv, prerender.DEFAULT_OUT, backend_name="stub", log=quiet)
+    with pytest.raises(SystemExit):
+        prerender.main(["--csv", word_csv, "--backend", "stub"])
+
+
+def test_read_side_is_per_directory(tmp_path, word_csv):
+    a, b = str(tmp_path / "a"), str(tmp_path / "b")
+    prerender.prerender(word_csv, a, synthesize=stub_synthesize, backend_name="gtts", limit=5, log=quiet)
+    prerender.prerender(word_csv, b, synthesize=stub_synthesize, backend_name="gtts", limit=10, log=quiet)
+
+    assert prerender.prerendered_path(3, "word3", a, backend="gtts") == os.path.join(a, "0003.mp3")
+    assert prerender.prerendered_path(8, "word8", a, backend="gtts") is None
+    assert prerender.prerendered_path(8, "word8", b, backend="gtts") == os.path.join(b, "0008.mp3")
+    assert prerender.prerendered_path(3, "other", a, backend="gtts") is None
+    # audio from another engine, or a stub dry run, is never served
+    assert prerender.prerendered_path(3, "word3", a, backend="espeak-ng") is None
+    assert prerender.prerendered_path(3, "word3", a, backend="stub") is None
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from phonology.quiz import CORRECT, EMPTY, INCORRECT, QuizEngine
+
+WORDS = ["Apple", "banana", "Cherry"]
+START = datetime(2026, 3, 2, 9, 0)
+END = datetime(2026, 3, 2, 9, 20)
+
+
+def engine():
+    return QuizEngine(lambda pos: WORDS[pos])
+
+
+def test_start_defaults_to_anonymous():
+    state = engine().start([0, 1, 2], "  ", now=START)
+    assert (state.username, state.start_time, len(state), state.current) == ("Anonymous", START, 3, 0)
+    assert engine().start([2], " Kim ").username == "Kim"
+
+
+def test_answers_are_normalized():
+    assert QuizEngine.normalize("  ApPle \n") == "apple"
+    quiz = engine()
+    state = quiz.start([0, 2])
+    assert quiz.submit(state, " apple ") == (CORRECT, "Apple")
+    assert quiz.submit(state, "CHERRY") == (CORRECT, "Cherry")
+    assert state.score == 2
+
+
+def test_empty_submit_changes_nothing():
+    quiz = engine()
+    state = quiz.start([0, 1])
+    assert quiz.submit(state, "   ") == (EMPTY, "Apple")
+    assert (state.idx, state.score, len(state.log_items)) == (0, 0, 0)
+
+
+def test_scoring_history_and_finish():
+    quiz = engine()
+    state = quiz.start([0, 1, 2], "Kim", now=START)
+    assert quiz.submit(state, "apple")[0] == CORRECT
+    assert quiz.submit(state, "bananna") == (INCORRECT, "banana")
+    assert not state.finished
+    assert quiz.submit(state, "cherry", now=END)[0] == CORRECT
+    assert state.finished and state.end_time == END and state.score == 2
+    assert quiz.history(state) == [
+        {"index": 0, "word": "Apple", "correct": True},
+        {"index": 1, "word": "banana", "correct": False},
+        {"index": 2, "word": "Cherry", "correct": True},
+    ]
+
+
+def test_submit_after_finish_is_ignored():
+    quiz = engine()
+    state = quiz.start([1])
+    quiz.submit(state, "banana", now=END)
+    assert quiz.submit(state, "banana") == (EMPTY, None)
+    assert state.score == 1 and len(quiz.history(state)) == 1 and state.end_time == END
+
+
+def test_item_is_logged_once_even_if_submitted_twice():
+    quiz = engine()
+    state = quiz.start([0, 1])
+    quiz.submit(state, "pear")
+    state.idx = 0  # e.g. a double click delivered after the page moved on
+    quiz.submit(state, "apple")
+    assert list(state.log_items) == [0]
+    assert quiz.history(state) == [{"index": 0, "word": "Apple", "correct": False}]
+
+
+def test_restart_gives_a_fresh_state():
+    quiz = engine()
+    first = quiz.start([0, 1], "Kim")
+    quiz.submit(first, "apple")
+    quiz.submit(first, "banana")
+    second = quiz.start([2, 0], "Kim")
+    assert (second.idx, second.score, second.finished, len(second.log_items)) == (0, 0, False, 0)
+    assert first.finished and first.score == 2
@@ -0,0 +1,75 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from phonology import report
+
+START = datetime(2026, 3, 2, 9, 0)
+END = datetime(2026, 3, 2, 9, 40)
+HISTORY = [{"word": f"word{i}", "correct": i % 3 != 0} for i in range(770)]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    report._reports.clear()
+    yield
+    report._reports.clear()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    real = report.create_pdf_report
+
+    def counting(*args):
+        calls.append(args)
+        return real(*args)
+
+    monkeypatch.setattr(report, "create_pdf_report", counting)
+    return calls
+
+
+def test_report_is_a_pdf():
+    pdf = report.create_pdf_report("Kim", HISTORY[:3], 2, START, END)
+    assert pdf.startswith(b"%PDF")
+
+
+def test_finished_quiz_renders_once(renders):
+    first = report.cached_pdf_report("Kim", HISTORY, 513, START, END)
+    for _ in range(5):
+        assert report.cached_pdf_report("Kim", list(HISTORY), 513, START, END) == first
+    assert len(renders) == 1
+
+
+def test_any_change_to_the_quiz_renders_again(renders):
+    report.cached_pdf_report("Kim", HISTORY, 513, START, END)
+    report.cached_pdf_report("Lee", HISTORY, 513, START, END)
+    report.cached_pdf_report("Kim", HISTORY, 513, START, datetime(2026, 3, 2, 9, 41))
+    flipped = [dict(item) for item in HISTORY]
+    flipped[0]["correct"] = True
+    report.cached_pdf_report("Kim", flipped, 513, START, END)
+    assert len(renders) == 4
+
+
+def test_cache_is_bounded(monkeypatch, renders):
+    monkeypatch.setattr(report, "MAX_CACHED_REPORTS", 3)
+    for score in range(5):
+        report.cached_pdf_report("Kim", HISTORY[:10], score, START, END)
+    assert len(report._reports) == 3
+    report.cached_pdf_report("Kim", HISTORY[:10], 0, START, END)  # evicted, rendered again
+    assert len(renders) == 6
+
+
+def test_repeat_click_is_much_cheaper_than_rendering():
+    # regression guard for benchmarks/finished_quiz_rerun.py: a repeat click
+    # only fingerprints the history, it must not redo the PDF work
+    t0 = time.perf_counter()
+    report.cached_pdf_report("Kim", HISTORY, 513, START, END)
+    first = time.perf_counter() - t0
+    repeats = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        report.cached_pdf_report("Kim", HISTORY, 513, START, END)
+        repeats.append(time.perf_counter() - t0)
+    assert min(repeats) < first / 4
@@ -0,0 +1,133 @@
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from phonology import results_store
+from phonology.results_store import ResultsStore
+
+THREADS = 32
+QUIZZES = 20
+ITEMS = 10
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def hammer(n_threads, fn):
+    """Run fn(thread_index) on n_threads threads released together; re-raise the first error."""
+    barrier = threading.Barrier(n_threads)
+    errors = []
+
+    def run(t):
+        barrier.wait()
+        try:
+            fn(t)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in range(n_threads)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    if errors:
+        raise errors[0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite3"), flush_interval=0.05)
+    yield store
+    store.close()
+
+
+def test_concurrent_quizzes_land_exactly_once(store):
+    uids = [[] for _ in range(THREADS)]
+
+    def student(t):
+        rng = random.Random(t)
+        for _ in range(QUIZZES):
+            items = [(rng.randint(1, 731), f"word{rng.randint(1, 731)}", rng.random() < 0.7)
+                     for _ in range(ITEMS)]
+            now = datetime.now()
+            uids[t].append(store.record_quiz(f"student-{t}", now, now, sum(c for _, _, c in items), items))
+
+    hammer(THREADS, student)
+    store.flush()
+
+    expected = THREADS * QUIZZES
+    assert len({uid for us in uids for uid in us}) == expected
+    assert store.count_quizzes() == expected
+    assert store.count_items() == expected * ITEMS
+    assert store.batches_committed < expected  # quizzes were committed in batches
+
+
+def test_quiz_items_keep_their_order(store):
+    items = [(3, "apple", True), (None, "banana", False), (7, "cherry", True)]
+    uid = store.record_quiz("Kim", None, None, 2, items)
+    store.flush()
+    assert store.quiz_items(uid) == [(0, 3, "apple", 1), (1, None, "banana", 0), (2, 7, "cherry", 1)]
+    assert store.recent_quizzes(1)[0][:2] == (uid, "Kim")
+
+
+def test_get_results_store_is_one_store_per_process(tmp_path, monkeypatch):
+    created = []
+
+    def make_store():
+        created.append(ResultsStore(str(tmp_path / "results.sqlite3")))
+        return created[-1]
+
+    monkeypatch.setattr(results_store, "_store", None)
+    monkeypatch.setattr(results_store, "ResultsStore", make_store)
+    seen = [None] * THREADS
+
+    def session(t):
+        seen[t] = results_store.get_results_store()
+        seen[t].record_quiz(f"student-{t}", None, None, 1, [(1, "word", True)])
+
+    hammer(THREADS, session)
+    assert len(created) == 1
+    assert all(s is created[0] for s in seen)
+    created[0].flush()
+    assert created[0].count_quizzes() == THREADS
+    created[0].close()
+
+
+def test_writer_survives_unexpected_errors(store, monkeypatch):
+    write_batch = store._write_batch
+    calls = []
+
+    def flaky(conn, batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        write_batch(conn, batch)
+
+    monkeypatch.setattr(store, "_write_batch", flaky)
+    store.record_quiz("Kim", None, None, 1, [(1, "word", True)])
+    assert store.flush(timeout=5)
+    store.record_quiz("Lee", None, None, 1, [(1, "word", True)])
+    assert store.flush(timeout=5)
+    assert store.count_quizzes() == 1  # the first batch was dropped, the writer kept going
+
+
+def test_flush_times_out_when_the_writer_is_gone(store):
+    store.close()
+    store.record_quiz("Kim", None, None, 1, [(1, "word", True)])
+    start = time.monotonic()
+    assert store.flush(timeout=1) is False
+    assert time.monotonic() - start < 1.5
+
+
+def test_queued_results_are_committed_at_exit(tmp_path):
+    db = tmp_path / "results.sqlite3"
+    script = ("from phonology.results_store import ResultsStore\n"
+              f"store = ResultsStore({str(db)!r}, flush_interval=5)\n"
+              "for n in range(20):\n"
+              "    store.record_quiz(f'student-{n}', None, None, 1, [(1, 'word', True)])\n")
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True, timeout=60)
+    assert ResultsStore(str(db)).count_quizzes() == 20
@@ -0,0 +1,118 @@
+import re
+import time
+
+import pytest
+
+from benchmarks.tts_standin import StandinServer, fake_audio
+from phonology.tts_client import TokenBucket, TTSClient, TTSError
+
+
+def client(server, **kwargs):
+    options = dict(base_url=server.url, rate=1000, burst=100, backoff=0.01, max_backoff=0.05, seed=0)
+    options.update(kwargs)
+    return TTSClient(**options)
+
+
+def test_token_bucket_spaces_acquires():
+    bucket = TokenBucket(rate=20, burst=2)
+    start = time.monotonic()
+    for _ in range(8):
+        assert bucket.acquire()
+    # 2 banked tokens, then 6 more at 20/s
+    assert time.monotonic() - start >= 6 / 20 * 0.9
+
+
+def test_token_bucket_respects_deadline():
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire()
+    start = time.monotonic()
+    assert not bucket.acquire(deadline=time.monotonic() + 0.1)
+    assert time.monotonic() - start < 0.1
+
+
+def test_low_rate_spaces_requests_out():
+    with StandinServer(latency=0.0) as server:
+        tts = client(server, rate=10, burst=1)
+        for n in range(6):
+            tts.synthesize(f"word {n}")
+        gaps = [b - a for a, b in zip(server.arrivals, server.arrivals[1:])]
+        assert len(gaps) == 5
+        assert min(gaps) >= 0.1 * 0.8
+        assert server.arrivals[-1] - server.arrivals[0] >= 0.5 * 0.9
+
+
+def test_retries_on_429_and_503():
+    with StandinServer(latency=0.0, error_rate=0.5, seed=1) as server:
+        tts = client(server, retries=8)
+        for n in range(10):
+            assert tts.synthesize(f"word {n}").startswith(b"ID3-STANDIN")
+        assert tts.stats["retries"] > 0
+        assert tts.stats["failures"] == 0
+        assert server.requests == tts.stats["requests"] == 10 + tts.stats["retries"]
+
+
+def test_gives_up_after_retries():
+    with StandinServer(latency=0.0, error_rate=1.0) as server:
+        tts = client(server, retries=2)
+        with pytest.raises(TTSError):
+            tts.synthesize("hello")
+        assert server.requests == 3
+
+
+def test_deadline_raises_tts_error():
+    with StandinServer(latency=0.0, stall_rate=1.0, stall=2.0) as server:
+        tts = client(server, timeout=0.2)
+        start = time.monotonic()
+        with pytest.raises(TTSError):
+            tts.synthesize("hello", deadline=0.5)
+        assert time.monotonic() - start < 1.5
+
+
+def test_connections_are_reused():
+    with StandinServer(latency=0.0) as server:
+        tts = client(server)
+        for n in range(20):
+            tts.synthesize(f"word {n}")
+        assert server.requests == 20
+        assert server.connections == 1
+
+
+def test_same_text_gives_same_audio():
+    with StandinServer(latency=0.0) as server:
+        tts = client(server)
+        assert tts.synthesize("hello") == tts.synthesize("hello") != tts.synthesize("world")
+        assert len(tts.synthesize("hello")) == len(fake_audio(b""))
+
+
+def test_unspeakable_text_raises_tts_error():
+    with StandinServer(latency=0.0) as server:
+        with pytest.raises(TTSError):
+            client(server).synthesize("...")
+        assert server.requests == 0
+
+
+def test_environment_proxy_is_used(monkeypatch):
+    with StandinServer(latency=0.0) as server:
+        # tts.invalid does not resolve, so the request only succeeds through the proxy
+        monkeypatch.setenv("HTTP_PROXY", server.url)
+        monkeypatch.delenv("NO_PROXY", raising=False)
+        monkeypatch.delenv("no_proxy", raising=False)
+        tts = TTSClient(base_url="http://tts.invalid", retries=0)
+        assert tts.synthesize("hello").startswith(b"ID3-STANDIN")
+        assert server.requests == 1
+
+
+def test_changed_gtts_internals_raise_tts_error(monkeypatch):
+    from gtts import gTTS
+
+    monkeypatch.delattr(gTTS, "_prepare_requests")
+    with StandinServer(latency=0.0) as server:
+        with pytest.raises(TTSError, match="_prepare_requests"):
+            client(server).synthesize("hello")
+
+
+def test_unparseable_response_raises_tts_error(monkeypatch):
+    monkeypatch.setattr("phonology.tts_client._AUDIO_RE", re.compile(r"(?!)"))
+    with StandinServer(latency=0.0) as server:
+        with pytest.raises(TTSError, match="response format"):
+            client(server).synthesize("hello")